@@ -0,0 +1,211 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.feasibility import InfeasibleScheduleError
+from genetic_algoritm.inputs import load_input
+from genetic_algoritm.synthetic import generate_school, write_school
+
+# Входные файлы набора: {'аргумент Schedule': 'префикс имени файла'}
+FIXTURE_FILES = {'df_academic_plan': 'uch_plan', 'df_teachers': 'teachers', 'df_audiences_lessons': 'aud_type',
+                 'df_audiences': 'audiences', 'df_rings': 'rings'}
+
+
+def stage_times(telemetry) -> dict:
+    """
+    Суммарное время каждого этапа ГА по телеметрии поколений.
+
+    Параметры
+    ---------
+    telemetry : Telemetry
+        Телеметрия запуска.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        {'этап': секунды}
+    """
+    totals = {}
+    for record in telemetry.generations:
+        for name, seconds in record['stages'].items():
+            totals[name] = totals.get(name, 0.0) + seconds
+    return {name: round(seconds, 6) for name, seconds in totals.items()}
+
+
+def run_once(fixtures: str, suffix: str, algorithm: str, days: int, second_shift: bool, seed: int,
+             cache_dir: str, results) -> None:
+    """
+    Один запуск ГА в отдельном процессе. Результат кладется в очередь results.
+    Входные файлы читаются через кэш cache_dir или без кэша, если cache_dir - None.
+    """
+    frames = {name: load_input(os.path.join(fixtures, prefix + '_' + suffix + '.xlsx'), name[len('df_'):], cache_dir)
+              for name, prefix in FIXTURE_FILES.items()}
+    frames['df_teachers_wishes'] = pd.DataFrame(columns=['teacher', 'interval', 'is_lesson'])
+
+    random.seed(seed)
+    start_time = time.perf_counter()
+    try:
+        schedule = ga.Schedule(number_of_days_in_week=days, second_shift=second_shift, algorithm=algorithm, **frames)
+    except InfeasibleScheduleError as error:
+        results.put({'status': 'infeasible', 'problems': error.problems})
+        return
+    wall_time = time.perf_counter() - start_time
+
+    scores = schedule.telemetry.scores()
+    generations = len(scores)
+    ga_time = schedule.telemetry.generations[-1]['elapsed']
+    operators = {}
+    for record in schedule.telemetry.generations:
+        for name, counter in record['operators'].items():
+            total = operators.setdefault(name, {'attempts': 0, 'successes': 0})
+            total['attempts'] += counter['attempts']
+            total['successes'] += counter['successes']
+
+    results.put({'wall_time': round(wall_time, 6),
+                 'stages': stage_times(schedule.telemetry),
+                 'operators': operators,
+                 'generations': generations,
+                 'generations_per_second': round(generations / ga_time, 3) if ga_time else None,
+                 # На Linux ru_maxrss - в килобайтах
+                 'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                 # Оценка возвращенного (лучшего найденного) расписания, а не последнего поколения
+                 'score': list(schedule.best_score),
+                 'total_score': sum(schedule.best_score)})
+
+
+def run_case(context, fixtures: str, suffix: str, algorithm: str, days: int, second_shift: bool, seed: int,
+             cache_dir: str, timeout: float) -> dict:
+    """
+    Запуск одного варианта в новом процессе, чтобы пиковая память не зависела от предыдущих запусков.
+    Если расписание не составлено за timeout секунд, процесс останавливается и запуск отмечается как 'timeout'.
+    Заведомо невыполнимые входные данные отмечаются как 'infeasible' со списком проблем.
+    """
+    results = context.Queue()
+    process = context.Process(target=run_once,
+                              args=(fixtures, suffix, algorithm, days, second_shift, seed, cache_dir, results))
+    process.start()
+
+    result = None
+    deadline = time.perf_counter() + timeout
+    while result is None and time.perf_counter() < deadline:
+        try:
+            result = results.get(timeout=0.5)
+        except queue.Empty:
+            if not process.is_alive():
+                break
+
+    if result is None:
+        result = {'status': 'timeout' if process.is_alive() else 'error'}
+        process.terminate()
+    elif 'status' not in result:
+        result = dict(status='ok', **result)
+    process.join()
+    return result
+
+
+def summarize(runs: list) -> list:
+    """
+    Сводка по каждому варианту: медиана времени, средняя скорость поколений, пиковая память и оценки.
+    Варианты без завершенных запусков показывают количество запусков по итогам, а невыполнимые - еще и проблемы.
+    """
+    summary = []
+    key = lambda run: (run['suffix'], run['algorithm'], run['days'], run['second_shift'])
+    for (suffix, algorithm, days, second_shift), group in itertools.groupby(sorted(runs, key=key), key=key):
+        group = list(group)
+        finished = [run for run in group if run['status'] == 'ok']
+        item = {'suffix': suffix, 'algorithm': algorithm, 'days': days, 'second_shift': second_shift,
+                'runs': len(group), 'finished': len(finished),
+                'statuses': {status: sum(run['status'] == status for run in group)
+                             for status in sorted({run['status'] for run in group})}}
+        infeasible = [run for run in group if run['status'] == 'infeasible']
+        if infeasible:
+            item['problems'] = infeasible[0]['problems']
+        if finished:
+            item.update({'median_wall_time': round(statistics.median(run['wall_time'] for run in finished), 6),
+                         'mean_generations_per_second':
+                             round(statistics.mean(run['generations_per_second'] or 0 for run in finished), 3),
+                         'max_peak_rss_kb': max(run['peak_rss_kb'] for run in finished),
+                         'median_total_score': statistics.median(run['total_score'] for run in finished)})
+        summary.append(item)
+    return summary
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+    """
+    parser = argparse.ArgumentParser(description='Бенчмарк генетических алгоритмов на тестовом наборе школы.')
+    parser.add_argument('--fixtures', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'),
+                        help='Каталог с входными файлами (по умолчанию test/)')
+    parser.add_argument('--suffix', default='85', help='Суффикс имен файлов набора (по умолчанию 85)')
+    parser.add_argument('--classes', nargs='+', type=int, default=None,
+                        help='Вместо тестового набора сгенерировать синтетические школы с таким количеством классов')
+    parser.add_argument('--algorithms', nargs='+', choices=('modification', 'classic', 'local_search', 'exact'),
+                        default=('modification', 'classic'))
+    parser.add_argument('--days', nargs='+', type=int, choices=(4, 5, 6), default=(6,),
+                        help='Учебных дней в неделе (по умолчанию 6: на тестовом наборе test/*_85.xlsx варианты '
+                             'с 4 и 5 днями невыполнимы - уроки физкультуры не помещаются в один спортзал)')
+    parser.add_argument('--second-shift', choices=('no', 'yes', 'both'), default='both')
+    parser.add_argument('--repetitions', type=int, default=3, help='Количество повторов каждого варианта')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно первого повтора; повтор i использует seed + i')
+    parser.add_argument('--timeout', type=float, default=600, help='Ограничение времени одного запуска, с')
+    parser.add_argument('--cache-dir', metavar='DIR', default=None,
+                        help='Каталог кэша разобранных входных файлов (по умолчанию файлы Excel читаются без кэша, '
+                             'чтобы кэш не влиял на замеры и не засорял домашний каталог)')
+    parser.add_argument('--output', default=None, help='Файл JSON с результатами (по умолчанию - stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    shifts = {'no': (False,), 'yes': (True,), 'both': (False, True)}[args.second_shift]
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        if args.classes:
+            # Синтетические школы: аудитории рассчитаны на наибольшее количество дней и, если она запускается,
+            # на вторую смену, в которой нагрузка на аудитории выше
+            fixtures, suffixes = synthetic_dir, tuple(str(classes) for classes in args.classes)
+            for classes in args.classes:
+                write_school(generate_school(classes, max(args.days), seed=args.seed, second_shift=True in shifts),
+                             fixtures, classes)
+        else:
+            fixtures, suffixes = os.path.abspath(args.fixtures), (args.suffix,)
+
+        runs = []
+        for suffix, algorithm, days, second_shift, repetition in itertools.product(
+                suffixes, args.algorithms, args.days, shifts, range(args.repetitions)):
+            seed = args.seed + repetition
+            run = {'suffix': suffix, 'algorithm': algorithm, 'days': days, 'second_shift': second_shift,
+                   'repetition': repetition, 'seed': seed}
+            run.update(run_case(context, fixtures, suffix, algorithm, days, second_shift, seed, args.cache_dir,
+                                args.timeout))
+            runs.append(run)
+            print(suffix, algorithm, days, second_shift, repetition, run['status'], run.get('wall_time', ''),
+                  file=sys.stderr)
+
+    report = {'fixtures': 'synthetic' if args.classes else fixtures, 'python': sys.version.split()[0],
+              'cpu_count': os.cpu_count(), 'runs': runs, 'summary': summarize(runs)}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
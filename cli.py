@@ -0,0 +1,295 @@
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.feasibility import InfeasibleScheduleError
+from genetic_algoritm.inputs import DEFAULT_CACHE_DIR, INPUT_ARGUMENTS, load_input
+from genetic_algoritm.stopping import StoppingPolicy
+
+# Шаблоны имен входных файлов школы в пакетном режиме (проверяются по порядку)
+INPUT_PATTERNS = (('teachers_wishes', ('teachers_wishes*.xlsx', 'wishes*.xlsx')),
+                  ('academic_plan', ('uch_plan*.xlsx',)),
+                  ('audiences_lessons', ('aud_type*.xlsx',)),
+                  ('audiences', ('audiences*.xlsx',)),
+                  ('teachers', ('teachers*.xlsx',)),
+                  ('rings', ('rings*.xlsx',)))
+
+# Входные файлы, без которых расписание не составить
+REQUIRED_INPUTS = ('academic_plan', 'teachers', 'audiences_lessons', 'audiences', 'rings')
+
+
+def find_school_inputs(school_dir: str) -> dict:
+    """
+    Поиск входных файлов школы в каталоге по шаблонам INPUT_PATTERNS.
+    Каждый файл относится к первому подходящему шаблону.
+
+    Параметры
+    ---------
+    school_dir : str
+        Каталог с входными файлами школы.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Словарь {'вид входных данных': 'путь к файлу'}.
+    """
+    paths = {}
+    for file_name in sorted(os.listdir(school_dir)):
+        # Временные файлы Excel
+        if file_name.startswith('~$'):
+            continue
+        for name, patterns in INPUT_PATTERNS:
+            if any(fnmatch.fnmatch(file_name, pattern) for pattern in patterns):
+                paths.setdefault(name, os.path.join(school_dir, file_name))
+                break
+
+    missing = [name for name in REQUIRED_INPUTS if name not in paths]
+    if missing:
+        raise FileNotFoundError('В каталоге ' + school_dir + ' не найдены входные файлы: ' + ', '.join(missing))
+    return paths
+
+
+def read_inputs(paths: dict, cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+    """
+    Чтение входных файлов в ДатаФреймы через кэш load_input.
+    Если файл с пожеланиями учителей не задан, пожелания пустые.
+
+    Параметры
+    ---------
+    paths : dict
+        Словарь {'вид входных данных': 'путь к файлу'}.
+    cache_dir : str
+        Каталог кэша разобранных файлов или None, чтобы читать Excel каждый раз.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Словарь {'df_<вид входных данных>': pd.DataFrame}.
+    """
+    frames = {INPUT_ARGUMENTS[name]: load_input(paths[name], name, cache_dir) for name in REQUIRED_INPUTS}
+    if paths.get('teachers_wishes'):
+        frames['df_teachers_wishes'] = load_input(paths['teachers_wishes'], 'teachers_wishes', cache_dir)
+    else:
+        frames['df_teachers_wishes'] = pd.DataFrame(columns=['teacher', 'interval', 'is_lesson'])
+    return frames
+
+
+def create_school_schedule(paths: dict, output_dir: str, number_of_days_in_week: int, second_shift: bool,
+                           algorithm: str, telemetry_name: str = None, stopping_policy: StoppingPolicy = None,
+                           checkpoint_name: str = None, resume: bool = False, initial_schedule: str = None,
+                           cache_dir: str = DEFAULT_CACHE_DIR) -> tuple:
+    """
+    Составление расписания одной школы и сохранение таблиц для классов и учителей.
+
+    Параметры
+    ---------
+    paths : dict
+        Словарь {'вид входных данных': 'путь к файлу'}.
+    output_dir : str
+        Каталог для файлов schedule.xlsx и schedule_for_teachers.xlsx.
+    number_of_days_in_week : int
+        Количество учебных дней в неделе.
+    second_shift : bool
+        Наличие второй смены.
+    algorithm : str
+        Вариант генетического алгоритма.
+    telemetry_name : str
+        Имя файла телеметрии JSON Lines в каталоге output_dir или None.
+    stopping_policy : StoppingPolicy
+        Условие останова или None для условия по умолчанию.
+    checkpoint_name : str
+        Имя файла контрольной точки в каталоге output_dir или None.
+    resume : bool
+        Продолжить запуск с контрольной точки, если она есть.
+    initial_schedule : str
+        Файл расписания классов для algorithm='reschedule'. По умолчанию - schedule.xlsx в каталоге output_dir.
+    cache_dir : str
+        Каталог кэша разобранных входных файлов или None.
+
+    Возвращаемое значение
+    ---------------------
+    tuple
+        Оценки итогового расписания, время составления в секундах, причина остановки
+        и уроки, которые не удалось поставить, [(класс, урок, количество), ...].
+    """
+    start_time = time.time()
+    os.makedirs(output_dir, exist_ok=True)
+    telemetry_path = os.path.join(output_dir, telemetry_name) if telemetry_name else None
+    checkpoint_path = os.path.join(output_dir, checkpoint_name) if checkpoint_name else None
+    if algorithm == 'reschedule' and initial_schedule is None:
+        initial_schedule = os.path.join(output_dir, 'schedule.xlsx')
+    schedule = ga.Schedule(number_of_days_in_week=number_of_days_in_week, second_shift=second_shift,
+                           algorithm=algorithm, telemetry_path=telemetry_path, stopping_policy=stopping_policy,
+                           checkpoint_path=checkpoint_path, resume=resume, initial_schedule=initial_schedule,
+                           **read_inputs(paths, cache_dir))
+
+    schedule.save_schedule(os.path.join(output_dir, 'schedule.xlsx'),
+                           os.path.join(output_dir, 'schedule_for_teachers.xlsx'))
+    return schedule.best_score, time.time() - start_time, schedule.stop_reason, schedule.missing_lessons()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+    """
+    parser = argparse.ArgumentParser(description='Составление школьного расписания без графического интерфейса.')
+
+    parser.add_argument('--academic-plan', help='Учебный план')
+    parser.add_argument('--teachers', help='Учителя')
+    parser.add_argument('--audiences-lessons', help='Типы аудиторий для уроков')
+    parser.add_argument('--audiences', help='Аудитории')
+    parser.add_argument('--rings', help='Звонки')
+    parser.add_argument('--wishes', help='Пожелания учителей (необязательно)')
+    parser.add_argument('--schools', metavar='DIR',
+                        help='Каталог школ: каждый подкаталог содержит входные файлы одной школы')
+
+    parser.add_argument('--days', type=int, choices=(4, 5, 6), default=5,
+                        help='Количество учебных дней в неделе (по умолчанию 5)')
+    parser.add_argument('--second-shift', action='store_true', help='Есть вторая смена')
+    parser.add_argument('--algorithm', choices=('modification', 'classic', 'local_search', 'exact', 'population',
+                                                'islands', 'reschedule'),
+                        default='modification',
+                        help='Вариант генетического алгоритма; local_search - локальный поиск с отжигом '
+                             'и списком запретов; exact - точный перебор для школ до 15 классов; '
+                             'reschedule - пересоставление существующего расписания')
+    parser.add_argument('--initial-schedule', metavar='PATH', default=None,
+                        help='Исходное расписание классов для --algorithm reschedule '
+                             '(по умолчанию - schedule.xlsx в каталоге результатов)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Количество процессов для пакетного режима (по умолчанию - число ядер)')
+    parser.add_argument('--max-generations', type=int, default=10, help='Наибольшее количество поколений')
+    parser.add_argument('--time-budget', type=float, default=60 * 5, help='Ограничение времени, с')
+    parser.add_argument('--stagnation', type=int, default=None, metavar='K',
+                        help='Остановка, если оценка не улучшалась K поколений подряд')
+    parser.add_argument('--telemetry', metavar='NAME', default=None,
+                        help='Имя файла телеметрии поколений (JSON Lines) в каталоге результатов')
+    parser.add_argument('--checkpoint', metavar='NAME', default=None,
+                        help='Имя файла контрольной точки в каталоге результатов '
+                             '(алгоритмы modification, classic и local_search)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Продолжить прерванный запуск с контрольной точки --checkpoint')
+    parser.add_argument('--cache-dir', metavar='DIR', default=DEFAULT_CACHE_DIR,
+                        help='Каталог кэша разобранных входных файлов (по умолчанию ' + DEFAULT_CACHE_DIR + ')')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Читать входные файлы Excel без кэша')
+    parser.add_argument('--output', default=None,
+                        help='Каталог для результатов (по умолчанию - текущий или каталог школы)')
+
+    args = parser.parse_args(argv)
+    files = (args.academic_plan, args.teachers, args.audiences_lessons, args.audiences, args.rings)
+    if args.schools is None and not all(files):
+        parser.error('укажите --schools или все пять входных файлов: --academic-plan, --teachers, '
+                     '--audiences-lessons, --audiences, --rings')
+    if args.schools is not None and any(files + (args.wishes,)):
+        parser.error('--schools нельзя сочетать с отдельными входными файлами')
+    if args.initial_schedule is not None and args.schools is not None:
+        parser.error('--initial-schedule нельзя сочетать с --schools: берется schedule.xlsx каталога результатов')
+    if args.resume and args.checkpoint is None:
+        parser.error('--resume требует --checkpoint')
+    return args
+
+
+def stopping_policy(args: argparse.Namespace) -> StoppingPolicy:
+    """
+    Условие останова по аргументам командной строки.
+    """
+    return StoppingPolicy(max_generations=args.max_generations, time_budget=args.time_budget,
+                          stagnation_window=args.stagnation)
+
+
+def cache_dir(args: argparse.Namespace) -> str:
+    """
+    Каталог кэша входных файлов по аргументам командной строки или None без кэша.
+    """
+    return None if args.no_cache else args.cache_dir
+
+
+def format_missing(missing: list) -> str:
+    """
+    Список непоставленных уроков для вывода: '5а Физкультура x2, ...'.
+    """
+    return ', '.join(f'{sch_class} {lesson} x{count}' for sch_class, lesson, count in missing)
+
+
+def run_single(args: argparse.Namespace) -> int:
+    """
+    Составление расписания одной школы по отдельным входным файлам.
+    """
+    paths = {'academic_plan': args.academic_plan, 'teachers': args.teachers,
+             'audiences_lessons': args.audiences_lessons, 'audiences': args.audiences,
+             'rings': args.rings, 'teachers_wishes': args.wishes}
+    try:
+        score, elapsed, reason, missing = create_school_schedule(paths, args.output or '.', args.days,
+                                                                 args.second_shift, args.algorithm, args.telemetry,
+                                                                 stopping_policy(args), args.checkpoint, args.resume,
+                                                                 args.initial_schedule, cache_dir(args))
+    except InfeasibleScheduleError as error:
+        print(error, file=sys.stderr)
+        return 2
+    print('Оценки:', score, 'время:', round(elapsed, 2), 'с', 'остановка:', reason)
+    if missing:
+        print('Не поставлены уроки:', format_missing(missing), file=sys.stderr)
+    return 0
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Составление расписаний всех школ каталога в пуле процессов.
+    Ошибка одной школы не прерывает остальные.
+    """
+    schools = sorted(name for name in os.listdir(args.schools)
+                     if os.path.isdir(os.path.join(args.schools, name)))
+    if not schools:
+        print('В каталоге', args.schools, 'нет школ', file=sys.stderr)
+        return 1
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        for school in schools:
+            school_dir = os.path.join(args.schools, school)
+            try:
+                paths = find_school_inputs(school_dir)
+            except FileNotFoundError as error:
+                print(school + ': ошибка:', error, file=sys.stderr)
+                failed += 1
+                continue
+            output_dir = os.path.join(args.output, school) if args.output else school_dir
+            futures[executor.submit(create_school_schedule, paths, output_dir, args.days, args.second_shift,
+                                    args.algorithm, args.telemetry, stopping_policy(args), args.checkpoint,
+                                    args.resume, None, cache_dir(args))] = school
+
+        for future in as_completed(futures):
+            school = futures[future]
+            try:
+                score, elapsed, reason, missing = future.result()
+            except InfeasibleScheduleError as error:
+                print(school + ':', error, file=sys.stderr)
+                failed += 1
+            except Exception as error:
+                print(school + ': ошибка:', repr(error), file=sys.stderr)
+                failed += 1
+            else:
+                print(school + ': оценки:', score, 'время:', round(elapsed, 2), 'с', 'остановка:', reason)
+                if missing:
+                    print(school + ': не поставлены уроки:', format_missing(missing), file=sys.stderr)
+
+    print('Готово:', len(schools) - failed, 'из', len(schools))
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.schools is not None:
+        return run_batch(args)
+    return run_single(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os
+import pickle
+
+# Версия формата контрольной точки
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """
+    Сохраняет состояние поиска в файл. Запись идет во временный файл, который затем заменяет прежний,
+    поэтому прерывание во время записи не портит предыдущую контрольную точку.
+
+    Параметры
+    ---------
+    path : str
+        Путь к файлу контрольной точки.
+    state : dict
+        Состояние поиска.
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump(dict(state, version=CHECKPOINT_VERSION), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Загружает состояние поиска из файла.
+
+    Параметры
+    ---------
+    path : str
+        Путь к файлу контрольной точки.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Состояние поиска или None, если файла нет.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError('Неподдерживаемая версия контрольной точки: ' + str(state.get('version')))
+    return state
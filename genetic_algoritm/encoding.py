@@ -0,0 +1,199 @@
+import numpy as np
+
+
+class ScheduleEncoding:
+    """
+    Класс для целочисленного кодирования расписания.
+    Идентификаторы классов, учителей, уроков и аудиторий назначаются один раз по упорядоченным кортежам
+    объекта Schedule и общие для всех особей.
+
+    Атрибуты
+    --------
+    intervals : tuple
+        Упорядоченный кортеж с интервалами для уроков
+    classes : tuple
+        Упорядоченный кортеж с классами
+    teachers : tuple
+        Упорядоченный кортеж с учителями
+    lessons : tuple
+        Упорядоченный кортеж с уроками
+    audiences : tuple
+        Упорядоченный кортеж с аудиториями
+
+    interval_ids, class_ids, teacher_ids, lesson_ids, audience_ids : dict
+        Обратные индексы {значение: идентификатор}
+
+    Методы
+    ------
+    empty():
+        Возвращает пустое расписание в виде массивов.
+    encode(schedule_dict):
+        Преобразует schedule_dict в массивы.
+    decode(arrays):
+        Преобразует массивы в schedule_dict.
+    """
+    # Идентификатор пустой ячейки
+    EMPTY = -1
+    # Тип элементов массивов
+    dtype = np.int16
+
+    def __init__(self, intervals, classes, teachers, lessons, audiences):
+        """
+        Устанавливает необходимые атрибуты для объекта ScheduleEncoding.
+
+        Параметры
+        ---------
+        intervals : tuple
+            Упорядоченный кортеж с интервалами для уроков.
+        classes : tuple
+            Упорядоченный кортеж с классами.
+        teachers : tuple
+            Упорядоченный кортеж с учителями.
+        lessons : tuple
+            Упорядоченный кортеж с уроками.
+        audiences : tuple
+            Упорядоченный кортеж с аудиториями.
+        """
+        self.intervals = tuple(intervals)
+        self.classes = tuple(classes)
+        self.teachers = tuple(teachers)
+        self.lessons = tuple(lessons)
+        self.audiences = tuple(audiences)
+
+        if max(len(self.teachers), len(self.lessons), len(self.audiences)) > np.iinfo(self.dtype).max:
+            raise ValueError('Слишком много учителей, уроков или аудиторий для кодирования в ' + str(self.dtype))
+
+        self.interval_ids = {interval: i for i, interval in enumerate(self.intervals)}
+        self.class_ids = {school_class: i for i, school_class in enumerate(self.classes)}
+        self.teacher_ids = {teacher: i for i, teacher in enumerate(self.teachers)}
+        self.lesson_ids = {lesson: i for i, lesson in enumerate(self.lessons)}
+        self.audience_ids = {audience: i for i, audience in enumerate(self.audiences)}
+
+    def empty(self) -> 'ScheduleArrays':
+        """
+        Возвращает пустое расписание в виде массивов.
+        """
+        shape = (len(self.intervals), len(self.classes))
+        return ScheduleArrays(self,
+                              np.full(shape, self.EMPTY, dtype=self.dtype),
+                              np.full(shape, self.EMPTY, dtype=self.dtype),
+                              np.full(shape, self.EMPTY, dtype=self.dtype))
+
+    def encode(self, schedule_dict: dict) -> 'ScheduleArrays':
+        """
+        Преобразует расписание из шаблона schedule_dict в массивы.
+        Если у класса в интервале несколько ячеек (накладка), сохраняется последняя.
+
+        Параметры
+        ---------
+        schedule_dict : dict
+            Расписание по шаблону {'интервал': {'аудитория': {'class', 'lesson', 'teacher'}}}.
+        """
+        arrays = self.empty()
+        for interval, cells in schedule_dict.items():
+            interval_id = self.interval_ids[interval]
+            for audience, cell in cells.items():
+                class_id = self.class_ids[cell['class']]
+                arrays.lesson[interval_id, class_id] = self.lesson_ids[cell['lesson']]
+                arrays.teacher[interval_id, class_id] = self.teacher_ids[cell['teacher']]
+                arrays.audience[interval_id, class_id] = self.audience_ids[str(audience)]
+        return arrays
+
+    def decode(self, arrays: 'ScheduleArrays') -> dict:
+        """
+        Преобразует массивы в расписание по шаблону schedule_dict.
+
+        Параметры
+        ---------
+        arrays : ScheduleArrays
+            Расписание в виде массивов.
+        """
+        schedule_dict = {interval: {} for interval in self.intervals}
+        for interval_id, class_id in zip(*np.nonzero(arrays.lesson != self.EMPTY)):
+            interval = self.intervals[interval_id]
+            audience = self.audiences[arrays.audience[interval_id, class_id]]
+            schedule_dict[interval][audience] = {'class': self.classes[class_id],
+                                                 'lesson': self.lessons[arrays.lesson[interval_id, class_id]],
+                                                 'teacher': self.teachers[arrays.teacher[interval_id, class_id]]}
+        return schedule_dict
+
+
+class ScheduleArrays:
+    """
+    Расписание в виде плотных целочисленных массивов (интервал x класс).
+    Пустая ячейка кодируется ScheduleEncoding.EMPTY.
+
+    Атрибуты
+    --------
+    encoding : ScheduleEncoding
+        Общая для всех особей таблица идентификаторов
+    lesson : np.ndarray
+        Идентификаторы уроков
+    teacher : np.ndarray
+        Идентификаторы учителей
+    audience : np.ndarray
+        Идентификаторы аудиторий
+
+    Методы
+    ------
+    cell(interval_id, class_id):
+        Возвращает ячейку расписания в виде словаря.
+    occupied():
+        Возвращает булеву матрицу занятости классов.
+    copy():
+        Возвращает копию расписания.
+    """
+
+    def __init__(self, encoding: ScheduleEncoding, lesson: np.ndarray, teacher: np.ndarray, audience: np.ndarray):
+        """
+        Устанавливает необходимые атрибуты для объекта ScheduleArrays.
+
+        Параметры
+        ---------
+        encoding : ScheduleEncoding
+            Общая для всех особей таблица идентификаторов.
+        lesson, teacher, audience : np.ndarray
+            Массивы идентификаторов уроков, учителей и аудиторий формы (интервалы, классы).
+        """
+        self.encoding = encoding
+        self.lesson = lesson
+        self.teacher = teacher
+        self.audience = audience
+
+    def cell(self, interval_id: int, class_id: int) -> dict:
+        """
+        Возвращает ячейку расписания {'class', 'lesson', 'teacher', 'audience'} или пустой словарь.
+
+        Параметры
+        ---------
+        interval_id : int
+            Индекс интервала.
+        class_id : int
+            Индекс класса.
+        """
+        lesson_id = self.lesson[interval_id, class_id]
+        if lesson_id == self.encoding.EMPTY:
+            return {}
+        return {'class': self.encoding.classes[class_id],
+                'lesson': self.encoding.lessons[lesson_id],
+                'teacher': self.encoding.teachers[self.teacher[interval_id, class_id]],
+                'audience': self.encoding.audiences[self.audience[interval_id, class_id]]}
+
+    def occupied(self) -> np.ndarray:
+        """
+        Возвращает булеву матрицу (интервалы, классы): True, если у класса есть урок.
+        """
+        return self.lesson != self.encoding.EMPTY
+
+    def copy(self) -> 'ScheduleArrays':
+        """
+        Возвращает копию расписания с общей таблицей идентификаторов.
+        """
+        return ScheduleArrays(self.encoding, self.lesson.copy(), self.teacher.copy(), self.audience.copy())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Объем памяти, занимаемый массивами, в байтах.
+        """
+        return self.lesson.nbytes + self.teacher.nbytes + self.audience.nbytes
@@ -0,0 +1,396 @@
+class IncrementalEvaluator:
+    """
+    Класс для инкрементальной оценки расписания.
+    Хранит штрафы по каждой паре (класс, день) и (учитель, день) и пересчитывает только те дни,
+    которые затронуты изменениями расписания. Изменения отмечаются через touch(), который вызывают
+    Schedule.place_cell и Schedule.remove_cell.
+
+    Атрибуты
+    --------
+    schedule : Schedule
+        Оцениваемое расписание
+    lessons_per_day : int
+        Количество интервалов в дне
+    end_of_the_shift : int
+        Номер последнего урока первой смены в течение дня
+
+    Методы
+    ------
+    invalidate():
+        Отмечает все дни как измененные.
+    touch(interval, cell):
+        Отмечает день ячейки cell как измененный для ее класса и учителя.
+    class_windows():
+        Окна по классам.
+    teacher_windows():
+        Окна по учителям.
+    wishes_violations():
+        Нарушенные пожелания учителей.
+    concentration_failures():
+        Дни классов без 2 или 3 урока.
+    distribution_failures():
+        Классы, у которых максимум уроков не во вторник или четверг.
+    score(window_fine, teacher_fine, wishes_fine, concentration_fine, distribution_fine):
+        Оценки приспособленности по каждому параметру.
+    score_swap(school_class, first_interval, second_interval, ...):
+        Оценки приспособленности после обмена ячеек класса, без применения обмена.
+    """
+
+    def __init__(self, schedule):
+        """
+        Устанавливает необходимые атрибуты для объекта IncrementalEvaluator.
+
+        Параметры
+        ---------
+        schedule : Schedule
+            Оцениваемое расписание.
+        """
+        self.schedule = schedule
+        self.lessons_per_day = len(schedule.intervals) // schedule.number_of_days_in_week
+        self.end_of_the_shift = self.lessons_per_day
+        if schedule.second_shift:
+            # Конец первой смены
+            self.end_of_the_shift = (self.lessons_per_day - 1) // 2
+
+        # {(класс, день): (окна, количество уроков, нет 2 или 3 урока)}
+        self._class_days = {}
+        # {(учитель, день): окна}
+        self._teacher_days = {}
+        # {класс: нарушено ли распределение по неделе}
+        self._distribution = {}
+
+        # Суммарные значения по всем дням
+        self._class_windows_count = 0
+        self._teacher_windows_count = 0
+        self._concentration_count = 0
+        self._distribution_count = 0
+
+        self._dirty_class_days = set()
+        self._dirty_teacher_days = set()
+        self._valid = False
+
+    def invalidate(self) -> None:
+        """
+        Отмечает все дни как измененные, например, после замены schedule_dict целиком.
+        """
+        self._valid = False
+
+    def touch(self, interval: str, cell: dict) -> None:
+        """
+        Отмечает день, в котором стоит ячейка cell, как измененный для ее класса и учителя.
+
+        Параметры
+        ---------
+        interval : str
+            Интервал, в котором изменилась ячейка.
+        cell : dict
+            Ячейка расписания {'class', 'lesson', 'teacher'}.
+        """
+        if not self._valid:
+            return
+        day = self.schedule.interval_index[interval] // self.lessons_per_day
+        self._dirty_class_days.add((cell['class'], day))
+        self._dirty_teacher_days.add((cell['teacher'], day))
+
+    def _class_busy(self, interval_index: int, school_class: str, overlay: dict) -> bool:
+        """
+        Есть ли у класса урок в интервале с учетом предполагаемых изменений overlay.
+        """
+        changed = overlay.get(interval_index)
+        if changed is not None and school_class in changed:
+            return changed[school_class] is not None
+        return school_class in self.schedule.class_occupancy[self.schedule.intervals[interval_index]]
+
+    def _teacher_classes(self, interval_index: int, teacher: str, overlay: dict) -> list:
+        """
+        Классы, у которых учитель ведет урок в интервале, с учетом предполагаемых изменений overlay.
+        """
+        interval = self.schedule.intervals[interval_index]
+        cells = self.schedule.schedule_dict[interval]
+        classes = [cells[audience]['class'] for audience in self.schedule.teacher_occupancy[interval].get(teacher, {})]
+        changed = overlay.get(interval_index)
+        if changed is not None:
+            classes = [school_class for school_class in classes if school_class not in changed]
+            for school_class, cell in changed.items():
+                if cell is not None and cell['teacher'] == teacher:
+                    classes.append(school_class)
+        return classes
+
+    def _evaluate_class_day(self, school_class: str, day: int, overlay: dict) -> tuple:
+        """
+        Окна, количество уроков и нарушение пика концентрации для класса в день day.
+        Логика поиска окон совпадает с Schedule.class_window_finder.
+        """
+        windows = tuple()
+        count = 0
+        is_curr_lesson = False
+        today_lessons = False
+        start = day * self.lessons_per_day
+        busy = [self._class_busy(start + lesson, school_class, overlay) for lesson in range(self.lessons_per_day)]
+
+        for lesson in range(self.lessons_per_day):
+            # Новый день или новая смена
+            if lesson == 0 or lesson == self.end_of_the_shift + 1:
+                is_prev_lesson = False
+                today_lessons = False
+            else:
+                is_prev_lesson = is_curr_lesson
+            is_curr_lesson = busy[lesson]
+            count += is_curr_lesson
+
+            if is_prev_lesson or not is_curr_lesson:
+                continue
+            elif today_lessons:
+                # Окно
+                windows = windows + (start + lesson - 1,)
+            else:
+                today_lessons = True
+
+        # Пик концентрации в течение дня приходится на 2 и 3 уроки, если смена первая
+        concentration = not self.schedule.shift_standart[self.schedule.class_grade(school_class)] \
+            and self.lessons_per_day > 2 and not (busy[1] and busy[2])
+        return windows, count, concentration
+
+    def _evaluate_teacher_day(self, teacher: str, day: int, overlay: dict) -> tuple:
+        """
+        Окна учителя в день day в виде ((индекс_интервала, индекс_класса), ...).
+        Логика поиска окон совпадает с Schedule.teacher_window_finder.
+        """
+        windows = tuple()
+        is_curr_lesson = False
+        today_lessons = False
+        start = day * self.lessons_per_day
+
+        for lesson in range(self.lessons_per_day):
+            is_prev_lesson = is_curr_lesson if lesson else False
+            classes = self._teacher_classes(start + lesson, teacher, overlay)
+            is_curr_lesson = bool(classes)
+
+            if is_prev_lesson or not is_curr_lesson:
+                continue
+            elif today_lessons:
+                # Окно
+                windows = windows + tuple((start + lesson - 1, self.schedule.class_index[school_class])
+                                          for school_class in classes)
+            else:
+                today_lessons = True
+        return windows
+
+    def _is_distribution_broken(self, counts: list) -> bool:
+        """
+        Наибольший объем учебной нагрузки должен приходиться на вторник или четверг.
+        """
+        return counts.index(max(counts)) not in (1, 3)
+
+    def _class_counts(self, school_class: str) -> list:
+        """
+        Количество уроков класса по дням недели.
+        """
+        return [self._class_days[(school_class, day)][1] for day in range(self.schedule.number_of_days_in_week)]
+
+    def _set_class_day(self, key: tuple, value: tuple) -> None:
+        """
+        Заменяет сохраненную оценку дня класса и обновляет суммарные значения.
+        """
+        old = self._class_days.get(key)
+        if old is not None:
+            self._class_windows_count -= len(old[0])
+            self._concentration_count -= old[2]
+        self._class_days[key] = value
+        self._class_windows_count += len(value[0])
+        self._concentration_count += value[2]
+
+    def _set_teacher_day(self, key: tuple, value: tuple) -> None:
+        """
+        Заменяет сохраненную оценку дня учителя и обновляет суммарные значения.
+        """
+        old = self._teacher_days.get(key)
+        if old is not None:
+            self._teacher_windows_count -= len(old)
+        self._teacher_days[key] = value
+        self._teacher_windows_count += len(value)
+
+    def _set_distribution(self, school_class: str) -> None:
+        """
+        Пересчитывает распределение нагрузки по неделе для класса.
+        """
+        broken = self._is_distribution_broken(self._class_counts(school_class))
+        self._distribution_count += broken - self._distribution.get(school_class, False)
+        self._distribution[school_class] = broken
+
+    def refresh(self) -> None:
+        """
+        Пересчитывает оценки измененных дней.
+        """
+        days = range(self.schedule.number_of_days_in_week)
+        if not self._valid:
+            self._class_days, self._teacher_days, self._distribution = {}, {}, {}
+            self._class_windows_count = self._teacher_windows_count = 0
+            self._concentration_count = self._distribution_count = 0
+            self._dirty_class_days = {(school_class, day) for school_class in self.schedule.classes for day in days}
+            self._dirty_teacher_days = {(teacher, day) for teacher in self.schedule.teachers for day in days}
+            self._valid = True
+
+        classes = set()
+        for school_class, day in self._dirty_class_days:
+            self._set_class_day((school_class, day), self._evaluate_class_day(school_class, day, {}))
+            classes.add(school_class)
+        for school_class in classes:
+            self._set_distribution(school_class)
+        for teacher, day in self._dirty_teacher_days:
+            self._set_teacher_day((teacher, day), self._evaluate_teacher_day(teacher, day, {}))
+        self._dirty_class_days = set()
+        self._dirty_teacher_days = set()
+
+    def class_windows(self) -> set[tuple[int, int]]:
+        """
+        Возвращает окна по классам, как Schedule.class_window_finder.
+
+        Возвращаемое значение
+        ---------------------
+        set
+            {(индекс_интервала, индекс_класса), ...}
+        """
+        self.refresh()
+        return {(interval_index, self.schedule.class_index[school_class])
+                for (school_class, day), value in self._class_days.items() for interval_index in value[0]}
+
+    def teacher_windows(self) -> set[tuple[int, int]]:
+        """
+        Возвращает окна по учителям, как Schedule.teacher_window_finder.
+
+        Возвращаемое значение
+        ---------------------
+        set
+            {(индекс_интервала, индекс_класса), ...}
+        """
+        self.refresh()
+        return {window for windows in self._teacher_days.values() for window in windows}
+
+    def wishes_violations(self) -> list[tuple[int, str]]:
+        """
+        Возвращает пожелания учителей, которые нарушены: учитель ведет урок в интервал, когда не хочет работать.
+
+        Возвращаемое значение
+        ---------------------
+        list
+            [(индекс_интервала, учитель), ...]
+        """
+        violations = []
+        wishes = self.schedule.df_teachers_wishes
+        if wishes.empty:
+            return violations
+        for teacher, interval in zip(wishes['teacher'].tolist(), wishes['interval'].tolist()):
+            if teacher in self.schedule.teacher_occupancy[interval]:
+                violations.append((self.schedule.interval_index[interval], teacher))
+        return violations
+
+    def concentration_failures(self) -> list[tuple[str, int]]:
+        """
+        Возвращает дни классов первой смены, в которые нет 2 или 3 урока.
+
+        Возвращаемое значение
+        ---------------------
+        list
+            [(класс, день), ...] в порядке классов и дней
+        """
+        self.refresh()
+        return [(school_class, day) for school_class in self.schedule.classes
+                for day in range(self.schedule.number_of_days_in_week) if self._class_days[(school_class, day)][2]]
+
+    def distribution_failures(self) -> list[str]:
+        """
+        Возвращает классы, у которых наибольший объем нагрузки не приходится на вторник или четверг.
+        """
+        self.refresh()
+        return [school_class for school_class in self.schedule.classes if self._distribution[school_class]]
+
+    def score(self, window_fine: int, teacher_fine: int, wishes_fine: int, concentration_fine: int,
+              distribution_fine: int) -> tuple:
+        """
+        Оценки приспособленности по каждому параметру без изменения расписания,
+        как Schedule.classic_ga_target_function.
+
+        Возвращаемое значение
+        ---------------------
+        tuple
+            Оценки приспособленности по каждому параметру.
+        """
+        self.refresh()
+        return (window_fine * self._class_windows_count,
+                teacher_fine * self._teacher_windows_count,
+                wishes_fine * len(self.wishes_violations()),
+                concentration_fine * self._concentration_count,
+                distribution_fine * self._distribution_count)
+
+    def score_swap(self, school_class: str, first_interval: int, second_interval: int, window_fine: int,
+                   teacher_fine: int, wishes_fine: int, concentration_fine: int, distribution_fine: int) -> tuple:
+        """
+        Оценки приспособленности после обмена ячеек класса school_class между двумя интервалами.
+        Расписание не меняется: пересчитываются только затронутые дни класса и учителей.
+
+        Параметры
+        ---------
+        school_class : str
+            Класс, ячейки которого меняются местами.
+        first_interval : int
+            Индекс первого интервала.
+        second_interval : int
+            Индекс второго интервала.
+
+        Возвращаемое значение
+        ---------------------
+        tuple
+            Оценки приспособленности по каждому параметру после обмена.
+        """
+        self.refresh()
+        schedule = self.schedule
+        cells = []
+        for interval_index in (first_interval, second_interval):
+            interval = schedule.intervals[interval_index]
+            audience = schedule.class_occupancy[interval].get(school_class)
+            cells.append(schedule.schedule_dict[interval][audience] if audience is not None else None)
+        overlay = {first_interval: {school_class: cells[1]}, second_interval: {school_class: cells[0]}}
+        if first_interval == second_interval:
+            overlay = {}
+
+        class_windows = self._class_windows_count
+        concentration = self._concentration_count
+        distribution = self._distribution_count
+        teacher_windows = self._teacher_windows_count
+        wishes = len(self.wishes_violations())
+
+        # Дни класса
+        days = {first_interval // self.lessons_per_day, second_interval // self.lessons_per_day}
+        counts = self._class_counts(school_class)
+        for day in days:
+            old = self._class_days[(school_class, day)]
+            new = self._evaluate_class_day(school_class, day, overlay)
+            class_windows += len(new[0]) - len(old[0])
+            concentration += new[2] - old[2]
+            counts[day] = new[1]
+        distribution += self._is_distribution_broken(counts) - self._distribution[school_class]
+
+        # Дни учителей
+        teachers = {cell['teacher'] for cell in cells if cell is not None}
+        for teacher in teachers:
+            for day in days:
+                old = self._teacher_days[(teacher, day)]
+                teacher_windows += len(self._evaluate_teacher_day(teacher, day, overlay)) - len(old)
+
+        # Пожелания учителей
+        wishes_frame = schedule.df_teachers_wishes
+        if teachers and not wishes_frame.empty:
+            for teacher, interval in zip(wishes_frame['teacher'].tolist(), wishes_frame['interval'].tolist()):
+                interval_index = schedule.interval_index[interval]
+                if teacher not in teachers or interval_index not in overlay:
+                    continue
+                before = teacher in schedule.teacher_occupancy[interval]
+                after = bool(self._teacher_classes(interval_index, teacher, overlay))
+                wishes += after - before
+
+        return (window_fine * class_windows,
+                teacher_fine * teacher_windows,
+                wishes_fine * wishes,
+                concentration_fine * concentration,
+                distribution_fine * distribution)
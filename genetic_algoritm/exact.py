@@ -0,0 +1,524 @@
+import time
+
+from .matching import bipartite_matching
+from .stopping import CANCELLED, TIME_BUDGET
+
+# Итоги точного поиска
+OPTIMAL = 'optimal'
+FEASIBLE = 'feasible'
+INFEASIBLE = 'infeasible'
+UNKNOWN = 'unknown'
+
+# Причина остановки по количеству узлов перебора
+NODE_LIMIT = 'node_limit'
+
+
+def _windows(busy: int, segment: int) -> int:
+    """
+    Количество окон в отрезке дня: на одно меньше, чем серий подряд идущих уроков.
+    Занятость и отрезок - битовые маски интервалов.
+    """
+    lessons = busy & segment
+    if not lessons:
+        return 0
+    return (lessons & ~(lessons << 1)).bit_count() - 1
+
+
+class ExactSolver:
+    """
+    Класс для точного поиска расписания перебором с возвратом.
+    Переменные - экземпляры уроков (класс, урок, номер), значения - интервал и учитель; аудитории
+    проверяются паросочетанием и расставляются после поиска. Все уроки класса по одному предмету ведет
+    один учитель, как в create_first_population, а экземпляры одного урока ставятся по возрастанию
+    интервалов, чтобы не перебирать их перестановки.
+
+    Первым выбирается урок с наименьшим запасом допустимых интервалов, значения перебираются
+    по возрастанию штрафа. После каждой постановки проверяется, что у каждого урока, класса и учителя
+    хватает свободных интервалов, а нижняя оценка штрафа меньше лучшего найденного расписания
+    (ветви и границы). Нижняя оценка учитывает окна, которые уже не закрыть оставшимися уроками,
+    и нарушенные пожелания учителей.
+
+    Занятость классов, учителей и аудиторий хранится битовыми масками интервалов.
+
+    Атрибуты
+    --------
+    schedule : Schedule
+        Расписание с подготовленными входными данными
+    fines : tuple
+        Штрафы (окно класса, окно учителя, пожелание, пик концентрации, распределение по неделе)
+    node_limit : int
+        Наибольшее количество узлов перебора или None
+    time_limit : float
+        Ограничение времени в секундах или None
+    status : str
+        Итог поиска: 'optimal', 'feasible', 'infeasible' или 'unknown'
+    stop_reason : str
+        Причина досрочной остановки: 'node_limit', 'time_budget', 'cancelled' или None
+    nodes : int
+        Количество пройденных узлов перебора
+    best_cost : int
+        Штраф лучшего найденного расписания или None
+    solution : list
+        Лучшее найденное расписание [(интервал, класс, урок, учитель), ...] или None
+    partial : list
+        Наибольшая частичная расстановка в том же виде, пока не найдено ни одного расписания
+
+    Методы
+    ------
+    solve():
+        Запускает перебор и возвращает итог поиска.
+    """
+
+    def __init__(self, schedule, fines: tuple = (50, 30, 50, 10, 10), node_limit: int = 200000,
+                 time_limit: float = None):
+        """
+        Устанавливает необходимые атрибуты для объекта ExactSolver.
+
+        Параметры
+        ---------
+        schedule : Schedule
+            Расписание с подготовленными входными данными.
+        fines : tuple
+            Штрафы по каждому параметру оценки, как в Schedule.classic_ga_target_function.
+        node_limit : int
+            Наибольшее количество узлов перебора. None - без ограничения.
+        time_limit : float
+            Ограничение времени в секундах. None - без ограничения.
+        """
+        self.schedule = schedule
+        self.fines = fines
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.status = None
+        self.stop_reason = None
+        self.nodes = 0
+        self.best_cost = None
+        self.solution = None
+        self.partial = []
+
+        intervals = schedule.intervals
+        days = schedule.number_of_days_in_week
+        self.lessons_per_day = len(intervals) // days
+        end_of_the_shift = self.lessons_per_day
+        if schedule.second_shift:
+            # Конец первой смены
+            end_of_the_shift = (self.lessons_per_day - 1) // 2
+
+        # Отрезки дня: для классов день делится на смены, для учителей - нет
+        self.day_masks = [((1 << self.lessons_per_day) - 1) << (day * self.lessons_per_day) for day in range(days)]
+        first_shift = (1 << min(end_of_the_shift + 1, self.lessons_per_day)) - 1
+        self.class_segments = []
+        for day, day_mask in enumerate(self.day_masks):
+            start = day * self.lessons_per_day
+            self.class_segments += [segment for segment in (first_shift << start, day_mask & ~(first_shift << start))
+                                    if segment]
+        self.class_segment_of = [next(segment for segment in self.class_segments if segment >> i & 1)
+                                 for i in range(len(intervals))]
+
+        # Классы: интервалы смены и нужен ли пик концентрации на 2 и 3 уроках
+        self.shift_masks = []
+        self.concentration = []
+        for school_class in schedule.classes:
+            mask = 0
+            for interval in schedule.class_shift_intervals(school_class):
+                mask |= 1 << schedule.interval_index[interval]
+            self.shift_masks.append(mask)
+            self.concentration.append(not schedule.shift_standart[schedule.class_grade(school_class)] and
+                                      self.lessons_per_day > 2)
+
+        # Уроки учебного плана: класс, урок, количество, тип аудитории и возможные учителя
+        self.groups = []
+        plan = schedule.df_academic_plan
+        for school_class, lesson, count in zip(plan['class'].tolist(), plan['lesson'].tolist(),
+                                               plan['count'].tolist()):
+            if not count > 0:
+                continue
+            teachers = tuple(schedule.teacher_index[teacher] for teacher in schedule.lesson_teachers[lesson])
+            self.groups.append((schedule.class_index[school_class], lesson, int(count),
+                                schedule.lesson_audience_type.get(lesson), teachers))
+
+        # Пожелания учителей {(учитель, интервал): количество строк}
+        self.wishes = dict()
+        wishes = schedule.df_teachers_wishes
+        if not wishes.empty:
+            for teacher, interval in zip(wishes['teacher'].tolist(), wishes['interval'].tolist()):
+                if teacher in schedule.teacher_index and interval in schedule.interval_index:
+                    key = (schedule.teacher_index[teacher], schedule.interval_index[interval])
+                    self.wishes[key] = self.wishes.get(key, 0) + 1
+
+        # Вместимость аудиторий по типам
+        self.capacity = {audience_type: len(audiences) for audience_type, audiences in
+                         schedule.audiences_by_type.items()}
+
+    def _reset(self) -> None:
+        """
+        Пустое расписание: состояние перебора перед запуском.
+        """
+        schedule = self.schedule
+        self.class_busy = [0] * len(schedule.classes)
+        self.teacher_busy = [0] * len(schedule.teachers)
+        self.class_windows = [0] * len(schedule.classes)
+        self.teacher_windows = [0] * len(schedule.teachers)
+        self.wishes_count = 0
+
+        # Оставшиеся уроки классов, учителей с выбранным уроком и учителей, которые еще могут его получить
+        self.class_remaining = [0] * len(schedule.classes)
+        self.teacher_remaining = [0] * len(schedule.teachers)
+        self.teacher_possible = [0] * len(schedule.teachers)
+        for school_class, _, count, _, teachers in self.groups:
+            self.class_remaining[school_class] += count
+            for teacher in teachers:
+                self.teacher_possible[teacher] += count
+
+        # Состояние уроков: учитель, поставленные интервалы
+        self.group_teacher = [None] * len(self.groups)
+        self.group_intervals = [[] for _ in self.groups]
+
+        # Аудитории: количество уроков каждого типа в интервале, интервалы без свободных аудиторий типа
+        # и уроки интервала для проверки паросочетанием
+        self.room_count = {audience_type: [0] * len(schedule.intervals) for audience_type in self.capacity}
+        self.room_full = {audience_type: 0 for audience_type in self.capacity}
+        self.interval_lessons = [[] for _ in schedule.intervals]
+
+        self.lower_bound = 0
+
+    def _class_term(self, school_class: int) -> int:
+        """
+        Окна класса, которые не закрыть оставшимися уроками: каждый урок закрывает не больше одного окна.
+        """
+        return self.fines[0] * max(0, self.class_windows[school_class] - self.class_remaining[school_class])
+
+    def _teacher_term(self, teacher: int) -> int:
+        """
+        Окна учителя, которые не закрыть уроками, которые он ведет или еще может получить.
+        """
+        return self.fines[1] * max(0, self.teacher_windows[teacher] - self.teacher_remaining[teacher] -
+                                   self.teacher_possible[teacher])
+
+    def _room_available(self, group: int, interval: int) -> bool:
+        """
+        Есть ли в интервале аудитория для урока при уже поставленных уроках.
+        """
+        schedule = self.schedule
+        lesson, audience_type = self.groups[group][1], self.groups[group][3]
+        if audience_type not in self.capacity:
+            return False
+        if not schedule.shared_audiences:
+            return self.room_count[audience_type][interval] < self.capacity[audience_type]
+        # Аудитории с несколькими типами: нужна расстановка всех уроков интервала
+        options = [schedule.lesson_audiences[name] for name in self.interval_lessons[interval] + [lesson]]
+        return None not in bipartite_matching(options)
+
+    def _place(self, group: int, interval: int, teacher: int) -> None:
+        """
+        Ставит очередной экземпляр урока в интервал и обновляет состояние и нижнюю оценку.
+        """
+        school_class, lesson, count, audience_type, teachers = self.groups[group]
+        bit = 1 << interval
+        first = self.group_teacher[group] is None
+        affected = teachers if first else (teacher,)
+        before = self._class_term(school_class) + sum(self._teacher_term(name) for name in affected)
+
+        # Учитель выбирается вместе с первым экземпляром урока
+        if first:
+            self.group_teacher[group] = teacher
+            for name in teachers:
+                self.teacher_possible[name] -= count
+            self.teacher_remaining[teacher] += count
+        self.group_intervals[group].append(interval)
+        self.class_remaining[school_class] -= 1
+        self.teacher_remaining[teacher] -= 1
+
+        segment, day = self.class_segment_of[interval], self.day_masks[interval // self.lessons_per_day]
+        self.class_windows[school_class] -= _windows(self.class_busy[school_class], segment)
+        self.class_busy[school_class] |= bit
+        self.class_windows[school_class] += _windows(self.class_busy[school_class], segment)
+        self.teacher_windows[teacher] -= _windows(self.teacher_busy[teacher], day)
+        self.teacher_busy[teacher] |= bit
+        self.teacher_windows[teacher] += _windows(self.teacher_busy[teacher], day)
+        wishes = self.wishes.get((teacher, interval), 0)
+        self.wishes_count += wishes
+
+        counts = self.room_count[audience_type]
+        counts[interval] += 1
+        if counts[interval] >= self.capacity[audience_type]:
+            self.room_full[audience_type] |= bit
+        self.interval_lessons[interval].append(lesson)
+
+        after = self._class_term(school_class) + sum(self._teacher_term(name) for name in affected)
+        self.lower_bound += after - before + self.fines[2] * wishes
+
+    def _unplace(self, group: int) -> None:
+        """
+        Снимает последний поставленный экземпляр урока - действие, обратное _place.
+        """
+        school_class, lesson, count, audience_type, teachers = self.groups[group]
+        interval = self.group_intervals[group][-1]
+        teacher = self.group_teacher[group]
+        bit = 1 << interval
+        last = len(self.group_intervals[group]) == 1
+        affected = teachers if last else (teacher,)
+        before = self._class_term(school_class) + sum(self._teacher_term(name) for name in affected)
+
+        self.group_intervals[group].pop()
+        self.class_remaining[school_class] += 1
+        self.teacher_remaining[teacher] += 1
+        if last:
+            self.group_teacher[group] = None
+            for name in teachers:
+                self.teacher_possible[name] += count
+            self.teacher_remaining[teacher] -= count
+
+        segment, day = self.class_segment_of[interval], self.day_masks[interval // self.lessons_per_day]
+        self.class_windows[school_class] -= _windows(self.class_busy[school_class], segment)
+        self.class_busy[school_class] &= ~bit
+        self.class_windows[school_class] += _windows(self.class_busy[school_class], segment)
+        self.teacher_windows[teacher] -= _windows(self.teacher_busy[teacher], day)
+        self.teacher_busy[teacher] &= ~bit
+        self.teacher_windows[teacher] += _windows(self.teacher_busy[teacher], day)
+        wishes = self.wishes.get((teacher, interval), 0)
+        self.wishes_count -= wishes
+
+        counts = self.room_count[audience_type]
+        counts[interval] -= 1
+        self.room_full[audience_type] &= ~bit
+        self.interval_lessons[interval].remove(lesson)
+
+        after = self._class_term(school_class) + sum(self._teacher_term(name) for name in affected)
+        self.lower_bound += after - before - self.fines[2] * wishes
+
+    def _domain(self, group: int) -> int:
+        """
+        Интервалы, в которые можно поставить следующий экземпляр урока без учета учителя.
+        """
+        school_class, _, _, audience_type, _ = self.groups[group]
+        mask = self.shift_masks[school_class] & ~self.class_busy[school_class]
+        if self.group_intervals[group]:
+            # Экземпляры урока ставятся по возрастанию интервалов
+            mask &= -(2 << self.group_intervals[group][-1])
+        if not self.schedule.shared_audiences:
+            mask &= ~self.room_full.get(audience_type, 0)
+        return mask
+
+    def _select(self):
+        """
+        Проверка запаса интервалов и выбор урока с наименьшим запасом.
+
+        Возвращаемое значение
+        ---------------------
+        int
+            Номер урока, -1, если все уроки поставлены, или None, если какому-то уроку,
+            классу или учителю не хватает интервалов.
+        """
+        all_intervals = (1 << len(self.schedule.intervals)) - 1
+        for school_class, remaining in enumerate(self.class_remaining):
+            free = self.shift_masks[school_class] & ~self.class_busy[school_class]
+            if free.bit_count() < remaining:
+                return None
+        for teacher, remaining in enumerate(self.teacher_remaining):
+            if remaining and (all_intervals & ~self.teacher_busy[teacher]).bit_count() < remaining:
+                return None
+
+        chosen, chosen_key = -1, None
+        class_busy, teacher_busy = self.class_busy, self.teacher_busy
+        room_full = None if self.schedule.shared_audiences else self.room_full
+        for group, (school_class, _, count, audience_type, teachers) in enumerate(self.groups):
+            placed = self.group_intervals[group]
+            remaining = count - len(placed)
+            if not remaining:
+                continue
+            # То же, что _domain, во внутреннем цикле без вызова
+            mask = self.shift_masks[school_class] & ~class_busy[school_class]
+            if placed:
+                mask &= -(2 << placed[-1])
+            if room_full is not None:
+                mask &= ~room_full.get(audience_type, 0)
+            teacher = self.group_teacher[group]
+            if teacher is not None:
+                available = size = (mask & ~teacher_busy[teacher]).bit_count()
+            else:
+                available = size = 0
+                for name in teachers:
+                    free = (mask & ~teacher_busy[name]).bit_count()
+                    size += free
+                    if free > available:
+                        available = free
+            if available < remaining:
+                return None
+            key = (available - remaining, size, -remaining)
+            if chosen_key is None or key < chosen_key:
+                chosen, chosen_key = group, key
+        return chosen
+
+    def _values(self, group: int) -> list:
+        """
+        Значения (интервал, учитель) для следующего экземпляра урока по возрастанию штрафа.
+        При равном штрафе первыми идут дни, в которые у класса меньше уроков, и более ранние уроки дня.
+        """
+        school_class, _, _, _, teachers = self.groups[group]
+        if self.group_teacher[group] is not None:
+            teachers = (self.group_teacher[group],)
+        class_busy = self.class_busy[school_class]
+        mask = self._domain(group)
+
+        values = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            interval = low.bit_length() - 1
+            segment, day = self.class_segment_of[interval], interval // self.lessons_per_day
+            class_cost = self.fines[0] * (_windows(class_busy | low, segment) - _windows(class_busy, segment))
+            # Вторник и четверг заполняются на урок раньше остальных дней
+            day_load = (class_busy & self.day_masks[day]).bit_count() - (day in (1, 3))
+            for teacher in teachers:
+                teacher_busy = self.teacher_busy[teacher]
+                if teacher_busy & low:
+                    continue
+                cost = class_cost + self.fines[2] * self.wishes.get((teacher, interval), 0) + \
+                    self.fines[1] * (_windows(teacher_busy | low, self.day_masks[day]) -
+                                     _windows(teacher_busy, self.day_masks[day]))
+                values.append((cost, day_load, interval % self.lessons_per_day, interval, teacher))
+        values.sort()
+        return [(interval, teacher) for _, _, _, interval, teacher in values]
+
+    def _cost(self) -> int:
+        """
+        Штраф полного расписания, как IncrementalEvaluator.score.
+        """
+        concentration = distribution = 0
+        for school_class, busy in enumerate(self.class_busy):
+            counts = [(busy & day_mask).bit_count() for day_mask in self.day_masks]
+            if counts.index(max(counts)) not in (1, 3):
+                distribution += 1
+            if self.concentration[school_class]:
+                for day in range(len(self.day_masks)):
+                    second = day * self.lessons_per_day + 1
+                    if (busy >> second) & 3 != 3:
+                        concentration += 1
+        return (self.fines[0] * sum(self.class_windows) + self.fines[1] * sum(self.teacher_windows) +
+                self.fines[2] * self.wishes_count + self.fines[3] * concentration + self.fines[4] * distribution)
+
+    def _solution(self) -> list:
+        """
+        Текущая расстановка в виде [(интервал, класс, урок, учитель), ...].
+        """
+        schedule = self.schedule
+        return [(schedule.intervals[interval], schedule.classes[school_class], lesson,
+                 schedule.teachers[self.group_teacher[group]])
+                for group, (school_class, lesson, _, _, _) in enumerate(self.groups)
+                for interval in self.group_intervals[group]]
+
+    def _limit_reached(self, start: float) -> bool:
+        """
+        Проверяет ограничения узлов, времени и отмену и сохраняет причину остановки.
+        """
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.stop_reason = NODE_LIMIT
+        elif self.nodes % 256 == 0:
+            if self.time_limit is not None and time.perf_counter() - start > self.time_limit:
+                self.stop_reason = TIME_BUDGET
+            elif self.schedule.is_cancelled():
+                self.stop_reason = CANCELLED
+        return self.stop_reason is not None
+
+    def _search(self, root: int, discrepancies: int, start: float) -> bool:
+        """
+        Один проход перебора с возвратом без рекурсии, в котором сумма отступлений от порядка значений
+        не больше discrepancies. Отступление - переход к следующему значению после того,
+        как поддерево предыдущего просмотрено. Значения, отсеянные проверками сразу, отступлениями не считаются.
+        Стек хранит урок, его значения, номер следующего значения, поставлен ли урок, остаток отступлений
+        и количество просмотренных поддеревьев.
+
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если какие-то ветви пропущены из-за ограничения отступлений.
+        """
+        cut = False
+        stack = [[root, self._values(root), 0, False, discrepancies, 0]]
+        while stack and not self._limit_reached(start):
+            frame = stack[-1]
+            group, values = frame[0], frame[1]
+            if frame[3]:
+                self._unplace(group)
+                frame[3] = False
+                frame[5] += 1
+
+            # Следующее значение, которое проходит проверку аудиторий и границу
+            while frame[2] < len(values):
+                if frame[5] > frame[4]:
+                    cut = True
+                    break
+                interval, teacher = values[frame[2]]
+                frame[2] += 1
+                if not self._room_available(group, interval):
+                    continue
+                self._place(group, interval, teacher)
+                if self.best_cost is not None and self.lower_bound >= self.best_cost:
+                    self._unplace(group)
+                    continue
+                frame[3] = True
+                break
+            if not frame[3]:
+                stack.pop()
+                continue
+            self.nodes += 1
+            # Каждый кадр стека ставит один экземпляр урока
+            if self.solution is None and len(stack) > len(self.partial):
+                self.partial = self._solution()
+
+            following = self._select()
+            if following is None:
+                # Кому-то не хватает интервалов: значение отсеяно сразу
+                self._unplace(group)
+                frame[3] = False
+                continue
+            if following == -1:
+                # Все уроки поставлены
+                cost = self._cost()
+                if self.best_cost is None or cost < self.best_cost:
+                    self.best_cost = cost
+                    self.solution = self._solution()
+                if cost == 0:
+                    break
+                continue
+            stack.append([following, self._values(following), 0, False, frame[4] - frame[5], 0])
+        return cut
+
+    def solve(self) -> str:
+        """
+        Перебор с ограниченными отступлениями: проходы _search с ограничением 0, 1, 2... отступлений.
+        Первый проход идет строго по порядку значений, следующие исправляют все больше ранних решений.
+        Проход, в котором ничего не пропущено, - полный перебор, поэтому его итог доказан.
+        Поиск заканчивается после полного прохода, найденного расписания с нулевым штрафом
+        или по ограничению.
+
+        Возвращаемое значение
+        ---------------------
+        str
+            Итог поиска: 'optimal' - найденное расписание лучшее из возможных, 'infeasible' - расписания
+            без накладок нет, 'feasible' - расписание найдено, но поиск остановлен по ограничению,
+            'unknown' - поиск остановлен по ограничению, расписание не найдено. Итоги 'optimal'
+            и 'infeasible' доказаны для модели, в которой все уроки класса по предмету ведет один учитель.
+        """
+        start = time.perf_counter()
+        self._reset()
+        self.nodes, self.stop_reason = 0, None
+        self.best_cost, self.solution, self.partial = None, None, []
+
+        root = self._select()
+        if root == -1:
+            # Пустой учебный план
+            self.best_cost, self.solution = self._cost(), []
+        elif root is not None:
+            discrepancies = 0
+            while self._search(root, discrepancies, start):
+                if self.stop_reason is not None or self.best_cost == 0:
+                    break
+                discrepancies += 1
+
+        if self.stop_reason is not None:
+            self.status = FEASIBLE if self.solution is not None else UNKNOWN
+        else:
+            self.status = OPTIMAL if self.solution is not None else INFEASIBLE
+        return self.status
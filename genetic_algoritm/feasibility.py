@@ -0,0 +1,142 @@
+class InfeasibleScheduleError(ValueError):
+    """
+    Исключение для входных данных, по которым расписание невозможно составить.
+
+    Атрибуты
+    --------
+    problems : list
+        Описания найденных проблем
+    """
+
+    def __init__(self, problems: list):
+        """
+        Устанавливает необходимые атрибуты для объекта InfeasibleScheduleError.
+
+        Параметры
+        ---------
+        problems : list
+            Описания найденных проблем.
+        """
+        self.problems = list(problems)
+        super().__init__('Расписание невозможно составить:\n' + '\n'.join('- ' + problem for problem in self.problems))
+
+
+def find_infeasibilities(schedule) -> list:
+    """
+    Быстрый анализ входных данных до запуска алгоритма. Проверяются необходимые условия существования расписания:
+        1. у каждого урока учебного плана есть учитель и тип аудитории, а аудитории этого типа есть в школе;
+        2. параллель каждого класса известна, а количество уроков в неделю положительно;
+        3. недельная нагрузка класса помещается в интервалы его смены;
+        4. уроки каждого типа аудитории помещаются в аудитории этого типа в каждой смене;
+        5. часы каждого урока помещаются в расписание учителей, которые могут его вести,
+           часы уроков, которые может вести только один учитель, - в расписание этого учителя,
+           а все часы учебного плана - в расписание всех учителей.
+    Проверки суммарные, поэтому пустой список не гарантирует, что расписание существует,
+    но каждая найденная проблема делает его невозможным.
+
+    Параметры
+    ---------
+    schedule : Schedule
+        Расписание с подготовленными входными данными: учебный план с заполненными классами,
+        распакованная таблица учителей и интервалы.
+
+    Возвращаемое значение
+    ---------------------
+    list
+        Описания найденных проблем.
+    """
+    problems = []
+    plan = schedule.df_academic_plan
+    slots = len(schedule.intervals)
+    if not slots:
+        return ['Нет ни одного интервала для уроков: проверьте звонки']
+
+    # 2. Количество уроков и параллели классов
+    bad_counts = plan[~(plan['count'] > 0)]
+    for sch_class, lesson, count in zip(bad_counts['class'], bad_counts['lesson'], bad_counts['count']):
+        problems.append(f'Класс {sch_class}, урок {lesson}: количество уроков в неделю должно быть положительным, '
+                        f'указано {count}')
+    plan = plan[plan['count'] > 0]
+
+    class_intervals = dict()
+    for sch_class in schedule.classes:
+        try:
+            class_intervals[sch_class] = schedule.class_shift_intervals(sch_class)
+        except (KeyError, ValueError):
+            problems.append(f'Класс {sch_class}: не удалось определить параллель по названию')
+
+    # 1. Учителя, типы аудиторий и аудитории для каждого урока
+    lesson_teachers = schedule.df_teachers.groupby('lesson')['teacher'].nunique()
+    lesson_audience_type = schedule.df_audiences_lessons.drop_duplicates('lesson').set_index('lesson')['type']
+    rooms_by_type = schedule.df_audiences.drop_duplicates(['audience', 'type'])['type'].value_counts()
+    lesson_hours = plan.groupby('lesson')['count'].sum()
+    for lesson, hours in lesson_hours.items():
+        if lesson not in lesson_teachers.index:
+            problems.append(f'Урок {lesson} ({hours} ч в неделю): нет учителя, который может его вести')
+        if lesson not in lesson_audience_type.index:
+            problems.append(f'Урок {lesson}: не указан тип аудитории')
+        elif lesson_audience_type[lesson] not in rooms_by_type.index:
+            problems.append(f'Урок {lesson}: нет аудиторий типа «{lesson_audience_type[lesson]}»')
+
+    # 3. Нагрузка классов
+    class_hours = plan.groupby('class')['count'].sum()
+    for sch_class, hours in class_hours.items():
+        available = len(class_intervals.get(sch_class, ()))
+        if sch_class in class_intervals and hours > available:
+            problems.append(f'Класс {sch_class}: {hours} уроков в неделю, а в его смене {available} интервалов')
+
+    # 4. Спрос на аудитории каждого типа по сменам
+    shift_demand = dict()
+    for sch_class, lesson, count in zip(plan['class'], plan['lesson'], plan['count']):
+        if sch_class not in class_intervals or lesson not in lesson_audience_type.index:
+            continue
+        key = (class_intervals[sch_class], lesson_audience_type[lesson])
+        shift_demand[key] = shift_demand.get(key, 0) + count
+    for (intervals, audience_type), demand in shift_demand.items():
+        rooms = int(rooms_by_type.get(audience_type, 0))
+        if rooms and demand > rooms * len(intervals):
+            problems.append(f'Аудитории типа «{audience_type}»: в смене из {len(intervals)} интервалов '
+                            f'{demand} уроков в неделю, а {rooms} аудиторий вмещают {rooms * len(intervals)}')
+
+    # 5. Нагрузка учителей
+    for lesson, hours in lesson_hours.items():
+        teachers = int(lesson_teachers.get(lesson, 0))
+        if teachers and hours > teachers * slots:
+            problems.append(f'Урок {lesson}: {hours} ч в неделю, а {teachers} учителей могут провести '
+                            f'не больше {teachers * slots}')
+    # Уроки, которые может вести только один учитель, целиком ложатся на него
+    sole_teacher_hours = dict()
+    lesson_teacher = schedule.df_teachers.drop_duplicates(['lesson', 'teacher'])
+    for lesson, teachers in lesson_teacher.groupby('lesson')['teacher']:
+        if len(teachers) == 1 and lesson in lesson_hours.index:
+            teacher = teachers.iloc[0]
+            sole_teacher_hours[teacher] = sole_teacher_hours.get(teacher, 0) + lesson_hours[lesson]
+    for teacher, hours in sole_teacher_hours.items():
+        if hours > slots:
+            problems.append(f'Учитель {teacher}: {hours} ч в неделю уроков, которые может вести только он, '
+                            f'а интервалов {slots}')
+    total_teachers = schedule.df_teachers['teacher'].nunique()
+    if total_teachers and plan['count'].sum() > total_teachers * slots:
+        problems.append(f'Учебный план: {plan["count"].sum()} уроков в неделю, а {total_teachers} учителей могут '
+                        f'провести не больше {total_teachers * slots}')
+
+    return problems
+
+
+def check_feasibility(schedule) -> None:
+    """
+    Проверяет входные данные функцией find_infeasibilities.
+
+    Параметры
+    ---------
+    schedule : Schedule
+        Расписание с подготовленными входными данными.
+
+    Возвращаемое значение
+    ---------------------
+    None
+        Если проблем нет. Иначе выбрасывается InfeasibleScheduleError со списком проблем.
+    """
+    problems = find_infeasibilities(schedule)
+    if problems:
+        raise InfeasibleScheduleError(problems)
@@ -1,5 +1,23 @@
+import multiprocessing
+import os
+import queue
 import random
-import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from .checkpoint import load_checkpoint, save_checkpoint
+from .encoding import ScheduleArrays, ScheduleEncoding
+from .evaluation import IncrementalEvaluator
+from .exact import INFEASIBLE, UNKNOWN, ExactSolver
+from .feasibility import InfeasibleScheduleError, check_feasibility
+from .inputs import normalize_inputs
+from .kernels import find_windows, load_penalties
+from .matching import bipartite_matching
+from .stopping import CANCELLED, StoppingPolicy
+from .telemetry import Telemetry
 
 
 class Schedule:
@@ -43,6 +61,46 @@ class Schedule:
     lessons: tuple
         упорядоченный кортеж с уроками
 
+    interval_index : dict
+        Позиции интервалов {интервал: индекс}
+    class_index : dict
+        Позиции классов {класс: индекс}
+    teacher_index : dict
+        Позиции учителей {учитель: индекс}
+
+    lesson_audience_type : dict
+        Индекс {урок: тип необходимой аудитории}
+    audience_types : dict
+        Индекс {аудитория: кортеж типов аудитории}
+    audiences_by_type : dict
+        Индекс {тип аудитории: кортеж аудиторий}
+    shared_audiences : bool
+        Есть ли аудитории с несколькими типами
+    lesson_audiences : dict
+        Индекс {урок: кортеж подходящих аудиторий}
+    lesson_teachers : dict
+        Индекс {урок: кортеж учителей, которые могут его вести}
+    teacher_lessons : dict
+        Индекс {учитель: кортеж уроков, которые он может вести}
+    encoding : ScheduleEncoding
+        Целочисленные идентификаторы интервалов, классов, учителей, уроков и аудиторий
+
+    class_occupancy : dict
+        Занятость классов {интервал: {класс: аудитория}}
+    teacher_occupancy : dict
+        Занятость учителей {интервал: {учитель: {аудитория: None}}}.
+        Несколько аудиторий у одного учителя означают накладку.
+    free_audiences : dict
+        Свободные аудитории {интервал: {тип аудитории: {аудитория: None}}}.
+        Аудитория с несколькими типами входит в каждый из них.
+    evaluator : IncrementalEvaluator
+        Инкрементальная оценка расписания по измененным дням классов и учителей
+
+    progress_callback : callable
+        Обработчик прогресса: progress_callback(поколение, оценки, прошедшее время)
+    cancel_event : threading.Event
+        Событие отмены составления расписания
+
     schedule_dict : dict
         Текущий вариант расписания по шаблону
         {'WD HH:MM:SS-HH:MM:SS':
@@ -65,14 +123,111 @@ class Schedule:
         --------
         ...
 
+    telemetry : Telemetry
+        Телеметрия последнего запуска алгоритма: время этапов, оценки и работа операторов по поколениям
+    hooks : GenerationHooks
+        Обработчики этапов и поколений генетического алгоритма или None
+    stopping_policy : StoppingPolicy
+        Условие останова генетического алгоритма
+    stop_reason : str
+        Причина остановки последнего запуска: 'target_reached', 'max_generations', 'time_budget',
+        'stagnation' или 'cancelled', для точного поиска - 'optimal' или 'node_limit'
+    exact_status : str
+        Итог точного поиска: 'optimal', 'feasible', 'infeasible', 'unknown' или None, если перебор не запускался
+    checkpoint_path : str
+        Файл контрольной точки или None
+    checkpoint_interval : int
+        Через сколько поколений сохраняется контрольная точка
+    resume : bool
+        Продолжать ли запуск с контрольной точки
+    best_score : tuple
+        Оценки возвращенного расписания - лучшего за последний запуск
+    affected_classes : tuple
+        Классы, расписание которых изменилось при пересоставлении
+    unplaced_lessons : list
+        Уроки [(класс, урок), ...], которые не удалось поставить при построении
+        или пересоставлении расписания
+
     Методы
     ------
+    build_problem_index():
+        Строит индексы соответствий уроков, аудиторий и учителей.
+    class_grade(school_class):
+        Возвращает номер параллели класса.
+    find_free_audience(current_interval, lesson):
+        Возвращает свободную в интервале аудиторию, подходящую для урока.
+    teacher_is_busy(interval, teacher, ignored_audience):
+        Проверяет, ведет ли учитель урок в интервале в другой аудитории.
+    match_audiences(interval, lesson):
+        Освобождает аудиторию для урока, перераспределяя аудитории интервала.
+    restore_cell(interval, audience, cell):
+        Возвращает снятую ячейку в интервал.
+    class_shift_intervals(school_class):
+        Возвращает интервалы смены класса.
+    set_schedule_dict(schedule_dict):
+        Заменяет расписание целиком и перестраивает индексы занятости.
+    copy_schedule_dict():
+        Возвращает независимую копию расписания.
+    report_progress(generation, score, elapsed):
+        Передает прогресс алгоритма обработчику progress_callback.
+    ga_stage(name, generation):
+        Контекстный менеджер этапа поколения для телеметрии и обработчиков.
+    finish_generation(generation, score):
+        Завершает поколение в телеметрии и вызывает обработчики.
+    check_stop(generation, score):
+        Проверяет условие останова и сохраняет причину остановки.
+    save_search_state(algorithm, generation, score, best_dict, best_score):
+        Сохраняет контрольную точку запуска.
+    load_search_state(algorithm):
+        Восстанавливает запуск из контрольной точки.
+    finish_search(score, best_dict, best_score):
+        Возвращает лучшее найденное расписание и завершает запуск.
+    is_cancelled():
+        Отменено ли составление расписания.
+    rebuild_occupancy():
+        Перестраивает индексы занятости по schedule_dict.
+    place_cell(interval, audience, cell):
+        Ставит ячейку расписания и обновляет индексы занятости.
+    remove_cell(interval, audience):
+        Удаляет ячейку расписания и обновляет индексы занятости.
     create_first_population(population):
         Создает черновой вариант расписания поверх пустого шаблона.
+    missing_lessons():
+        Возвращает уроки учебного плана, которых нет в расписании.
     classic_ga():
         Основная логика генетического алгоритма.
+    local_search(initial_temperature, cooling, tabu_tenure, moves_per_generation, candidates):
+        Локальный поиск с отжигом и списком запретов вместо цикла генетического алгоритма.
+    can_swap_class_cells(school_class, first_interval, second_interval):
+        Можно ли обменять ячейки класса без накладок учителей.
+    swap_class_cells(school_class, first_interval, second_interval):
+        Обменивает ячейки класса между двумя интервалами.
+    exact_search(max_classes, node_limit):
+        Точный поиск расписания для небольших школ с переходом к ГА для больших.
+    population_ga(population_size, workers):
+        Генетический алгоритм с популяцией особей, оцениваемых параллельно.
+    island_ga(islands, migration_interval):
+        Островная модель: модификации ГА в отдельных процессах с периодической миграцией.
+    reschedule(initial_schedule, repair_rounds):
+        Пересоставляет существующее расписание, исправляя только затронутые изменением ячейки.
+    teacher_load(teacher):
+        Возвращает количество уроков учителя в неделю.
+    class_lesson_teacher(school_class, lesson):
+        Выбирает учителя для урока класса.
+    place_near_class_lessons(cell):
+        Ставит урок в свободный интервал рядом с другими уроками класса.
+    fix_teacher_inconsistencies():
+        Устраняет накладки учителей паросочетанием уроков и интервалов по дням классов.
+    has_teacher_clash(school_class, day):
+        Есть ли у класса в этот день накладка учителя.
+    match_class_day(school_class, day):
+        Перераспределяет уроки дня класса по интервалам без накладок учителей.
     classic_ga_target_function():
         Целевая функция генетического алгоритма. Выявление недостатков расписания.
+    load_failures():
+        Возвращает нарушения пика концентрации и распределения нагрузки по неделе.
+    occupancy_matrix(by_teacher):
+        Возвращает булеву матрицу занятости классов или учителей.
     classic_ga_krossingover():
         Кроссинговер.
     classic_ga_inversion():
@@ -82,13 +237,24 @@ class Schedule:
 
     schedule_dict_to_table():
          Преобразует расписание в таблицу и заполняет атрибут schedule_list для вывода в приложение.
+    save_schedule(path_classes, path_teachers):
+         Сохраняет расписание для классов и учителей в файлы Excel.
+    load_schedule(path_classes):
+         Читает расписание классов из файла Excel.
+    schedule_dict_to_arrays():
+         Преобразует расписание в целочисленные массивы.
+    arrays_to_schedule_dict(arrays):
+         Восстанавливает schedule_dict из целочисленных массивов.
     """
     weekdays = ('ПН', 'ВТ', 'СР', 'ЧТ', 'ПТ', 'СБ', 'ВС')
     shift_standart = {1: False, 2: True, 3: True, 4: True, 5: False, 6: True, 7: True, 8: True, 9: False,
                       10: False, 11: False}
 
     def __init__(self, df_academic_plan, df_teachers, df_audiences_lessons, df_audiences, df_rings, df_teachers_wishes,
-                 number_of_days_in_week, second_shift):
+                 number_of_days_in_week, second_shift, algorithm='modification', population_size=8, workers=None,
+                 migration_interval=2, progress_callback=None, cancel_event=None, telemetry_path=None, hooks=None,
+                 stopping_policy=None, checkpoint_path=None, checkpoint_interval=1, resume=False,
+                 initial_schedule=None):
         """
         Устанавливает необходимые атрибуты для объекта Schedule.
 
@@ -118,6 +284,42 @@ class Schedule:
         df_teachers_wishes : pd.DataFrame
             Таблица о пожеланиях учителей.
 
+        algorithm : str
+            Алгоритм составления расписания: 'modification', 'classic', 'local_search' - локальный поиск
+            с отжигом и списком запретов, 'exact' - точный перебор для небольших школ, 'population', 'islands'
+            или 'reschedule' - пересоставление расписания initial_schedule после изменения входных данных.
+            None - только подготовить данные, не запуская алгоритм.
+            Перед запуском входные данные проверяются check_feasibility: если расписание заведомо невозможно,
+            выбрасывается InfeasibleScheduleError со списком проблем.
+        population_size : int
+            Количество особей в популяции для algorithm='population'.
+        workers : int
+            Количество процессов для оценки популяции или количество островов.
+            По умолчанию - количество ядер.
+        migration_interval : int
+            Через сколько поколений лучшие особи мигрируют между островами для algorithm='islands'.
+        progress_callback : callable
+            Вызывается после каждого поколения: progress_callback(поколение, оценки, прошедшее время в секундах).
+        cancel_event : threading.Event
+            Если событие установлено, алгоритм останавливается после текущего поколения
+            и возвращает лучшее найденное расписание.
+        telemetry_path : str
+            Путь к файлу, в который телеметрия поколений дописывается в формате JSON Lines.
+            Телеметрия доступна через атрибут telemetry и без файла.
+        hooks : GenerationHooks
+            Обработчики этапов и поколений генетического алгоритма.
+        stopping_policy : StoppingPolicy
+            Условие останова. По умолчанию - нулевая оценка, 10 поколений или 5 минут.
+        checkpoint_path : str
+            Файл контрольной точки для algorithm='modification', 'classic' и 'local_search'. Контрольная точка
+            сохраняется после каждого checkpoint_interval-го поколения и удаляется после завершения без отмены.
+        checkpoint_interval : int
+            Через сколько поколений сохраняется контрольная точка.
+        resume : bool
+            Продолжить запуск с контрольной точки checkpoint_path, если она есть.
+        initial_schedule : str or dict
+            Исходное расписание для algorithm='reschedule': путь к файлу расписания классов или schedule_dict.
+
         classes : tuple
             Упорядоченный кортеж с классами.
         teachers : tuple
@@ -152,32 +354,42 @@ class Schedule:
         self.number_of_days_in_week = number_of_days_in_week
         self.second_shift = second_shift
 
-        # Входные дата фреймы
-        self.df_teachers = df_teachers
+        # Наблюдение за ходом алгоритма
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.telemetry = Telemetry(telemetry_path)
+        # Без обработчиков циклы ГА не вызывают их вовсе
+        self.hooks = hooks if hooks else None
+        # Условие останова и причина остановки последнего запуска
+        self.stopping_policy = stopping_policy if stopping_policy is not None else StoppingPolicy()
+        self.stop_reason = None
+        # Контрольные точки длинных запусков
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.best_score = None
+        self.exact_status = None
+        # Итоги построения и пересоставления
+        self.affected_classes = tuple()
+        self.unplaced_lessons = []
+
+        # Входные дата фреймы: учителя по одному уроку в строке, классы и учителя пожеланий в каждой строке.
+        # Нормализация не меняет переданные таблицы и ничего не делает с уже нормализованными (из кэша load_input)
+        frames = normalize_inputs({'df_academic_plan': df_academic_plan, 'df_teachers': df_teachers,
+                                   'df_teachers_wishes': df_teachers_wishes})
+        self.df_teachers = frames['df_teachers']
         self.df_rings = df_rings
-        self.df_academic_plan = df_academic_plan
+        self.df_academic_plan = frames['df_academic_plan']
         self.df_audiences_lessons = df_audiences_lessons
         self.df_audiences = df_audiences
-        self.df_teachers_wishes = df_teachers_wishes
+        self.df_teachers_wishes = frames['df_teachers_wishes']
         # Вводные
         self.classes = sorted(tuple(cl for cl in df_academic_plan['class'].unique() if cl == cl),
-                              key=lambda x: int(x[:-1]))
+                              key=self.class_grade)
         self.teachers = sorted(tuple(cl for cl in df_teachers['teacher'].unique()))
         self.lessons = sorted(tuple(lesson for lesson in df_academic_plan['lesson'].unique()))
         self.audiences = sorted(tuple(str(audience) for audience in df_audiences['audience'].unique()))
 
-        # Распаковка дата фрейма для учителей
-        for i, row in self.df_teachers.iterrows():
-            self.df_teachers.iloc[i]['lesson'] = row['lesson'].split(', ')
-        self.df_teachers = self.df_teachers.explode('lesson')
-
-        # Замена NaN в 2, 3, 4... строках для каждого класса
-        self.df_academic_plan['class'] = self.df_academic_plan['class'].fillna(method='ffill')
-
-        # Замена NaN в 2, 3, 4... строках для каждого учителя, если введены пожелания
-        if not self.df_teachers_wishes.empty:
-            self.df_teachers_wishes['teacher'] = self.df_teachers_wishes['teacher'].fillna(method='ffill')
-
         # Инициализация интервалов
         # Преобразование начала и конца уроков в списки
         end_interval = self.df_rings['end'].tolist()
@@ -190,150 +402,648 @@ class Schedule:
                 intervals.append(str(Schedule.weekdays[i]) + ' ' + str(start_interval[j]) + ' ' + str(end_interval[j]))
         self.intervals = tuple(intervals)
 
+        # Позиции интервалов, классов и учителей в таблицах расписания
+        self.interval_index = {interval: i for i, interval in enumerate(self.intervals)}
+        self.class_index = {school_class: i for i, school_class in enumerate(self.classes)}
+        self.teacher_index = {teacher: i for i, teacher in enumerate(self.teachers)}
+
+        # Невыполнимые входные данные отсекаются до запуска алгоритма
+        if algorithm is not None:
+            check_feasibility(self)
+
+        # Индексы соответствий уроков, аудиторий и учителей
+        self.build_problem_index()
+
+        # Целочисленное кодирование расписания
+        self.encoding = ScheduleEncoding(self.intervals, self.classes, self.teachers, self.lessons, self.audiences)
+
+        # Инкрементальная оценка расписания
+        self.evaluator = IncrementalEvaluator(self)
+
         # Пустой шаблон расписания для заполнения
         self.schedule_dict = dict(zip(self.intervals, [{} for _ in range(len(self.intervals))]))
+        self.rebuild_occupancy()
 
         # Результат
-        # self.classic_ga()
-        self.modification_ga()
-
-    def create_first_population(self) -> None:
+        if algorithm == 'modification':
+            self.modification_ga()
+        elif algorithm == 'classic':
+            self.classic_ga()
+        elif algorithm == 'local_search':
+            self.local_search()
+        elif algorithm == 'exact':
+            self.exact_search()
+        elif algorithm == 'population':
+            self.population_ga(population_size, workers)
+        elif algorithm == 'islands':
+            self.island_ga(workers, migration_interval)
+        elif algorithm == 'reschedule':
+            if initial_schedule is None:
+                raise ValueError('Для пересоставления нужно исходное расписание initial_schedule')
+            self.reschedule(initial_schedule)
+        elif algorithm is not None:
+            raise ValueError(f'Неизвестный алгоритм: {algorithm}')
+
+    def build_problem_index(self) -> None:
         """
-        Создает расписание, в котором сохранена логика расписания между классами и кабинетами,
-        но не между учителями. Сохраняет расписание поверх шаблона в schedule_dict.
+        Строит индексы соответствий уроков, аудиторий и учителей один раз по входным дата фреймам,
+        чтобы генетические операторы не фильтровали pandas-таблицы во внутренних циклах.
 
         Возвращаемое значение
         ---------------------
         None
         """
+        # {урок: тип аудитории}. Берется первое упоминание урока, как и при выборке .iloc[0]
+        self.lesson_audience_type = dict()
+        for lesson, audience_type in zip(self.df_audiences_lessons['lesson'].tolist(),
+                                         self.df_audiences_lessons['type'].tolist()):
+            self.lesson_audience_type.setdefault(lesson, audience_type)
+
+        # {аудитория: типы} и {тип: аудитории}. Аудитория может быть указана с несколькими типами
+        audience_types = dict()
+        audiences_by_type = dict()
+        for audience, audience_type in zip(self.df_audiences['audience'].tolist(),
+                                           self.df_audiences['type'].tolist()):
+            audience = str(audience)
+            audience_types.setdefault(audience, dict())[audience_type] = None
+            audiences_by_type.setdefault(audience_type, dict())[audience] = None
+        self.audience_types = {audience: tuple(types) for audience, types in audience_types.items()}
+        self.audiences_by_type = {audience_type: tuple(audiences)
+                                  for audience_type, audiences in audiences_by_type.items()}
+        # Перестановка аудиторий внутри интервала имеет смысл, только если у аудиторий бывает несколько типов
+        self.shared_audiences = any(len(types) > 1 for types in self.audience_types.values())
+
+        # {урок: подходящие аудитории}
+        self.lesson_audiences = dict()
+        for lesson in self.lessons:
+            self.lesson_audiences[lesson] = self.audiences_by_type.get(self.lesson_audience_type.get(lesson), tuple())
+
+        # {урок: учителя} и {учитель: уроки}
+        lesson_teachers = dict()
+        teacher_lessons = dict()
+        for teacher, lesson in zip(self.df_teachers['teacher'].tolist(), self.df_teachers['lesson'].tolist()):
+            lesson_teachers.setdefault(lesson, []).append(teacher)
+            teacher_lessons.setdefault(teacher, []).append(lesson)
+        self.lesson_teachers = {lesson: tuple(teachers) for lesson, teachers in lesson_teachers.items()}
+        self.teacher_lessons = {teacher: tuple(lessons) for teacher, lessons in teacher_lessons.items()}
 
-        def get_interval() -> str:
-            """
-            Возвращает случайно выбранное время для урока в нужную смену.
+    @staticmethod
+    def class_grade(school_class: str) -> int:
+        """
+        Номер параллели класса - число в начале имени класса: '10б' - 10, '5а2' - 5.
 
-            Возвращаемое значение
-            ---------------------
-            str
-                строка вида 'WD HH:MM:SS-HH:MM:SS'
-            """
+        Параметры
+        ---------
+        school_class : str
+            Класс.
 
-            # Сохранили случайный интервал
-            interval_index = random.randrange(len(self.intervals))
+        Возвращаемое значение
+        ---------------------
+        int
+            Номер параллели.
+        """
+        digits = len(school_class) - len(school_class.lstrip('0123456789'))
+        return int(school_class[:digits])
 
-            # Пока не попали в смену
-            while ((interval_index % count_less_per_day) > end_of_the_shift) != (class_shift[row['class']] - 1):
-                interval_index = random.randrange(len(self.intervals))
-            return self.intervals[interval_index]
+    def find_free_audience(self, current_interval: str, lesson: str) -> str:
+        """
+        Функция возвращает аудиторию, которая свободная в interval и подходит для проведения урока lesson.
+        Аудитория берется из поддерживаемого набора свободных аудиторий нужного типа. Если он пуст,
+        аудитории интервала перераспределяются match_audiences. Аудитория другого типа не подставляется.
 
-        def is_lesson_at_this_interval(time_interval: str, sch_class: str) -> bool:
-            """
-            Функция возвращает True, если в interval у sch_class есть урок.
-            False  в ином случае.
+        Параметры
+        ---------
+        current_interval : str
+            Инвервал, в котором ищется аудитория.
+        lesson : str
+            Урок, для которого ищется аудитория.
 
-            Параметры
-            ---------
-            interval : str
-                Временной промежуток.
-            sch_class : str
-                Класс, урок которого ищется.
-            """
-            for dictionary in self.schedule_dict[time_interval].values():
-                if dictionary['class'] == sch_class:
-                    return True
+        Возвращаемое значение
+        ---------------------
+        str
+            Аудитория или None, если урок в этом интервале поставить некуда.
+        """
+        possible_audiences = self.free_audiences[current_interval].get(self.lesson_audience_type.get(lesson))
 
-            return False
+        # Случайный выбор, чтоб рассаживать в разные аудитории
+        if possible_audiences:
+            return random.choice(list(possible_audiences))
+        if self.shared_audiences:
+            return self.match_audiences(current_interval, lesson)
+        return None
 
-        # Пустой шаблон расписания для заполнения
-        self.schedule_dict = dict(zip(self.intervals, [{} for _ in range(len(self.intervals))]))
+    def teacher_is_busy(self, interval: str, teacher: str, ignored_audience: str = None) -> bool:
+        """
+        Ведет ли учитель урок в interval в какой-либо аудитории, кроме ignored_audience.
 
-        # Распределение классов и интервалов на смены
-        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
-        end_of_the_shift = count_less_per_day
+        Параметры
+        ---------
+        interval : str
+            Интервал.
+        teacher : str
+            Учитель.
+        ignored_audience : str
+            Аудитория, урок в которой не считается: например, ячейка, которая сейчас уйдет из интервала.
+
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если учитель занят в другой аудитории.
+        """
+        return any(audience != ignored_audience for audience in self.teacher_occupancy[interval].get(teacher, ()))
 
-        # Словарь {класс: смена}
-        class_shift = dict(zip(self.classes, [1 for _ in self.classes]))
+    def match_audiences(self, interval: str, lesson: str) -> str:
+        """
+        Освобождает аудиторию для урока lesson, перераспределяя аудитории уроков интервала.
+        Распределение - паросочетание уроков и аудиторий подходящих типов, в котором уроки по возможности
+        остаются в своих аудиториях. Уроки в аудиториях неподходящего типа не переставляются.
 
-        # Распределение классов по сменам в случае наличия второй смены
-        if self.second_shift:
+        Параметры
+        ---------
+        interval : str
+            Интервал.
+        lesson : str
+            Урок, для которого нужна аудитория.
+
+        Возвращаемое значение
+        ---------------------
+        str
+            Освобожденная аудитория или None, если распределения нет.
+        """
+        cells = [(audience, cell) for audience, cell in self.schedule_dict[interval].items()
+                 if audience in self.lesson_audiences.get(cell['lesson'], ())]
+        fixed = {audience for audience in self.schedule_dict[interval]} - {audience for audience, _ in cells}
+        options = [[audience for audience in self.lesson_audiences[cell['lesson']] if audience not in fixed]
+                   for _, cell in cells]
+        options.append([audience for audience in self.lesson_audiences.get(lesson, ()) if audience not in fixed])
+        assignment = bipartite_matching(options, [audience for audience, _ in cells] + [None])
+        if assignment[-1] is None:
+            return None
+
+        # Переносим уроки, аудитории которых поменялись
+        moved = [(audience, new_audience) for (audience, _), new_audience in zip(cells, assignment)
+                 if audience != new_audience]
+        lifted = [(new_audience, self.remove_cell(interval, audience)) for audience, new_audience in moved]
+        for new_audience, cell in lifted:
+            self.place_cell(interval, new_audience, cell)
+        return assignment[-1]
+
+    def restore_cell(self, interval: str, audience: str, cell: dict) -> None:
+        """
+        Возвращает снятую ячейку в интервал: в прежнюю аудиторию, если она свободна, иначе в другую подходящую.
+        """
+        if audience in self.schedule_dict[interval]:
+            audience = self.find_free_audience(interval, cell['lesson'])
+        self.place_cell(interval, audience, cell)
+
+    def class_shift_intervals(self, school_class: str) -> tuple:
+        """
+        Интервалы смены класса по тому же правилу, что и в create_first_population.
 
-            for clas in class_shift.keys():
-                class_shift[clas] = self.shift_standart[int(clas[:-1])] + 1
+        Параметры
+        ---------
+        school_class : str
+            Класс.
 
+        Возвращаемое значение
+        ---------------------
+        tuple
+            Интервалы, в которые можно ставить уроки класса.
+        """
+        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
+        end_of_the_shift = count_less_per_day
+        class_shift = 1
+        if self.second_shift:
+            class_shift = self.shift_standart[self.class_grade(school_class)] + 1
             # Конец первой смены
             end_of_the_shift = (end_of_the_shift - 1) // 2
+        return tuple(interval for i, interval in enumerate(self.intervals)
+                     if ((i % count_less_per_day) > end_of_the_shift) == (class_shift - 1))
 
-        for index, row in self.df_academic_plan.iterrows():
+    def set_schedule_dict(self, schedule_dict: dict) -> None:
+        """
+        Заменяет расписание целиком и перестраивает индексы занятости.
 
-            # Количество данных уроков на неделе
-            count = row['count']
+        Параметры
+        ---------
+        schedule_dict : dict
+            Расписание по шаблону {'интервал': {'аудитория': {'class', 'lesson', 'teacher'}}}.
 
-            # Формирование ячейки расписания
-            temp = {"class": row['class'], "lesson": row['lesson']}
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        self.schedule_dict = schedule_dict
+        self.rebuild_occupancy()
 
-            # Выбор типа аудитории
-            required_type_audience = self.df_audiences_lessons.loc[self.df_audiences_lessons['lesson']
-                                                                   == row['lesson']].iloc[0]['type']
-            possible_audiences = self.df_audiences.loc[self.df_audiences['type']
-                                                       == required_type_audience]['audience'].to_list()
-            # Перемешали, чтоб рассаживать в разные аудитории,
-            # но исключить повторный выбор аудиторий за счет итерирования
-            random.shuffle(possible_audiences)
+    def copy_schedule_dict(self) -> dict:
+        """
+        Возвращает копию schedule_dict, которая не меняется вместе с расписанием.
+        Ячейки не изменяются на месте, поэтому копируются только словари интервалов.
 
-            # Выбор учителя
-            possible_teachers = self.df_teachers.loc[self.df_teachers['lesson'] == row['lesson']]['teacher'].to_list()
-            temp["teacher"] = random.choice(possible_teachers)
+        Возвращаемое значение
+        ---------------------
+        dict
+            Копия расписания.
+        """
+        return {interval: dict(cells) for interval, cells in self.schedule_dict.items()}
 
-            # Для каждого из этого урока в данном классе
-            for _ in range(count):
+    def __getstate__(self) -> dict:
+        """
+        Состояние для передачи расписания в другой процесс.
+        Обработчик прогресса, событие отмены и обработчики поколений принадлежат вызывающему процессу
+        и не передаются.
+        """
+        state = self.__dict__.copy()
+        state['progress_callback'] = None
+        state['cancel_event'] = None
+        state['hooks'] = None
+        return state
 
-                # Флаг поиска аудитории и времени
-                look_for_item = 1
+    def report_progress(self, generation: int, score: tuple, elapsed: float) -> None:
+        """
+        Передает прогресс алгоритма обработчику progress_callback, если он задан.
+
+        Параметры
+        ---------
+        generation : int
+            Номер поколения.
+        score : tuple
+            Оценки приспособленности поколения.
+        elapsed : float
+            Время с начала работы алгоритма в секундах.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(generation, score, elapsed)
 
-                # Выбор случайного интервала
-                interval = get_interval()
-                # Занят ли этот интервал этим классом
-                while is_lesson_at_this_interval(interval, temp['class']):
-                    interval = get_interval()
+    @contextmanager
+    def ga_stage(self, name: str, generation: int):
+        """
+        Этап поколения: замер времени в телеметрии и вызов обработчиков before_stage и after_stage.
 
-                # Цикл поиска для текущего урока
-                while look_for_item and count:
+        Параметры
+        ---------
+        name : str
+            Название этапа.
+        generation : int
+            Номер поколения.
+        """
+        hooks = self.hooks
+        if hooks is not None:
+            hooks.before_stage(self, generation, name)
+        with self.telemetry.stage(name):
+            yield
+        if hooks is not None:
+            hooks.after_stage(self, generation, name)
+
+    def finish_generation(self, generation: int, score: tuple) -> None:
+        """
+        Завершает поколение: запись телеметрии и вызов обработчиков end_generation.
 
-                    # Проход по подходящим аудиториям
-                    for audience in possible_audiences:
+        Параметры
+        ---------
+        generation : int
+            Номер поколения.
+        score : tuple
+            Оценки приспособленности поколения.
+        """
+        self.telemetry.end_generation(score)
+        if self.hooks is not None:
+            self.hooks.end_generation(self, generation, score)
 
-                        # Если аудитория занята на это время
-                        if audience in self.schedule_dict[interval]:
+    def check_stop(self, generation: int, score: tuple) -> bool:
+        """
+        Проверка условия останова после поколения. Причина остановки сохраняется в stop_reason.
 
-                            # Этим же классом
-                            if self.schedule_dict[interval][audience]["class"] == temp["class"]:
+        Параметры
+        ---------
+        generation : int
+            Номер завершенного поколения.
+        score : tuple
+            Оценки приспособленности поколения.
 
-                                # Тогда меняем время занятия
-                                interval = get_interval()
-                                # Занят ли этот интервал этим классом
-                                while not is_lesson_at_this_interval(interval, temp['class']):
-                                    interval = get_interval()
-                                break
-                            else:
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если алгоритм нужно остановить.
+        """
+        if self.is_cancelled():
+            self.stop_reason = CANCELLED
+        else:
+            self.stop_reason = self.stopping_policy.should_stop(generation, score, self.telemetry.elapsed())
+        return self.stop_reason is not None
 
-                                # След. итерация, т.е. меняем аудиторию
-                                continue
+    def checkpoint_fingerprint(self) -> tuple:
+        """
+        Признак входных данных, по которому контрольная точка проверяется перед продолжением запуска.
+        """
+        return (self.number_of_days_in_week, self.second_shift, tuple(self.intervals), tuple(self.classes),
+                tuple(self.teachers), tuple(self.lessons), tuple(self.audiences))
 
-                        # Аудитория свободна
-                        else:
+    def save_search_state(self, algorithm: str, generation: int, score: tuple, best_dict: dict,
+                          best_score: tuple) -> None:
+        """
+        Сохраняет контрольную точку после каждого checkpoint_interval-го поколения, если задан checkpoint_path.
+        В контрольную точку входят текущее и лучшее расписания, порядок свободных аудиторий,
+        состояние генератора случайных чисел, номер поколения и телеметрия.
 
-                            # Занимаем ее
-                            self.schedule_dict[interval][audience] = temp
-                            look_for_item = 0
-                            break
+        Параметры
+        ---------
+        algorithm : str
+            Вариант генетического алгоритма.
+        generation : int
+            Номер завершенного поколения.
+        score : tuple
+            Оценки приспособленности поколения.
+        best_dict : dict
+            Лучшее найденное расписание.
+        best_score : tuple
+            Оценки лучшего расписания.
+        """
+        if self.checkpoint_path is None or generation % self.checkpoint_interval != 0:
+            return
+        save_checkpoint(self.checkpoint_path, {'algorithm': algorithm,
+                                               'fingerprint': self.checkpoint_fingerprint(),
+                                               'generation': generation,
+                                               'score': score,
+                                               'schedule_dict': self.copy_schedule_dict(),
+                                               'free_audiences': {interval: {audience_type: list(audiences)
+                                                                             for audience_type, audiences
+                                                                             in free_audiences.items()}
+                                                                  for interval, free_audiences
+                                                                  in self.free_audiences.items()},
+                                               'best_dict': best_dict,
+                                               'best_score': best_score,
+                                               'random_state': random.getstate(),
+                                               'telemetry': self.telemetry.generations,
+                                               'elapsed': self.telemetry.elapsed()})
+
+    def load_search_state(self, algorithm: str):
+        """
+        Восстанавливает запуск из контрольной точки, если задан resume и файл checkpoint_path существует.
+        Расписание, порядок свободных аудиторий, генератор случайных чисел, телеметрия и состояние
+        условия останова становятся такими же, как после сохраненного поколения.
 
-                    # Ни одна аудитория не оказалась свободной в это время
-                    else:
+        Параметры
+        ---------
+        algorithm : str
+            Вариант генетического алгоритма.
+
+        Возвращаемое значение
+        ---------------------
+        tuple
+            (номер поколения, оценки поколения, лучшее расписание, оценки лучшего расписания)
+            или None, если продолжать нечего.
+        """
+        if not self.resume or self.checkpoint_path is None:
+            return None
+        state = load_checkpoint(self.checkpoint_path)
+        if state is None:
+            return None
+        if state['algorithm'] != algorithm:
+            raise ValueError('Контрольная точка сохранена для алгоритма ' + state['algorithm'] +
+                             ', а не ' + algorithm)
+        if state['fingerprint'] != self.checkpoint_fingerprint():
+            raise ValueError('Контрольная точка сохранена для других входных данных: ' + self.checkpoint_path)
+
+        self.set_schedule_dict(state['schedule_dict'])
+        # Аудитория выбирается случайно из списка свободных, поэтому порядок списка должен совпадать
+        # с прерванным запуском, а не с rebuild_occupancy
+        self.free_audiences = {interval: {audience_type: dict.fromkeys(audiences)
+                                          for audience_type, audiences in free_audiences.items()}
+                               for interval, free_audiences in state['free_audiences'].items()}
+        random.setstate(state['random_state'])
+        self.telemetry.resume(state['telemetry'], state['elapsed'])
+
+        # Условие останова заново просматривает оценки пройденных поколений, чтобы учитывать стагнацию
+        self.stopping_policy.reset()
+        for generation, score in enumerate(self.telemetry.scores(), start=1):
+            self.stopping_policy.should_stop(generation, score, state['elapsed'])
+
+        self.report_progress(state['generation'], state['score'], state['elapsed'])
+        return state['generation'], state['score'], state['best_dict'], state['best_score']
+
+    def finish_search(self, score: tuple, best_dict: dict, best_score: tuple) -> None:
+        """
+        Завершает запуск: возвращает лучшее найденное расписание, если последнее поколение хуже,
+        закрывает телеметрию, заполняет schedule_list. Контрольная точка удаляется,
+        если запуск не отменен, - при отмене по ней можно продолжить.
+
+        Параметры
+        ---------
+        score : tuple
+            Оценки текущего расписания.
+        best_dict : dict
+            Лучшее найденное расписание.
+        best_score : tuple
+            Оценки лучшего расписания.
+        """
+        if sum(best_score) < sum(score):
+            self.set_schedule_dict(best_dict)
+            score = best_score
+        self.best_score = score
+
+        if self.checkpoint_path is not None and self.stop_reason != CANCELLED:
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+
+        self.telemetry.close()
+        self.schedule_dict_to_table(self)
+
+    def is_cancelled(self) -> bool:
+        """
+        Возвращает True, если составление расписания отменено через cancel_event.
+        """
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def rebuild_occupancy(self) -> None:
+        """
+        Перестраивает индексы занятости классов, учителей и аудиторий по текущему schedule_dict.
+        Вызывается после замены schedule_dict целиком.
 
-                        # Меняем время занятия
-                        interval = get_interval()
-                        # Занят ли этот интервал этим классом
-                        while is_lesson_at_this_interval(interval, temp['class']):
-                            interval = get_interval()
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        self.class_occupancy = {interval: {} for interval in self.intervals}
+        self.teacher_occupancy = {interval: {} for interval in self.intervals}
+        self.free_audiences = {interval: {audience_type: dict.fromkeys(audiences)
+                                          for audience_type, audiences in self.audiences_by_type.items()}
+                               for interval in self.intervals}
+
+        for interval in self.intervals:
+            for audience, cell in self.schedule_dict[interval].items():
+                self._occupy(interval, audience, cell)
+
+        # Оценку нужно пересчитать полностью
+        self.evaluator.invalidate()
+
+    def _occupy(self, interval: str, audience: str, cell: dict) -> None:
+        """
+        Отмечает в индексах занятости, что ячейка cell стоит в аудитории audience.
+        """
+        self.class_occupancy[interval][cell['class']] = audience
+        self.teacher_occupancy[interval].setdefault(cell['teacher'], {})[audience] = None
+        free_audiences = self.free_audiences[interval]
+        for audience_type in self.audience_types.get(audience, ()):
+            free_audiences[audience_type].pop(audience, None)
+
+    def place_cell(self, interval: str, audience: str, cell: dict) -> None:
+        """
+        Ставит ячейку расписания в аудиторию и обновляет индексы занятости.
+        Накладка - занятая аудитория, отсутствие аудитории или второй урок класса в интервале -
+        обнаруживается сразу и вызывает ValueError, а не затирает другой урок.
+
+        Параметры
+        ---------
+        interval : str
+            Интервал, в который ставится урок.
+        audience : str
+            Аудитория.
+        cell : dict
+            Ячейка расписания {'class', 'lesson', 'teacher'}.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        if not audience:
+            raise ValueError(f'Нет аудитории для урока {cell["lesson"]} класса {cell["class"]} в {interval}')
+        if audience in self.schedule_dict[interval]:
+            raise ValueError(f'Аудитория {audience} в {interval} уже занята классом '
+                             f'{self.schedule_dict[interval][audience]["class"]}')
+        if cell['class'] in self.class_occupancy[interval]:
+            raise ValueError(f'У класса {cell["class"]} уже есть урок в {interval}')
+        self.schedule_dict[interval][audience] = cell
+        self._occupy(interval, audience, cell)
+        self.evaluator.touch(interval, cell)
+
+    def remove_cell(self, interval: str, audience: str) -> dict:
+        """
+        Удаляет ячейку расписания из аудитории и обновляет индексы занятости.
+
+        Параметры
+        ---------
+        interval : str
+            Интервал, из которого удаляется урок.
+        audience : str
+            Аудитория.
+
+        Возвращаемое значение
+        ---------------------
+        dict
+            Удаленная ячейка или пустой словарь, если аудитория была свободна.
+        """
+        cell = self.schedule_dict[interval].pop(audience, None)
+        if cell is None:
+            return {}
+
+        classes = self.class_occupancy[interval]
+        if classes.get(cell['class']) == audience:
+            del classes[cell['class']]
+
+        teachers = self.teacher_occupancy[interval]
+        teacher_audiences = teachers.get(cell['teacher'])
+        if teacher_audiences is not None:
+            teacher_audiences.pop(audience, None)
+            if not teacher_audiences:
+                del teachers[cell['teacher']]
+
+        free_audiences = self.free_audiences[interval]
+        for audience_type in self.audience_types.get(audience, ()):
+            free_audiences[audience_type][audience] = None
+
+        self.evaluator.touch(interval, cell)
+        return cell
+
+    def create_first_population(self) -> None:
+        """
+        Создает расписание, в котором сохранена логика расписания между классами и кабинетами,
+        но не между учителями. Сохраняет расписание поверх шаблона в schedule_dict.
+
+        Построение конструктивное: каждый урок ставится в случайный интервал из еще свободных интервалов смены
+        класса, в котором есть свободная аудитория нужного типа, а аудитория выбирается из свободных в этом
+        интервале. Первыми ставятся уроки с самым дефицитным типом аудитории. Объем работы ограничен
+        одним просмотром свободных интервалов класса на урок, поэтому для невыполнимых входных данных
+        построение завершается, а не зацикливается. Уроки, которым не нашлось места, сохраняются в unplaced_lessons.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        # Пустой шаблон расписания для заполнения
+        self.schedule_dict = dict(zip(self.intervals, [{} for _ in range(len(self.intervals))]))
+        self.rebuild_occupancy()
+        self.unplaced_lessons = []
+
+        rows = list(zip(self.df_academic_plan['class'].tolist(),
+                        self.df_academic_plan['lesson'].tolist(),
+                        self.df_academic_plan['count'].tolist()))
+
+        # Свободные интервалы смены каждого класса
+        free_intervals = {sch_class: list(self.class_shift_intervals(sch_class)) for sch_class in self.classes}
+
+        # Дефицит типа аудитории: спрос уроков на число аудиторий этого типа
+        demand = dict()
+        for sch_class, lesson, count in rows:
+            audience_type = self.lesson_audience_type.get(lesson)
+            demand[audience_type] = demand.get(audience_type, 0) + count
+
+        def scarcity(row: tuple) -> float:
+            audience_type = self.lesson_audience_type.get(row[1])
+            return demand[audience_type] / max(len(self.audiences_by_type.get(audience_type, ())), 1)
+
+        # Самые ограниченные уроки первыми, порядок учебного плана сохраняется внутри одного типа аудитории
+        for sch_class, lesson, count in sorted(rows, key=scarcity, reverse=True):
+            audience_type = self.lesson_audience_type.get(lesson)
+
+            # Формирование ячейки расписания
+            temp = {"class": sch_class, "lesson": lesson, "teacher": random.choice(self.lesson_teachers[lesson])}
+
+            # Для каждого из этого урока в данном классе
+            for _ in range(count):
+                class_intervals = free_intervals[sch_class]
+                candidates = [i for i, interval in enumerate(class_intervals)
+                              if self.free_audiences[interval].get(audience_type)]
+                if not candidates:
+                    self.unplaced_lessons.append((sch_class, lesson))
+                    self.telemetry.count('initial_placement', False)
+                    continue
+
+                # Случайный свободный интервал и случайная свободная аудитория в нем
+                position = random.choice(candidates)
+                interval = class_intervals[position]
+                audience = random.choice(list(self.free_audiences[interval][audience_type]))
+                self.place_cell(interval, audience, dict(temp))
+                self.telemetry.count('initial_placement', True)
+
+                # Интервал больше не свободен для класса
+                class_intervals[position] = class_intervals[-1]
+                class_intervals.pop()
+
+    def missing_lessons(self) -> list:
+        """
+        Уроки учебного плана, которых нет в текущем расписании. В отличие от unplaced_lessons
+        проверяется итоговое расписание любого алгоритма.
+
+        Возвращаемое значение
+        ---------------------
+        list
+            [(класс, урок, сколько уроков не хватает), ...]
+        """
+        placed = dict()
+        for cells in self.schedule_dict.values():
+            for cell in cells.values():
+                key = (cell['class'], cell['lesson'])
+                placed[key] = placed.get(key, 0) + 1
+
+        missing = dict()
+        for sch_class, lesson, count in zip(self.df_academic_plan['class'].tolist(),
+                                            self.df_academic_plan['lesson'].tolist(),
+                                            self.df_academic_plan['count'].tolist()):
+            missing[(sch_class, lesson)] = missing.get((sch_class, lesson), 0) + int(count)
+        return [(sch_class, lesson, count - placed.get((sch_class, lesson), 0))
+                for (sch_class, lesson), count in missing.items() if count > placed.get((sch_class, lesson), 0)]
 
     def create_first_population_randomly(self) -> None:
         """
@@ -345,8 +1055,11 @@ class Schedule:
         """
         for interval in self.intervals:
             for sch_class in self.classes:
-                # Случайный выбор аудитории
-                audience = random.choice(self.audiences)
+                # Случайный выбор аудитории из свободных
+                free = [audience for audience in self.audiences if audience not in self.schedule_dict[interval]]
+                if not free:
+                    break
+                audience = random.choice(free)
 
                 # Случайный выбор урока
                 lesson = random.choice(self.lessons)
@@ -356,7 +1069,7 @@ class Schedule:
 
                 # Формирование ячейки расписания
                 temp = {"class": sch_class, "lesson": lesson, "teacher": teacher}
-                self.schedule_dict[interval][audience] = temp
+                self.place_cell(interval, audience, temp)
 
     def fix_schedule(self) -> None:
         """
@@ -379,323 +1092,903 @@ class Schedule:
 
     def fix_teacher_inconsistencies(self) -> None:
         """
-        Функция меняет местами ячейки расписания, которые нарушают логику учительского расписания.
-        Если учитель ведет урок в двух классах одновременно, ячейка расписания меняется местами со следующей ячейкой
-        текущего класса, чтобы накладки по учителям не было.
+        Устраняет накладки учителей за один проход. Для каждого дня класса, в котором учитель ведет урок
+        в двух классах одновременно, уроки этого дня заново распределяются по интервалам как паросочетание
+        в двудольном графе: урок можно поставить в интервал, если его учитель там свободен
+        и есть свободная аудитория нужного типа (match_class_day).
 
         Возвращаемое значение
         ---------------------
         None
         """
+        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
 
-        def get_next_interval(current_interval, sch_class) -> str:
-            """
-            Возвращает время для следующего урока в нужную смену.
-
-            Возвращаемое значение
-            ---------------------
-            str
-                строка вида 'WD HH:MM:SS-HH:MM:SS'
-            """
-            # Распределение классов и интервалов на смены
-            count_less_per_day = len(self.intervals) // self.number_of_days_in_week
-            end_of_the_shift = count_less_per_day
+        # Дни классов с накладками в порядке интервалов
+        class_days = dict()
+        for interval in self.intervals:
+            for audiences in self.teacher_occupancy[interval].values():
+                if len(audiences) < 2:
+                    continue
+                for audience in audiences:
+                    day = self.interval_index[interval] // count_less_per_day
+                    class_days.setdefault((self.schedule_dict[interval][audience]['class'], day), None)
+
+        unresolved = []
+        for school_class, day in class_days:
+            # Накладка могла исчезнуть при исправлении дня другого класса
+            if not self.has_teacher_clash(school_class, day):
+                continue
+            fixed = self.match_class_day(school_class, day)
+            self.telemetry.count('teacher_repair', fixed)
+            if not fixed:
+                unresolved.append((school_class, day))
+
+        # Если в пределах дня не получилось, уроки класса переставляются по всей неделе
+        for school_class, day in unresolved:
+            if self.has_teacher_clash(school_class, day):
+                self.telemetry.count('teacher_repair_week', self.match_class_day(school_class, None))
+
+    def has_teacher_clash(self, school_class: str, day: int) -> bool:
+        """
+        Есть ли в день day у класса урок учителя, который одновременно ведет урок в другом классе.
+        """
+        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
+        for interval in self.intervals[day * count_less_per_day:(day + 1) * count_less_per_day]:
+            audience = self.class_occupancy[interval].get(school_class)
+            if audience is not None and \
+                    len(self.teacher_occupancy[interval][self.schedule_dict[interval][audience]['teacher']]) > 1:
+                return True
+        return False
+
+    def match_class_day(self, school_class: str, day) -> bool:
+        """
+        Перераспределяет уроки класса в день day (None - за всю неделю) по интервалам без накладок учителей.
+        Уроки снимаются с расписания, после чего ищется паросочетание уроков и интервалов алгоритмом Куна.
+        Начальное паросочетание - текущие интервалы уроков, которые остаются допустимыми.
+        Сначала уроки переставляются только внутри занятых ими интервалов, чтобы не образовывать окна,
+        затем - по всем интервалам смены в этот день, начиная с ближайших к занятым.
+        Если все уроки не удается поставить, день остается без изменений.
 
-            if self.second_shift:
-                # Конец первой смены
-                end_of_the_shift = (end_of_the_shift - 1) // 2
+        Параметры
+        ---------
+        school_class : str
+            Класс.
+        day : int
+            Номер дня недели или None для всей недели.
 
-            # Сохранили случайный интервал
-            interval_index = self.intervals.index(current_interval) + 1
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если уроки дня поставлены без накладок учителей.
+        """
+        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
+        if day is None:
+            day_intervals = self.intervals
+        else:
+            day_intervals = self.intervals[day * count_less_per_day:(day + 1) * count_less_per_day]
 
-            # Пока не попали в смену
-            while ((interval_index % count_less_per_day) > end_of_the_shift) != (class_shift[sch_class] - 1):
-                interval_index = (interval_index + 1) % len(self.intervals)
-            return self.intervals[interval_index]
+        # Снимаем уроки дня с расписания
+        cells = []
+        for interval in day_intervals:
+            audience = self.class_occupancy[interval].get(school_class)
+            if audience is not None:
+                cells.append((interval, audience, self.remove_cell(interval, audience)))
 
-        def find_free_audience(current_interval: str, lesson: str) -> str:
+        def available(k: int, interval: str) -> bool:
             """
-            Функция возвращает аудиторию, которая свободная в interval и подходит для проведения урока lesson.
+            Можно ли поставить урок k в интервал: учитель свободен и есть аудитория.
             """
-            # Выбор типа аудитории
-            required_type_audience = self.df_audiences_lessons.loc[self.df_audiences_lessons['lesson']
-                                                                   == lesson].iloc[0]['type']
-            possible_audiences = self.df_audiences.loc[self.df_audiences['type']
-                                                       == required_type_audience]['audience'].to_list()
-            # Запасная аудитория
-            spare_aud = ''
-            for current_audience in self.audiences:
-                if current_audience not in possible_audiences:
-                    spare_aud = current_audience
-                    break
+            original_interval, original_audience, cell = cells[k]
+            if cell['teacher'] in self.teacher_occupancy[interval]:
+                return False
+            if self.free_audiences[interval].get(self.lesson_audience_type.get(cell['lesson'])):
+                return True
+            return interval == original_interval and original_audience not in self.schedule_dict[interval]
+
+        # Свободные интервалы упорядочены по удаленности от занятых в тот же день
+        occupied = [interval for interval, _, _ in cells]
+        shift_intervals = set(self.class_shift_intervals(school_class)) | set(occupied)
+        bounds = dict()
+        for interval in occupied:
+            i = self.interval_index[interval]
+            first, last = bounds.get(i // count_less_per_day, (i, i))
+            bounds[i // count_less_per_day] = (min(first, i), max(last, i))
+
+        def distance(interval: str) -> int:
+            i = self.interval_index[interval]
+            first, last = bounds.get(i // count_less_per_day, (i, i))
+            return max(first - i, i - last, 0)
+
+        extended = sorted((interval for interval in day_intervals if interval in shift_intervals), key=distance)
+
+        assignment = [interval if available(k, interval) else None for k, interval in enumerate(occupied)]
+        for slots in (occupied, extended):
+            assignment = bipartite_matching([[interval for interval in slots if available(k, interval)]
+                                             for k in range(len(cells))], assignment)
+            if None not in assignment:
+                break
+
+        matched = None not in assignment
+        for k, (original_interval, original_audience, cell) in enumerate(cells):
+            interval = assignment[k] if matched else original_interval
+            if interval == original_interval and original_audience not in self.schedule_dict[interval]:
+                audience = original_audience
+            else:
+                audience = self.find_free_audience(interval, cell['lesson'])
+            self.place_cell(interval, audience, cell)
+        return matched
 
-            # Перемешали, чтоб рассаживать в разные аудитории,
-            # но исключить повторный выбор аудиторий за счет итерирования
-            random.shuffle(possible_audiences)
+    def classic_ga(self) -> None:
+        """
+        Основная логика классического генетического алгоритма:
 
-            # Удаляем занятые аудитории
-            for current_audience in self.schedule_dict[current_interval].keys():
-                if current_audience in possible_audiences:
-                    possible_audiences.remove(current_audience)
+        ПЕРВОЕ ПОКОЛЕНИЕ
+        1. Первая популяция составляется случайным образом.
+        2. Проверка расписания на консистентность и корректировка.
+           Оценка приспособленности и запись значений функции для каждой особи.
 
-            if possible_audiences:
-                return possible_audiences[0]
-            else:
-                return spare_aud
+        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
+        3. Генетические операторы
+        2. Проверка расписания на консистентность и корректировка.
+           Оценка приспособленности и запись значений функции для каждой особи.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        # Продолжение прерванного запуска с контрольной точки
+        resumed = self.load_search_state('classic')
+        if resumed is not None:
+            generation, cur_score, best_dict, best_score = resumed
+        else:
+            self.telemetry.start()
+            self.stopping_policy.reset()
+            generation = 1
+            self.telemetry.start_generation(generation)
 
-        # Словарь {класс: смена}
-        class_shift = dict(zip(self.classes, [1 for _ in self.classes]))
+            # 1. Первая популяция составляется случайным образом.
+            with self.ga_stage('initial_population', generation):
+                self.create_first_population_randomly()
 
-        # Распределение классов по сменам в случае наличия второй смены
-        if self.second_shift:
+            # 2. Проверка расписания на консистентность и корректировка.
+            with self.ga_stage('repair', generation):
+                self.fix_schedule()
+
+            # Оценка приспособленности и запись значений функции для каждой особи.
+            with self.ga_stage('scoring', generation):
+                cur_score = self.classic_ga_target_function(50, 30, 50, 10, 10)
+            self.finish_generation(generation, cur_score)
+
+            # Лучшее найденное расписание
+            best_dict, best_score = self.copy_schedule_dict(), cur_score
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('classic', generation, cur_score, best_dict, best_score)
+
+        #  Условие останова
+        while not self.check_stop(generation, cur_score):
+            generation += 1
+            self.telemetry.start_generation(generation)
+
+            # Репродукция
+            with self.ga_stage('reproduction', generation):
+                self.classic_ga_krossingover(random.choice(self.classes), random.choice(self.classes))
+                self.classic_ga_inversion(random.choice(self.classes))
+
+            # Мутация
+            with self.ga_stage('mutation', generation):
+                self.classic_ga_mutation(random.choice(self.classes))
+
+            # Исправить появившиеся накладки
+            with self.ga_stage('repair', generation):
+                self.fix_schedule()
+
+            # Пересчет целевой функции
+            with self.ga_stage('scoring', generation):
+                cur_score = self.classic_ga_target_function(50, 30, 50, 10, 10)
+            self.finish_generation(generation, cur_score)
+
+            if sum(cur_score) < sum(best_score):
+                best_dict, best_score = self.copy_schedule_dict(), cur_score
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('classic', generation, cur_score, best_dict, best_score)
+
+        # Возвращается лучшее найденное расписание, а не последнее поколение
+        self.finish_search(cur_score, best_dict, best_score)
+
+    def modification_ga(self, elapsed: float = 0.0) -> None:
+        """
+        Основная логика разработанной модификации генетического алгоритма:
+
+        ПЕРВОЕ ПОКОЛЕНИЕ
+        1. Первая популяция создается с консистентностью по аудиториям и классам.
+        2. Проверка расписания на консистентность по учителям
+           Оценка приспособленности и параллельная репродукция и мутация.
+
+        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
+        3. Условие останова.
+        2. Проверка расписания на консистентность по учителям
+           Оценка приспособленности и параллельная репродукция и мутация.
+
+        Параметры
+        ---------
+        elapsed : float
+            Время в секундах, уже потраченное на этот запуск до модификации (например, точным перебором).
+            Оно входит в time_budget условия останова.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        # Продолжение прерванного запуска с контрольной точки
+        resumed = self.load_search_state('modification')
+        if resumed is not None:
+            generation, cur_score, best_dict, best_score = resumed
+        else:
+            self.telemetry.resume([], elapsed)
+            self.stopping_policy.reset()
+            generation = 1
+            self.telemetry.start_generation(generation)
+
+            # 1. Первая популяция.
+            with self.ga_stage('initial_population', generation):
+                self.create_first_population()
+
+            # 2. Проверка расписания на консистентность и корректировка.
+            with self.ga_stage('teacher_repair', generation):
+                self.fix_teacher_inconsistencies()
+
+            # Оценка приспособленности и запись значений функции для каждой особи.
+            # Этот же этап репродукции.
+            with self.ga_stage('scoring', generation):
+                cur_score = self.modification_ga_target_function(50, 30, 50, 10, 10)
+            self.finish_generation(generation, cur_score)
+
+            # Лучшее найденное расписание. Целевая функция модификации сразу мутирует расписание,
+            # поэтому сохраненная копия оценивается заново
+            best_dict, best_score = self.copy_schedule_dict(), self.evaluator.score(50, 30, 50, 10, 10)
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('modification', generation, cur_score, best_dict, best_score)
+
+        #  Условие останова
+        while not self.check_stop(generation, cur_score):
+            generation += 1
+            self.telemetry.start_generation(generation)
+
+            # Исправить появившиеся накладки
+            with self.ga_stage('teacher_repair', generation):
+                self.fix_teacher_inconsistencies()
+
+            # Пересчет целевой функции
+            with self.ga_stage('scoring', generation):
+                cur_score = self.modification_ga_target_function(50, 30, 50, 10, 10)
+            self.finish_generation(generation, cur_score)
+
+            mutated_score = self.evaluator.score(50, 30, 50, 10, 10)
+            if sum(mutated_score) < sum(best_score):
+                best_dict, best_score = self.copy_schedule_dict(), mutated_score
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('modification', generation, cur_score, best_dict, best_score)
+
+        # Возвращается лучшее найденное расписание, а не последнее поколение
+        self.finish_search(self.evaluator.score(50, 30, 50, 10, 10), best_dict, best_score)
+
+    def local_search(self, initial_temperature: float = 60.0, cooling: float = 0.6, tabu_tenure: int = 20,
+                     moves_per_generation: int = None, candidates: int = 8) -> None:
+        """
+        Локальный поиск - альтернатива циклу генетического алгоритма:
+
+        ПЕРВОЕ ПОКОЛЕНИЕ
+        1. Черновой вариант расписания создается, как в модификации ГА.
+        2. Накладки учителей устраняются fix_teacher_inconsistencies.
+
+        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
+        3. Условие останова.
+        4. moves_per_generation шагов поиска. На каждом шаге выбирается ячейка класса - чаще всего окно класса
+           или учителя - и до candidates интервалов той же смены. Обмен ячеек (или перенос урока в пустой интервал)
+           оценивается IncrementalEvaluator.score_swap без изменения расписания; лучший допустимый обмен
+           принимается, если не ухудшает оценку, а иначе - с вероятностью exp(-ухудшение / температура).
+           Температура уменьшается в cooling раз с каждым поколением. Ячейки класса, которые только что
+           менялись, tabu_tenure шагов не меняются снова, если обмен не дает лучшую оценку за запуск.
+
+        Параметры
+        ---------
+        initial_temperature : float
+            Температура второго поколения.
+        cooling : float
+            Множитель температуры на каждое следующее поколение.
+        tabu_tenure : int
+            Количество шагов, в течение которых измененные ячейки класса не меняются снова.
+        moves_per_generation : int
+            Количество шагов в поколении. По умолчанию - количество уроков в учебном плане.
+        candidates : int
+            Количество интервалов, с которыми сравнивается обмен на каждом шаге.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        fines = (50, 30, 50, 10, 10)
+
+        # Продолжение прерванного запуска с контрольной точки
+        resumed = self.load_search_state('local_search')
+        if resumed is not None:
+            generation, cur_score, best_dict, best_score = resumed
+        else:
+            self.telemetry.start()
+            self.stopping_policy.reset()
+            generation = 1
+            self.telemetry.start_generation(generation)
+
+            # 1. Черновой вариант расписания.
+            with self.ga_stage('initial_population', generation):
+                self.create_first_population()
+
+            # 2. Проверка расписания на консистентность и корректировка.
+            with self.ga_stage('teacher_repair', generation):
+                self.fix_teacher_inconsistencies()
+
+            with self.ga_stage('scoring', generation):
+                cur_score = self.evaluator.score(*fines)
+            self.finish_generation(generation, cur_score)
+
+            best_dict, best_score = self.copy_schedule_dict(), cur_score
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('local_search', generation, cur_score, best_dict, best_score)
+
+        # Индексы интервалов смены каждого класса
+        shift_intervals = {school_class: tuple(self.interval_index[interval]
+                                               for interval in self.class_shift_intervals(school_class))
+                           for school_class in self.classes}
+        if moves_per_generation is None:
+            moves_per_generation = max(1, int(self.df_academic_plan['count'].sum()))
+
+        #  Условие останова
+        while not self.check_stop(generation, cur_score):
+            generation += 1
+            self.telemetry.start_generation(generation)
+            temperature = initial_temperature * cooling ** (generation - 2)
+            cur_total, best_total = sum(cur_score), sum(best_score)
+            # Список запретов живет одно поколение, поэтому продолжение с контрольной точки его не теряет
+            tabu = {}
+
+            with self.ga_stage('local_search', generation):
+                for step in range(moves_per_generation):
+                    # Первая ячейка обмена: окно класса или учителя, иначе случайная ячейка
+                    windows = self.evaluator.class_windows() | self.evaluator.teacher_windows()
+                    if windows and random.random() < 0.8:
+                        # Порядок множества зависит от истории вставок, поэтому окна сортируются
+                        first, class_index = random.choice(sorted(windows))
+                        school_class = self.classes[class_index]
+                    else:
+                        school_class = random.choice(self.classes)
+                        first = random.choice(shift_intervals[school_class])
+
+                    # Лучший допустимый обмен среди кандидатов
+                    best_move = None
+                    for second in random.sample(shift_intervals[school_class],
+                                                min(candidates, len(shift_intervals[school_class]))):
+                        if second == first or not self.can_swap_class_cells(school_class, first, second):
+                            continue
+                        total = sum(self.evaluator.score_swap(school_class, first, second, *fines))
+                        is_tabu = tabu.get((school_class, first), -1) >= step or \
+                            tabu.get((school_class, second), -1) >= step
+                        if is_tabu and total >= best_total:
+                            continue
+                        if best_move is None or total < best_move[0]:
+                            best_move = (total, second)
+                    if best_move is None:
+                        continue
+
+                    # Критерий приема отжига
+                    total, second = best_move
+                    accepted = total <= cur_total or (
+                        temperature > 0 and random.random() < np.exp((cur_total - total) / temperature))
+                    if accepted:
+                        accepted = self.swap_class_cells(school_class, first, second)
+                    self.telemetry.count('local_search_swap', accepted)
+                    if not accepted:
+                        continue
 
-            # Стандарт распределения классов на смены
-            for clas in class_shift.keys():
-                class_shift[clas] = self.shift_standart[int(clas[:-1])] + 1
+                    cur_total = total
+                    tabu[(school_class, first)] = tabu[(school_class, second)] = step + tabu_tenure
+                    if cur_total < best_total:
+                        best_dict, best_score = self.copy_schedule_dict(), self.evaluator.score(*fines)
+                        best_total = cur_total
+                    if cur_total == 0:
+                        break
 
-        for interval in self.intervals:
-            teachers = dict()
-            for audience, dictionary in self.schedule_dict[interval].copy().items():
-                # Учитель ведет 2 урока одновременно
-                if dictionary['teacher'] in teachers:
-                    # Замена со следующим геном хромосомы
-                    next_interval = get_next_interval(interval, dictionary['class'])
-                    fixed = False
-                    while not fixed:
-                        if interval == next_interval:
-                            break
-                        # Ищем текущий класс в следующем интервале
-                        for next_audience, next_dictionary in self.schedule_dict[next_interval].copy().items():
-                            if dictionary['class'] == next_dictionary['class']:
-
-                                if dictionary['teacher'] == next_dictionary['teacher']:
-                                    # Если учитель совпал, не смысла менять местами эти уроки
-                                    continue
-                                elif next_dictionary['teacher'] in teachers:
-                                    # Уроки разные, но этот учитель уже ведет урок
-                                    break
-                                else:
-                                    # Нужно подобрать свободные аудитории для interval и next_interval
-                                    aud = find_free_audience(interval, next_dictionary['lesson'])
-                                    if not aud:
-                                        # Если аудитория не нашлась
-                                        continue
-
-                                    next_aud = find_free_audience(next_interval, dictionary['lesson'])
-                                    if not next_aud:
-                                        # Если аудитория не нашлась
-                                        continue
-
-                                    # Меняем местами ячейки расписания
-                                    self.schedule_dict[interval][aud] = next_dictionary
-                                    self.schedule_dict[next_interval][next_aud] = dictionary
-                                    if audience in self.schedule_dict[interval]:
-                                        del self.schedule_dict[interval][audience]
-                                    if next_audience in self.schedule_dict[next_interval]:
-                                        del self.schedule_dict[next_interval][next_audience]
-                                    teachers[next_dictionary['teacher']] = aud
-                                    fixed = True
-                                break
-                        else:
-                            # Следующая ячейка пуста, занимаем ее
-                            next_aud = find_free_audience(next_interval, dictionary['lesson'])
-                            if not next_aud:
-                                # Если аудитория не нашлась
-                                continue
+            with self.ga_stage('scoring', generation):
+                cur_score = self.evaluator.score(*fines)
+            self.finish_generation(generation, cur_score)
 
-                            self.schedule_dict[next_interval][next_aud] = dictionary
-                            if audience in self.schedule_dict[interval]:
-                                del self.schedule_dict[interval][audience]
+            self.report_progress(generation, cur_score, self.telemetry.elapsed())
+            self.save_search_state('local_search', generation, cur_score, best_dict, best_score)
 
-                            fixed = True
-                        next_interval = get_next_interval(next_interval, dictionary['class'])
-                # Учитель ведет один урок в этот промежуток времени
-                else:
-                    # Сохраняем и аудиторию, чтобы в случае наложения расписания быстро найти место замены
-                    teachers[dictionary['teacher']] = audience
+        # Возвращается лучшее найденное расписание
+        self.finish_search(cur_score, best_dict, best_score)
 
-    def classic_ga(self) -> None:
+    def can_swap_class_cells(self, school_class: str, first_interval: int, second_interval: int) -> bool:
         """
-        Основная логика классического генетического алгоритма:
+        Можно ли обменять ячейки класса между двумя интервалами без накладок учителей.
+        Хотя бы одна из ячеек должна быть заполнена. Аудитории проверяются при обмене в swap_class_cells.
 
-        ПЕРВОЕ ПОКОЛЕНИЕ
-        1. Первая популяция составляется случайным образом.
-        2. Проверка расписания на консистентность и корректировка.
-           Оценка приспособленности и запись значений функции для каждой особи.
+        Параметры
+        ---------
+        school_class : str
+            Класс.
+        first_interval : int
+            Индекс первого интервала.
+        second_interval : int
+            Индекс второго интервала.
 
-        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
-        3. Генетические операторы
-        2. Проверка расписания на консистентность и корректировка.
-           Оценка приспособленности и запись значений функции для каждой особи.
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если интервалы разные и учителя обеих ячеек свободны на новых местах.
+        """
+        if first_interval == second_interval:
+            return False
+        intervals = (self.intervals[first_interval], self.intervals[second_interval])
+        teachers = []
+        for interval in intervals:
+            audience = self.class_occupancy[interval].get(school_class)
+            teachers.append(self.schedule_dict[interval][audience]['teacher'] if audience is not None else None)
+        if teachers[0] is None and teachers[1] is None:
+            return False
+        # Учитель переходит в интервал, где он уже ведет урок у другого класса
+        for teacher, other_teacher, interval in ((teachers[0], teachers[1], intervals[1]),
+                                                 (teachers[1], teachers[0], intervals[0])):
+            if teacher is not None and teacher != other_teacher and teacher in self.teacher_occupancy[interval]:
+                return False
+        return True
+
+    def swap_class_cells(self, school_class: str, first_interval: int, second_interval: int) -> bool:
+        """
+        Обменивает ячейки класса между двумя интервалами (или переносит урок в пустой интервал),
+        подбирая аудитории на новых местах. Если подходящей аудитории нет, ячейки возвращаются на место.
+
+        Параметры
+        ---------
+        school_class : str
+            Класс.
+        first_interval : int
+            Индекс первого интервала.
+        second_interval : int
+            Индекс второго интервала.
 
         Возвращаемое значение
         ---------------------
-        None
+        bool
+            True, если обмен выполнен.
         """
-        # Оценки приспособленности поколений
-        score = list()
-        # Замеры времени
-        time_points = tuple()
-        time_points = time_points + (time.perf_counter(),)
-        stages_time_points = tuple()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        intervals = (self.intervals[first_interval], self.intervals[second_interval])
+        audiences = [self.class_occupancy[interval].get(school_class) for interval in intervals]
+        cells = [self.remove_cell(interval, audience) if audience is not None else None
+                 for interval, audience in zip(intervals, audiences)]
+
+        # Аудитории на новых местах: ячейка первого интервала переходит во второй и наоборот
+        new_audiences = [self.find_free_audience(intervals[1 - k], cell['lesson']) if cell is not None else None
+                         for k, cell in enumerate(cells)]
+        if any(cell is not None and audience is None for cell, audience in zip(cells, new_audiences)):
+            for interval, audience, cell in zip(intervals, audiences, cells):
+                if cell is not None:
+                    self.restore_cell(interval, audience, cell)
+            return False
 
-        # 1. Первая популяция составляется случайным образом.
-        self.create_first_population_randomly()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        for k, cell in enumerate(cells):
+            if cell is not None:
+                self.place_cell(intervals[1 - k], new_audiences[k], cell)
+        return True
 
-        # 2. Проверка расписания на консистентность и корректировка.
-        self.fix_schedule()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+    def exact_search(self, max_classes: int = 15, node_limit: int = 200000) -> None:
+        """
+        Точный поиск расписания для небольших школ (ExactSolver): перебор с возвратом, выбором самого
+        ограниченного урока и ветвями и границами по штрафу. Результат не зависит от случайности.
+
+        Если классов больше max_classes или перебор остановлен по ограничению, не найдя ни одного расписания,
+        запускается модификация генетического алгоритма; время перебора входит в ее time_budget. При отмене
+        возвращается лучшее найденное расписание или наибольшая частичная расстановка.
+        Перебор считает, что все уроки класса по предмету ведет один учитель, поэтому его итоги 'optimal'
+        и 'infeasible' доказаны только для такой модели.
+        Если перебор не нашел расписания без накладок, выбрасывается InfeasibleScheduleError, когда у каждого
+        урока класса один возможный учитель, иначе запускается модификация генетического алгоритма, которая
+        может разделить уроки между учителями. Итог перебора сохраняется в exact_status.
 
-        # Оценка приспособленности и запись значений функции для каждой особи.
-        cur_score = self.classic_ga_target_function(50, 30, 50, 10, 10)
-        score.append(cur_score)
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        Параметры
+        ---------
+        max_classes : int
+            Наибольшее количество классов, для которого запускается перебор.
+        node_limit : int
+            Наибольшее количество узлов перебора. Время ограничено time_budget условия останова.
 
-        time_points = time_points + (time.perf_counter(),)
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        fines = (50, 30, 50, 10, 10)
+        self.exact_status = None
+        if len(self.classes) > max_classes:
+            self.modification_ga()
+            return
+
+        self.telemetry.start()
+        self.stopping_policy.reset()
         generation = 1
+        self.telemetry.start_generation(generation)
+        with self.ga_stage('exact_search', generation):
+            solver = ExactSolver(self, fines, node_limit, self.stopping_policy.time_budget)
+            self.exact_status = solver.solve()
+
+        # Перебор закрепляет за уроком класса одного учителя, поэтому отсутствие расписания доказано,
+        # только если ни один урок нельзя разделить между учителями
+        if self.exact_status == INFEASIBLE and all(len(teachers) == 1 for *_, teachers in solver.groups):
+            self.telemetry.close()
+            raise InfeasibleScheduleError(['Полный перебор не нашел расписания без накладок учителей, '
+                                           'классов и аудиторий (у каждого урока класса один возможный учитель)'])
+        if self.exact_status in (INFEASIBLE, UNKNOWN) and solver.stop_reason != CANCELLED:
+            # Перебор не успел или не доказал отсутствие расписания: расписание составляет генетический алгоритм.
+            # Время перебора входит в time_budget
+            self.modification_ga(elapsed=self.telemetry.elapsed())
+            return
+
+        # При отмене до первого полного расписания возвращается наибольшая частичная расстановка.
+        # Аудитории расставляются паросочетанием в каждом интервале
+        self.schedule_dict = dict(zip(self.intervals, [{} for _ in range(len(self.intervals))]))
+        self.rebuild_occupancy()
+        by_interval = dict()
+        for interval, school_class, lesson, teacher in solver.solution or solver.partial:
+            by_interval.setdefault(interval, []).append({'class': school_class, 'lesson': lesson, 'teacher': teacher})
+        for interval, cells in by_interval.items():
+            audiences = bipartite_matching([self.lesson_audiences[cell['lesson']] for cell in cells])
+            for audience, cell in zip(audiences, cells):
+                self.place_cell(interval, audience, cell)
+
+        with self.ga_stage('scoring', generation):
+            score = self.evaluator.score(*fines)
+        self.finish_generation(generation, score)
+        self.stop_reason = solver.stop_reason or self.exact_status
+        self.report_progress(generation, score, self.telemetry.elapsed())
+        self.finish_search(score, self.schedule_dict, score)
+
+    def population_ga(self, population_size: int = 8, workers: int = None, elite_size: int = 1) -> None:
+        """
+        Модификация генетического алгоритма с популяцией из нескольких особей:
 
-        #  Условие останова
-        while not (sum(score[-1]) == 0 or generation == 10 or (time_points[-1] - time_points[0]) > 60 * 5):
-            # Репродукция
-            self.classic_ga_krossingover(random.choice(self.classes), random.choice(self.classes))
-            self.classic_ga_inversion(random.choice(self.classes))
-            stages_time_points = stages_time_points + (time.perf_counter(),)
-
-            # Мутация
-            self.classic_ga_mutation(random.choice(self.classes))
-            stages_time_points = stages_time_points + (time.perf_counter(),)
+        ПЕРВОЕ ПОКОЛЕНИЕ
+        1. population_size особей создаются create_first_population.
+        2. Каждая особь параллельно проверяется на консистентность по учителям и оценивается
+           (с репродукцией и мутацией) в пуле процессов.
 
-            # Исправить появившиеся накладки
-            self.fix_schedule()
-            stages_time_points = stages_time_points + (time.perf_counter(),)
+        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
+        3. Условие останова.
+        4. Элитные особи переходят в следующее поколение без изменений,
+           остальные места заполняются турнирным отбором и снова параллельно оцениваются.
 
-            # Пересчет целевой функции
-            cur_score = self.classic_ga_target_function(50, 30, 50, 10, 10)
-            score.append(cur_score)
-            stages_time_points = stages_time_points + (time.perf_counter(),)
+        Контрольные точки не поддерживаются: особи оцениваются в других процессах.
 
-            # Замер времени
-            time_points = time_points + (time.perf_counter(),)
-            generation += 1
+        Параметры
+        ---------
+        population_size : int
+            Количество особей в популяции.
+        workers : int
+            Количество процессов. По умолчанию - количество ядер.
+        elite_size : int
+            Количество лучших особей, которые переходят в следующее поколение без изменений.
 
-        # Запись функций приспособленности в файл
-        f = open("score.txt", "w")
-        for sc in score:
-            f.write(' '.join(list(map(str, sc))))
-            f.write('\r\n')
-        f.close()
-
-        # Запись замеров времени в файл
-        f = open("time.txt", "w")
-        for ind in range(len(time_points) - 1):
-            difference = round(time_points[ind + 1] - time_points[ind], 4)
-            f.write(str(difference))
-            f.write('\r\n')
-        f.close()
-
-        f = open("stages_time.txt", "w")
-        for ind in range(len(stages_time_points) - 1):
-            difference = round(stages_time_points[ind + 1] - stages_time_points[ind], 4)
-            f.write(str(difference))
-            f.write('\r\n')
-        f.close()
-
-        # TODO вынести замеры времени в функцию
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        workers = workers or os.cpu_count() or 1
+        elite_size = min(elite_size, population_size)
+
+        self.telemetry.start()
+        self.stopping_policy.reset()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_population_worker,
+                                 initargs=(self,)) as executor:
+
+            # 1, 2. Первое поколение
+            generation = 1
+            self.telemetry.start_generation(generation)
+            tasks = [(None, random.randrange(2 ** 32)) for _ in range(population_size)]
+            with self.ga_stage('evaluation', generation):
+                population = list(executor.map(_evaluate_individual, tasks))
+            population.sort(key=lambda individual: sum(individual[1]))
+            self.finish_generation(generation, population[0][1])
+            self.report_progress(generation, population[0][1], self.telemetry.elapsed())
+
+            # 3. Условие останова. При отмене остается лучшая особь текущего поколения
+            while not self.check_stop(generation, population[0][1]):
+                generation += 1
+                self.telemetry.start_generation(generation)
+
+                # 4. Элитизм и турнирный отбор
+                with self.ga_stage('selection', generation):
+                    elite = population[:elite_size]
+                    tasks = []
+                    for _ in range(population_size - elite_size):
+                        parent = min(random.sample(population, min(2, len(population))),
+                                     key=lambda individual: sum(individual[1]))
+                        tasks.append((parent[0], random.randrange(2 ** 32)))
+                with self.ga_stage('evaluation', generation):
+                    population = elite + list(executor.map(_evaluate_individual, tasks))
+                population.sort(key=lambda individual: sum(individual[1]))
+                self.finish_generation(generation, population[0][1])
+                self.report_progress(generation, population[0][1], self.telemetry.elapsed())
+
+        self.telemetry.close()
+
+        # Лучшая особь
+        self.set_schedule_dict(population[0][0])
+        self.best_score = self.evaluator.score(50, 30, 50, 10, 10)
         self.schedule_dict_to_table(self)
 
-    def modification_ga(self) -> None:
+    def island_ga(self, islands: int = None, migration_interval: int = 2) -> None:
         """
-        Основная логика разработанной модификации генетического алгоритма:
-
-        ПЕРВОЕ ПОКОЛЕНИЕ
-        1. Первая популяция создается с консистентностью по аудиториям и классам.
-        2. Проверка расписания на консистентность по учителям
-           Оценка приспособленности и параллельная репродукция и мутация.
+        Островная модель модификации генетического алгоритма.
+        Каждый остров - отдельный процесс, который ведет собственное расписание по логике modification_ga
+        со своим зерном генератора случайных чисел. Каждые migration_interval поколений лучшее расписание острова
+        отправляется соседу по кольцу и заменяет его текущее расписание, если оно лучше.
+        Результатом становится лучшее расписание среди всех островов.
+        Прогресс, отмена через cancel_event и контрольные точки не поддерживаются: поколения идут в других процессах.
 
-        ВТОРОЕ И ПОСЛЕДУЮЩИЕ ПОКОЛЕНИЯ
-        3. Условие останова.
-        2. Проверка расписания на консистентность по учителям
-           Оценка приспособленности и параллельная репродукция и мутация.
+        Параметры
+        ---------
+        islands : int
+            Количество островов (процессов). По умолчанию - количество ядер.
+        migration_interval : int
+            Через сколько поколений происходит миграция.
 
         Возвращаемое значение
         ---------------------
         None
         """
-        # Оценки приспособленности поколений
-        score = list()
-        # Замеры времени между поколениями
-        time_points = tuple()
-        time_points = time_points + (time.perf_counter(),)
-        # Замеры времени между этапами ГА
-        stages_time_points = tuple()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        islands = islands or os.cpu_count() or 1
+
+        # Очереди мигрантов для каждого острова и очередь результатов
+        inboxes = [multiprocessing.Queue() for _ in range(islands)]
+        results = multiprocessing.Queue()
+
+        processes = []
+        for island in range(islands):
+            process = multiprocessing.Process(target=_run_island,
+                                              args=(self, random.randrange(2 ** 32), inboxes[island],
+                                                    inboxes[(island + 1) % islands], migration_interval, results))
+            process.start()
+            processes.append(process)
+
+        # Результаты нужно забрать до завершения процессов. Упавший остров результат не отправит,
+        # поэтому очередь опрашивается с таймаутом, а остальные острова в этом случае останавливаются
+        island_results = []
+        while len(island_results) < islands:
+            try:
+                island_results.append(results.get(timeout=0.5))
+            except queue.Empty:
+                failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+                if failed:
+                    for process in processes:
+                        process.terminate()
+                        process.join()
+                    raise RuntimeError('Остров island_ga завершился с ошибкой, код выхода ' + str(failed[0]))
+        for process in processes:
+            process.join()
+
+        best_dict, best_score, score, migrations, self.stop_reason = min(island_results,
+                                                                         key=lambda result: sum(result[1]))
+
+        # Оценки поколений лучшего острова и пришедшие мигранты (время этапов на островах не замеряется)
+        self.telemetry.start()
+        for generation, generation_score in enumerate(score, start=1):
+            self.telemetry.start_generation(generation)
+            for accepted in migrations.get(generation, ()):
+                self.telemetry.count('migration', accepted)
+            self.telemetry.end_generation(generation_score)
+        self.telemetry.close()
+
+        self.set_schedule_dict(best_dict)
+        self.best_score = best_score
+        self.schedule_dict_to_table(self)
 
-        # 1. Первая популяция.
-        self.create_first_population()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+    def reschedule(self, initial_schedule, repair_rounds: int = 3) -> None:
+        """
+        Пересоставление существующего расписания после изменения входных данных
+        (больничный учителя, закрытая аудитория, правка учебного плана).
+
+        1. Ячейки исходного расписания переносятся без изменений, если они по-прежнему допустимы.
+        2. Если учитель больше не может вести урок, урок остается на месте с заменой учителя:
+           для класса и урока выбирается один учитель, свободный в наибольшем числе интервалов этих уроков.
+        3. Если аудитория закрыта или занята, урок остается на месте в другой подходящей аудитории.
+        4. Уроки, которые не удалось оставить, и уроки, добавленные в учебный план, ставятся в свободные интервалы
+           смены класса, по возможности рядом с другими уроками класса в наименее загруженный день.
+        5. Накладки учителей исправляются fix_teacher_inconsistencies, окна затронутых классов -
+           point_mutation_exchange. Остальные ячейки не трогаются.
 
-        # 2. Проверка расписания на консистентность и корректировка.
-        self.fix_teacher_inconsistencies()
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        Параметры
+        ---------
+        initial_schedule : str or dict
+            Путь к файлу расписания классов (как сохраняет save_schedule) или schedule_dict.
+        repair_rounds : int
+            Количество проходов исправления окон затронутых классов.
 
-        # Оценка приспособленности и запись значений функции для каждой особи.
-        # Этот же этап репродукции.
-        cur_score = self.modification_ga_target_function(50, 30, 50, 10, 10)
-        score.append(cur_score)
-        stages_time_points = stages_time_points + (time.perf_counter(),)
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        if isinstance(initial_schedule, str):
+            initial_schedule = self.load_schedule(initial_schedule)
 
-        time_points = time_points + (time.perf_counter(),)
+        self.telemetry.start()
+        self.stopping_policy.reset()
         generation = 1
+        self.telemetry.start_generation(generation)
+
+        # Сколько уроков каждого вида осталось поставить по учебному плану
+        remaining = dict()
+        for sch_class, lesson, count in zip(self.df_academic_plan['class'].tolist(),
+                                            self.df_academic_plan['lesson'].tolist(),
+                                            self.df_academic_plan['count'].tolist()):
+            remaining[(sch_class, lesson)] = remaining.get((sch_class, lesson), 0) + int(count)
+
+        # Классы, расписание которых изменилось
+        affected = set()
+        # Ячейки, оставшиеся в своем интервале, но которым нужен другой учитель
+        substitutions = dict()
+        # Ячейки, которые нужно поставить заново
+        unplaced = []
+
+        # 1, 3. Перенос допустимых ячеек
+        self.set_schedule_dict(dict(zip(self.intervals, [{} for _ in range(len(self.intervals))])))
+        with self.ga_stage('restore', generation):
+            for interval, cells in initial_schedule.items():
+                for audience, cell in cells.items():
+                    key = (cell['class'], cell['lesson'])
+                    if remaining.get(key, 0) <= 0:
+                        # Класса или урока больше нет в учебном плане
+                        affected.add(cell['class'])
+                        continue
+                    remaining[key] -= 1
+                    cell = {'class': cell['class'], 'lesson': cell['lesson'], 'teacher': cell['teacher']}
 
-        # Запись функций приспособленности в файл
-        f = open(f"score{str(generation)}.txt", "w")
-        for sc in score:
-            f.write(' '.join(list(map(str, sc))))
-            f.write('\r\n')
-        f.close()
+                    if interval not in self.interval_index or cell['class'] in self.class_occupancy[interval]:
+                        unplaced.append(cell)
+                        affected.add(cell['class'])
+                        continue
 
-        #  Условие останова
-        while not (sum(score[-1]) == 0 or generation == 10 or (time_points[-1] - time_points[0]) > 60 * 5):
-            # Исправить появившиеся накладки
+                    if audience not in self.lesson_audiences.get(cell['lesson'], ()) \
+                            or audience in self.schedule_dict[interval]:
+                        audience = self.find_free_audience(interval, cell['lesson'])
+                        if not audience:
+                            unplaced.append(cell)
+                            affected.add(cell['class'])
+                            continue
+                        affected.add(cell['class'])
+
+                    if cell['lesson'] not in self.teacher_lessons.get(cell['teacher'], ()):
+                        substitutions.setdefault(key, []).append((interval, audience))
+                        affected.add(cell['class'])
+                    self.place_cell(interval, audience, cell)
+
+        # 2. Замена учителя: один учитель на класс и урок
+        with self.ga_stage('substitution', generation):
+            for (sch_class, lesson), places in substitutions.items():
+                teacher = min(self.lesson_teachers[lesson],
+                              key=lambda candidate: (sum(candidate in self.teacher_occupancy[interval]
+                                                         for interval, _ in places),
+                                                     self.teacher_load(candidate)))
+                for interval, audience in places:
+                    self.remove_cell(interval, audience)
+                    self.place_cell(interval, audience, {'class': sch_class, 'lesson': lesson, 'teacher': teacher})
+
+        # 4. Уроки без места и новые уроки учебного плана
+        with self.ga_stage('placement', generation):
+            for (sch_class, lesson), count in remaining.items():
+                if count > 0:
+                    affected.add(sch_class)
+                    unplaced.extend({'class': sch_class, 'lesson': lesson, 'teacher': None} for _ in range(count))
+
+            self.unplaced_lessons = []
+            for cell in unplaced:
+                if cell['teacher'] is None or cell['lesson'] not in self.teacher_lessons.get(cell['teacher'], ()):
+                    cell['teacher'] = self.class_lesson_teacher(cell['class'], cell['lesson'])
+                if not self.place_near_class_lessons(cell):
+                    self.unplaced_lessons.append((cell['class'], cell['lesson']))
+
+        # 5. Местное исправление накладок и окон
+        with self.ga_stage('teacher_repair', generation):
+            self.fix_teacher_inconsistencies()
+        with self.ga_stage('window_repair', generation):
+            affected_indexes = {self.class_index[school_class] for school_class in affected
+                                if school_class in self.class_index}
+            for _ in range(repair_rounds):
+                windows = [window for window in self.evaluator.class_windows() if window[1] in affected_indexes]
+                if not windows:
+                    break
+                for window in windows:
+                    self.point_mutation_exchange(window[0], self.classes[window[1]], True, False, True, True)
             self.fix_teacher_inconsistencies()
-            stages_time_points = stages_time_points + (time.perf_counter(),)
 
-            # Пересчет целевой функции
-            cur_score = self.modification_ga_target_function(50, 30, 50, 10, 10)
-            score.append(cur_score)
-            stages_time_points = stages_time_points + (time.perf_counter(),)
+        self.affected_classes = tuple(school_class for school_class in self.classes if school_class in affected)
+        score = self.evaluator.score(50, 30, 50, 10, 10)
+        self.finish_generation(generation, score)
+        self.report_progress(generation, score, self.telemetry.elapsed())
+        self.stop_reason = None
+        self.best_score = score
+        self.telemetry.close()
+        self.schedule_dict_to_table(self)
 
-            # Замер времени
-            time_points = time_points + (time.perf_counter(),)
-            generation += 1
+    def teacher_load(self, teacher: str) -> int:
+        """
+        Количество уроков учителя в неделю в текущем расписании.
+        """
+        return sum(len(self.teacher_occupancy[interval].get(teacher, ())) for interval in self.intervals)
 
-        # Запись функций приспособленности в файл
-        f = open(f"score.txt", "w")
-        for sc in score:
-            f.write(' '.join(list(map(str, sc))))
-            f.write('\r\n')
-        f.close()
-
-
-        # Запись замеров времени в файл
-        f = open("time.txt", "w")
-        for ind in range(len(time_points) - 1):
-            difference = round(time_points[ind + 1] - time_points[ind], 4)
-            f.write(str(difference))
-            f.write('\r\n')
-        f.close()
-
-        f = open("stages_time.txt", "w")
-        for ind in range(len(stages_time_points) - 1):
-            difference = round(stages_time_points[ind + 1] - stages_time_points[ind], 4)
-            f.write(str(difference))
-            f.write('\r\n')
-        f.close()
-
-        # TODO вынести замеры времени в функцию
-        self.schedule_dict_to_table(self)
+    def class_lesson_teacher(self, school_class: str, lesson: str) -> str:
+        """
+        Учитель для урока класса: тот, кто уже ведет этот урок в классе, иначе наименее загруженный
+        из учителей, которые могут его вести.
+
+        Параметры
+        ---------
+        school_class : str
+            Класс.
+        lesson : str
+            Урок.
+
+        Возвращаемое значение
+        ---------------------
+        str
+            Учитель.
+        """
+        for interval in self.intervals:
+            audience = self.class_occupancy[interval].get(school_class)
+            if audience is not None and self.schedule_dict[interval][audience]['lesson'] == lesson:
+                return self.schedule_dict[interval][audience]['teacher']
+        return min(self.lesson_teachers[lesson], key=self.teacher_load)
+
+    def place_near_class_lessons(self, cell: dict) -> bool:
+        """
+        Ставит урок в свободный интервал смены класса, в котором свободна подходящая аудитория.
+        Предпочтение - интервалу, в котором свободен учитель и который примыкает к другим урокам класса
+        в наименее загруженный день, чтобы не образовывать окна.
+
+        Параметры
+        ---------
+        cell : dict
+            Ячейка расписания {'class', 'lesson', 'teacher'}.
+
+        Возвращаемое значение
+        ---------------------
+        bool
+            True, если урок поставлен.
+        """
+        school_class = cell['class']
+        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
+
+        # Нагрузка класса по дням
+        day_load = [0] * self.number_of_days_in_week
+        for i, interval in enumerate(self.intervals):
+            if school_class in self.class_occupancy[interval]:
+                day_load[i // count_less_per_day] += 1
+
+        audience_type = self.lesson_audience_type.get(cell['lesson'])
+        candidates = []
+        for interval in self.class_shift_intervals(school_class):
+            if school_class in self.class_occupancy[interval] or not self.free_audiences[interval].get(audience_type):
+                continue
+            i = self.interval_index[interval]
+            day = i // count_less_per_day
+            neighbours = [j for j in (i - 1, i + 1) if 0 <= j < len(self.intervals) and j // count_less_per_day == day]
+            adjacent = any(school_class in self.class_occupancy[self.intervals[j]] for j in neighbours)
+            teacher_busy = cell['teacher'] in self.teacher_occupancy[interval]
+            candidates.append(((teacher_busy, not adjacent and day_load[day] > 0, day_load[day]), interval))
+
+        if not candidates:
+            return False
+        best = min(candidate[0] for candidate in candidates)
+        _, interval = random.choice([candidate for candidate in candidates if candidate[0] == best])
+        self.place_cell(interval, self.find_free_audience(interval, cell['lesson']), dict(cell))
+        return True
 
     def point_mutation_exchange(self, interval: int, school_class: str, completeness_of_second_gene: bool,
                                 single_day: bool, other_teacher: bool, second_gene_is_extreme: bool) -> bool:
@@ -722,42 +2015,6 @@ class Schedule:
             Второй ген - крайний.
             Чтобы не образовывать окна.
         """
-        def find_free_audience(current_interval: str, lesson: str) -> str:
-            """
-            Функция возвращает аудиторию, которая свободная в interval и подходит для проведения урока lesson.
-             Параметры
-             ---------
-             current_interval : str
-                Инвервал, в котором ищется аудитория.
-             lesson : str
-                Урок, для которого ищется аудитория.
-            """
-            # Выбор типа аудитории
-            required_type_audience = self.df_audiences_lessons.loc[self.df_audiences_lessons['lesson']
-                                                                   == lesson].iloc[0]['type']
-            possible_audiences = self.df_audiences.loc[self.df_audiences['type']
-                                                       == required_type_audience]['audience'].to_list()
-            # Запасная аудитория
-            spare_aud = ''
-            for current_audience in self.audiences:
-                if current_audience not in possible_audiences:
-                    spare_aud = current_audience
-                    break
-
-            # Перемешали, чтоб рассаживать в разные аудитории,
-            # но исключить повторный выбор аудиторий за счет итерирования
-            random.shuffle(possible_audiences)
-
-            # Удаляем занятые аудитории
-            for current_audience in self.schedule_dict[current_interval].keys():
-                if current_audience in possible_audiences:
-                    possible_audiences.remove(current_audience)
-
-            if possible_audiences:
-                return possible_audiences[0]
-            else:
-                return spare_aud
-
         def gene_search(interval: int, first_class: str, completeness_of_second_gene: bool, current_day: bool,
                         other_teacher: bool, second_gene_is_extreme: bool) -> tuple:
             """
@@ -790,161 +2047,167 @@ class Schedule:
             end_of_the_shift = count_less_per_day
             day = interval // count_less_per_day
             # Узнаем смену класса: True = вторая
-            shift = self.shift_standart[int(first_class[:-1])]
+            shift = self.shift_standart[self.class_grade(first_class)]
             if self.second_shift:
                 # Конец первой смены
                 end_of_the_shift = (end_of_the_shift - 1) // 2
+
+            def is_extreme(interv_index: int) -> bool:
+                """
+                Урок класса в интервале - первый или последний урок класса в своем дне.
+                """
+                if first_class not in self.class_occupancy[self.intervals[interv_index]]:
+                    return False
+                day_start = interv_index // count_less_per_day * count_less_per_day
+                # Первый
+                if not any(first_class in self.class_occupancy[self.intervals[time_index]]
+                           for time_index in range(day_start + shift * (end_of_the_shift + 1), interv_index)):
+                    return True
+                # Последний
+                return not any(first_class in self.class_occupancy[self.intervals[time_index]]
+                               for time_index in range(interv_index + 1, day_start + count_less_per_day))
+
             if current_day:
 
                 # Проходим по дню
-                for interv in self.intervals[day * count_less_per_day + shift * (end_of_the_shift + 1): \
-                        (day + 1) * count_less_per_day]:
-                    teachers = tuple()
+                for interv_index in range(day * count_less_per_day + shift * (end_of_the_shift + 1),
+                                          (day + 1) * count_less_per_day):
+                    interv = self.intervals[interv_index]
 
+                    # Ген не меняется сам с собой
+                    if interv_index == interval:
+                        continue
                     # Крайний ли ген
-                    if second_gene_is_extreme:
-                        # Первый
-                        extreme_flag1 = True
-                        for time_int in self.intervals[day * count_less_per_day + shift * (end_of_the_shift + 1): \
-                                self.intervals.index(interv)]:
-                            if bool(self.schedule_list[self.intervals.index(time_int)][
-                                        self.classes.index(first_class)]):
-                                extreme_flag1 = False
-                                break
-                        if not bool(self.schedule_list[self.intervals.index(interv)][self.classes.index(first_class)]):
-                            extreme_flag1 = False
-                            break
-                        # Последний
-                        extreme_flag2 = True
-                        if not bool(self.schedule_list[self.intervals.index(interv)][self.classes.index(first_class)]):
-                            extreme_flag2 = False
-                            break
-                        if bool(self.schedule_list[(self.intervals.index(interv) + 1) % len(self.intervals)]
-                                [self.classes.index(first_class)]):
-                            extreme_flag2 = False
-                            break
-                    if second_gene_is_extreme and not (extreme_flag1 or extreme_flag2):
+                    if second_gene_is_extreme and not is_extreme(interv_index):
                         continue
 
-                    for audience, dictionary in self.schedule_dict[interv].copy().items():
-                        teachers = teachers + (dictionary['teacher'],)
-                        if dictionary['class'] == first_class and bool(dictionary) == completeness_of_second_gene:
-                            if 'teacher' in first_gene:
-                                if not completeness_of_second_gene or other_teacher != (
-                                        dictionary['teacher'] != first_gene['teacher']):
-                                    # Первое условие выполнено (ген пустой), тогда сравнивать учителей не надо
-                                    # Другой интервал
-                                    break
-                            # Проверка на консистентность по учителям
-                            # Учитель первого интервала
-                            if bool(first_gene):
-                                if first_gene['teacher'] in teachers:
-                                    # Другой интервал
-                                    break
-                            # Если второй ген должен быть полный
-                            if completeness_of_second_gene:
-                                # Учитель второго интервала
-                                if dictionary['teacher'] in teachers_first_interval:
-                                    # Другой интервал
-                                    break
-                                genes = genes + ({'interval': interv, 'audience': audience, 'class': school_class,
-                                                  'lesson': dictionary['lesson'], 'teacher': dictionary['teacher']},)
-                            else:
-                                genes = genes + ({'interval': interv},)
+                    # Ячейка класса в этом интервале
+                    audience = self.class_occupancy[interv].get(first_class)
+                    if audience is None:
+                        continue
+                    dictionary = self.schedule_dict[interv][audience]
+                    if bool(dictionary) == completeness_of_second_gene:
+                        if 'teacher' in first_gene:
+                            if not completeness_of_second_gene or other_teacher != (
+                                    dictionary['teacher'] != first_gene['teacher']):
+                                # Первое условие выполнено (ген пустой), тогда сравнивать учителей не надо
+                                # Другой интервал
+                                continue
+                        # Проверка на консистентность по учителям
+                        # Учитель первого интервала
+                        # Ячейки, которые меняются местами, накладок не создают
+                        if bool(first_gene):
+                            if self.teacher_is_busy(interv, first_gene['teacher'], audience):
+                                # Другой интервал
+                                continue
+                        # Если второй ген должен быть полный
+                        if completeness_of_second_gene:
+                            # Учитель второго интервала
+                            if self.teacher_is_busy(self.intervals[interval], dictionary['teacher'],
+                                                    first_gene.get('audience')):
+                                # Другой интервал
+                                continue
+                            genes = genes + ({'interval': interv, 'audience': audience, 'class': school_class,
+                                              'lesson': dictionary['lesson'], 'teacher': dictionary['teacher']},)
+                        else:
+                            genes = genes + ({'interval': interv},)
 
 
             else:
                 # Проходим по дням
-                for interv in self.intervals:
-                    teachers = tuple()
+                for interv_index, interv in enumerate(self.intervals):
                     # Несоответствие смене
-                    if ((self.intervals.index(interv) % count_less_per_day) > end_of_the_shift) != shift:
+                    if ((interv_index % count_less_per_day) > end_of_the_shift) != shift:
+                        continue
+                    # Ген не меняется сам с собой
+                    if interv_index == interval:
                         continue
                     # Крайний ли ген
-                    if second_gene_is_extreme:
-                        # Первый
-                        extreme_flag1 = True
-                        for time_int in self.intervals[day * count_less_per_day + shift * (end_of_the_shift + 1): \
-                                self.intervals.index(interv)]:
-                            if bool(self.schedule_list[self.intervals.index(time_int)][
-                                        self.classes.index(first_class)]):
-                                extreme_flag1 = False
-                                break
-                        if not bool(self.schedule_list[self.intervals.index(interv)][self.classes.index(first_class)]):
-                            extreme_flag1 = False
-                            break
-                            # Последний
-                        extreme_flag2 = True
-                        if not bool(self.schedule_list[self.intervals.index(interv)][self.classes.index(first_class)]):
-                            extreme_flag2 = False
-                            break
-                        if bool(self.schedule_list[(self.intervals.index(interv) + 1) % len(self.intervals)][
-                                    self.classes.index(first_class)]):
-                            extreme_flag2 = False
-                            break
-                    if second_gene_is_extreme and not (extreme_flag1 or extreme_flag2):
+                    if second_gene_is_extreme and not is_extreme(interv_index):
+                        continue
+                    # Ячейка класса в этом интервале
+                    audience = self.class_occupancy[interv].get(first_class)
+                    if audience is None:
                         continue
-                    for audience, dictionary in self.schedule_dict[interv].copy().items():
-                        teachers = teachers + (dictionary['teacher'],)
-                        if dictionary['class'] == first_class and bool(dictionary) == completeness_of_second_gene:
-                            if 'teacher' in first_gene:
-                                if not completeness_of_second_gene or other_teacher != (
-                                        dictionary['teacher'] != first_gene['teacher']):
-                                    # Первое условие выполнено (ген пустой), тогда сравнивать учителей не надо
-                                    # Другой интервал
-                                    break
-                            # Проверка на консистентность по учителям
-                            # Учитель первого интервала
-                            if bool(first_gene):
-                                if first_gene['teacher'] in teachers:
-                                    # Другой интервал
-                                    break
-                            if completeness_of_second_gene:
-                                # Учитель второго интервала
-                                if dictionary['teacher'] in teachers_first_interval:
-                                    # Другой интервал
-                                    break
-                                genes = genes + ({'interval': interv, 'audience': audience, 'class': school_class,
-                                                  'lesson': dictionary['lesson'], 'teacher': dictionary['teacher']},)
-                            else:
-                                genes = genes + ({'interval': interv},)
+                    dictionary = self.schedule_dict[interv][audience]
+                    if bool(dictionary) == completeness_of_second_gene:
+                        if 'teacher' in first_gene:
+                            if not completeness_of_second_gene or other_teacher != (
+                                    dictionary['teacher'] != first_gene['teacher']):
+                                # Первое условие выполнено (ген пустой), тогда сравнивать учителей не надо
+                                # Другой интервал
+                                continue
+                        # Проверка на консистентность по учителям
+                        # Учитель первого интервала
+                        # Ячейки, которые меняются местами, накладок не создают
+                        if bool(first_gene):
+                            if self.teacher_is_busy(interv, first_gene['teacher'], audience):
+                                # Другой интервал
+                                continue
+                        # Если второй ген должен быть полный
+                        if completeness_of_second_gene:
+                            # Учитель второго интервала
+                            if self.teacher_is_busy(self.intervals[interval], dictionary['teacher'],
+                                                    first_gene.get('audience')):
+                                # Другой интервал
+                                continue
+                            genes = genes + ({'interval': interv, 'audience': audience, 'class': school_class,
+                                              'lesson': dictionary['lesson'], 'teacher': dictionary['teacher']},)
+                        else:
+                            genes = genes + ({'interval': interv},)
             return genes
 
         first_gene = dict()
         interval = self.intervals[interval]
         # Найти данные по первому гену
-        teachers_first_interval = tuple()
-        for audience, dictionary in self.schedule_dict[interval].copy().items():
-            teachers_first_interval = teachers_first_interval + (dictionary['teacher'],)
-            if dictionary['class'] == school_class:
-                first_gene['interval'] = interval
-                first_gene['audience'] = audience
-                first_gene['teacher'] = dictionary['teacher']
-                first_gene['lesson'] = dictionary['lesson']
-        second_genes = gene_search(self.intervals.index(interval), school_class, completeness_of_second_gene, single_day, other_teacher,
-                                   second_gene_is_extreme)
+        audience = self.class_occupancy[interval].get(school_class)
+        if audience is not None:
+            dictionary = self.schedule_dict[interval][audience]
+            first_gene['interval'] = interval
+            first_gene['audience'] = audience
+            first_gene['teacher'] = dictionary['teacher']
+            first_gene['lesson'] = dictionary['lesson']
+        second_genes = gene_search(self.interval_index[interval], school_class, completeness_of_second_gene, single_day,
+                                   other_teacher, second_gene_is_extreme)
         if second_genes:
             second_gene = random.choice(second_genes)
-            # Пустые ячейки
+            # Удаляем старые гены
+            if bool(first_gene):
+                self.remove_cell(interval, first_gene['audience'])
+            if 'audience' in second_gene:
+                self.remove_cell(second_gene['interval'], second_gene['audience'])
 
+            first_cell = second_cell = None
             if bool(first_gene):
-                # Удаляем старый ген
-                if first_gene['audience'] in self.schedule_dict[interval]:
-                    del self.schedule_dict[interval][first_gene['audience']]
-                # Ставим его на новое место
-                self.schedule_dict[second_gene['interval']][find_free_audience(second_gene['interval'],
-                                                                               first_gene['lesson'])] \
-                    = {'class': school_class, 'lesson': first_gene['lesson'], 'teacher': first_gene['teacher']}
-
-            if bool(second_gene):
-                # Удаляем старый ген
-                if second_gene['audience'] in self.schedule_dict[second_gene['interval']]:
-                    del self.schedule_dict[second_gene['interval']][second_gene['audience']]
-                # Ставим его на новое место
-                self.schedule_dict[interval][find_free_audience(interval, second_gene['lesson'])] = \
-                    {'class': second_gene['class'], 'lesson': second_gene['lesson'], 'teacher': second_gene['teacher']}
+                first_cell = {'class': school_class, 'lesson': first_gene['lesson'], 'teacher': first_gene['teacher']}
+            if 'audience' in second_gene:
+                second_cell = {'class': second_gene['class'], 'lesson': second_gene['lesson'],
+                               'teacher': second_gene['teacher']}
+
+            # Аудитории на новых местах
+            first_audience = second_audience = None
+            if first_cell is not None:
+                first_audience = self.find_free_audience(second_gene['interval'], first_cell['lesson'])
+            if second_cell is not None:
+                second_audience = self.find_free_audience(interval, second_cell['lesson'])
+            if (first_cell is not None and not first_audience) or (second_cell is not None and not second_audience):
+                # Нет свободной аудитории нужного типа: гены возвращаются на место
+                if first_cell is not None:
+                    self.restore_cell(interval, first_gene['audience'], first_cell)
+                if second_cell is not None:
+                    self.restore_cell(second_gene['interval'], second_gene['audience'], second_cell)
+                self.telemetry.count('point_mutation_exchange', False)
+                return False
+
+            # Ставим их на новые места
+            if first_cell is not None:
+                self.place_cell(second_gene['interval'], first_audience, first_cell)
+            if second_cell is not None:
+                self.place_cell(interval, second_audience, second_cell)
+            self.telemetry.count('point_mutation_exchange', True)
             return True
         else:
+            self.telemetry.count('point_mutation_exchange', False)
             return False
 
     def modification_ga_target_function(self, window_fine: int, teacher_fine: int, wishes_fine: int,
@@ -970,13 +2233,16 @@ class Schedule:
         tuple
             Оценки приспособленности по каждому параметру.
         """
-        self.schedule_dict_to_table(self)
+        # Недостатки расписания на момент оценки. Считаются инкрементально, только по измененным дням.
+        class_windows = self.evaluator.class_windows()
+        teacher_windows = self.evaluator.teacher_windows()
+        wishes_violations = self.evaluator.wishes_violations()
+        concentration_failures, distribution_failures = self.load_failures()
         score_tuple = tuple()
 
         # Окна у классов
         score = 0
-        windows = self.class_window_finder()
-        for window in windows:
+        for window in class_windows:
             changed = self.point_mutation_exchange(window[0], self.classes[window[1]], True, False,
                                                    True, True)
             # Инверсия для длинных окон
@@ -987,8 +2253,7 @@ class Schedule:
 
         # Окна у учителей
         score = 0
-        windows = self.teacher_window_finder()
-        for window in windows:
+        for window in teacher_windows:
             # Мутация-обмен
             changed = self.point_mutation_exchange(window[0], self.classes[window[1]], True, False,
                                                    False, True)
@@ -997,58 +2262,86 @@ class Schedule:
 
         # Пожелания учителей
         score = 0
-        if not self.df_teachers_wishes.empty:
-            for index, row in self.df_teachers_wishes.iterrows():
-                if self.schedule_list_teacher[self.intervals.index(row['interval'])] \
-                        [self.teachers.index(row['teacher'])]:
-                    class_index = None
-                    for aud, dict in self.schedule_dict[row['interval']].copy().items():
-                        if dict['teacher'] == row['teacher']:
-                            class_index = self.classes.index(dict['class'])
-                    # Мутация
-                    changed = self.point_mutation_exchange(self.intervals.index(row['interval']),
-                                                           self.classes[class_index], False, False, True, False)
-                    score += wishes_fine * (1 - int(changed))
+        for interval_index, teacher in wishes_violations:
+            interval = self.intervals[interval_index]
+            class_index = None
+            for aud in self.teacher_occupancy[interval].get(teacher, {}):
+                class_index = self.class_index[self.schedule_dict[interval][aud]['class']]
+            if class_index is None:
+                # Урок учителя уже перенесен предыдущими мутациями
+                continue
+            # Мутация
+            changed = self.point_mutation_exchange(interval_index, self.classes[class_index],
+                                                   False, False, True, False)
+            score += wishes_fine * (1 - int(changed))
         score_tuple = score_tuple + (score,)
 
         # Пик концентрации в течение дня приходится на 10-12 часов (2 и 3 уроки).
         score = 0
         count_less_per_day = len(self.intervals) // self.number_of_days_in_week
-        for class_index, school_class in enumerate(self.classes):
-            # Если смена первая
-            if not self.shift_standart[int(school_class[:-1])]:
-                for day in range(self.number_of_days_in_week):
-                    if not self.schedule_list[day * count_less_per_day + 1][class_index] \
-                            or not self.schedule_list[day * count_less_per_day + 2][class_index]:
-                        # Мутация-обмен
-                        changed = self.point_mutation_exchange(day * count_less_per_day + 1, school_class,
-                                                               False, False, True, True)
-                        score += concentration_fine * (1 - int(changed))
-                        changed = self.point_mutation_exchange(day * count_less_per_day + 2, school_class, False,
-                                                               False, True, True)
-                        score += concentration_fine * (1 - int(changed))
+        for school_class, day in concentration_failures:
+            # Мутация-обмен
+            changed = self.point_mutation_exchange(day * count_less_per_day + 1, school_class,
+                                                   False, False, True, True)
+            score += concentration_fine * (1 - int(changed))
+            changed = self.point_mutation_exchange(day * count_less_per_day + 2, school_class, False,
+                                                   False, True, True)
+            score += concentration_fine * (1 - int(changed))
         score_tuple = score_tuple + (score,)
 
         # Наибольший объем учебной нагрузки приходился на вторник и четверг.
-        score = 0
-        for class_index, school_class in enumerate(self.classes):
-            count_lessons = tuple()
-            for day in range(self.number_of_days_in_week):
-                count_lessons = count_lessons + \
-                                (sum([bool(self.schedule_list[day * count_less_per_day + lesson][class_index])
-                                      for lesson in range(count_less_per_day)]),)
-            # Если максимум уроков не стоят во вторник или четверг
-            if count_lessons.index(max(count_lessons)) not in (1, 3):
-                # Кроссинговер
-                # TODO кроссинговер
-
-                score += distribution_fine
+        # Кроссинговер
+        # TODO кроссинговер
+        score = distribution_fine * len(distribution_failures)
         score_tuple = score_tuple + (score,)
 
         # TODO: система проверок на существование расписания под требования пользователя
 
         return score_tuple
 
+    def occupancy_matrix(self, by_teacher: bool = False) -> np.ndarray:
+        """
+        Булева матрица занятости, построенная по индексам занятости.
+
+        Параметры
+        ---------
+        by_teacher : bool
+            True - матрица интервалы x учителя, False - интервалы x классы.
+
+        Возвращаемое значение
+        ---------------------
+        np.ndarray
+            True, если у класса (учителя) есть урок в интервале.
+        """
+        if by_teacher:
+            occupancy, positions = self.teacher_occupancy, self.teacher_index
+        else:
+            occupancy, positions = self.class_occupancy, self.class_index
+
+        occupied = np.zeros((len(self.intervals), len(positions)), dtype=bool)
+        for interval_i, interval in enumerate(self.intervals):
+            occupied[interval_i, [positions[key] for key in occupancy[interval]]] = True
+        return occupied
+
+    def load_failures(self) -> tuple:
+        """
+        Возвращает нарушения пика концентрации и распределения нагрузки по неделе,
+        посчитанные общим ядром kernels.load_penalties по матрице занятости классов.
+
+        Возвращаемое значение
+        ---------------------
+        tuple
+            ([(класс, день), ...] в порядке классов и дней, [класс, ...])
+        """
+        first_shift = np.array([not self.shift_standart[self.class_grade(school_class)]
+                                for school_class in self.classes], dtype=bool)
+        concentration, distribution = load_penalties(self.occupancy_matrix(), self.number_of_days_in_week,
+                                                     first_shift)
+        concentration_failures = [(self.classes[class_index], day)
+                                  for class_index, day in zip(*np.nonzero(concentration))]
+        distribution_failures = [self.classes[class_index] for class_index in np.flatnonzero(distribution)]
+        return concentration_failures, distribution_failures
+
     def class_window_finder(self) -> set[tuple[int, int]]:
         """
         Возвращает окна по классам.
@@ -1058,50 +2351,17 @@ class Schedule:
         tuple
             ((индекс_интервала, индекс_класса), ...)
         """
-        windows = set()
+        class_occupied = self.occupancy_matrix()
 
-        # Конец смены
-        end_of_the_shift = len(self.schedule_dict) // self.number_of_days_in_week
+        # Новый день или новая смена
+        segment_starts = (0,)
         if self.second_shift:
             # Конец первой смены
-            end_of_the_shift = (end_of_the_shift - 1) // 2
-
-        for ind_class, school_class in enumerate(self.schedule_list[0]):
-            # Предыдущий интервал занят
-            # is_prev_lesson = False
-            is_curr_lesson = False
-            # Были ли сегодня уроки
-            today_lessons = False
-
-            for ind_interval, interval in enumerate(self.schedule_list):
-
-                # Новый день или новая смена
-                if ind_interval % (len(self.intervals) // self.number_of_days_in_week) == 0 \
-                        or ind_interval % (len(self.intervals) // self.number_of_days_in_week) == end_of_the_shift + 1:
-                    is_prev_lesson = False
-                    today_lessons = False
-                else:
-                    is_prev_lesson = is_curr_lesson
-
-                is_curr_lesson = bool(interval[ind_class])
-
-                # Предыдущий интервал занят, т.е. уроки продолжились или закончились
-                if is_prev_lesson:
-                    continue
-
-                # Сейчас урока нет, до этого тоже
-                elif not interval[ind_class]:
-                    continue
-
-                # Урока не было, сейчас есть, но уроки уже были сегодня
-                elif today_lessons:
-                    # Окно
-                    windows.add((ind_interval - 1, ind_class))
+            end_of_the_shift = (len(self.intervals) // self.number_of_days_in_week - 1) // 2
+            segment_starts = (0, end_of_the_shift + 1)
 
-                # Уроков не было, но начались
-                else:
-                    today_lessons = True
-        return windows
+        intervals, classes = find_windows(class_occupied, self.number_of_days_in_week, segment_starts)
+        return set(zip(intervals.tolist(), classes.tolist()))
 
     def teacher_window_finder(self) -> set[tuple[int, int]]:
         """
@@ -1112,44 +2372,15 @@ class Schedule:
         tuple
             ((индекс_интервала, индекс_класса), ...)
         """
+        teacher_occupied = self.occupancy_matrix(by_teacher=True)
         windows = set()
 
-        for ind_teacher, teacher in enumerate(self.schedule_list_teacher[0]):
-            # Предыдущий интервал занят
-            # is_prev_lesson = False
-            is_curr_lesson = False
-            # Были ли сегодня уроки
-            today_lessons = False
-
-            for ind_interval, interval in enumerate(self.schedule_list_teacher):
-
-                # Новый день или новая смена
-                if ind_interval % (len(self.intervals) // self.number_of_days_in_week) == 0:
-                    is_prev_lesson = False
-                    today_lessons = False
-                else:
-                    is_prev_lesson = is_curr_lesson
-
-                is_curr_lesson = bool(interval[ind_teacher])
-
-                # Предыдущий интервал занят, т.е. уроки продолжились или закончились
-                if is_prev_lesson:
-                    continue
-
-                # Сейчас урока нет, до этого тоже
-                elif not interval[ind_teacher]:
-                    continue
-
-                # Урока не было, сейчас есть, но уроки уже были сегодня
-                elif today_lessons:
-                    # Окно
-                    for aud, dict in self.schedule_dict[self.intervals[ind_interval]].copy().items():
-                        if dict['teacher'] == teacher:
-                            windows.add((ind_interval - 1, self.classes.index(dict['class'])))
-
-                # Уроков не было, но начались
-                else:
-                    today_lessons = True
+        intervals, teachers = find_windows(teacher_occupied, self.number_of_days_in_week)
+        for ind_interval, ind_teacher in zip(intervals.tolist(), teachers.tolist()):
+            # Окно отмечается по классам, у которых учитель ведет урок после окна
+            interval = self.intervals[ind_interval + 1]
+            for aud in self.teacher_occupancy[interval][self.teachers[ind_teacher]]:
+                windows.add((ind_interval, self.class_index[self.schedule_dict[interval][aud]['class']]))
         return windows
 
     def classic_ga_target_function(self, window_fine: int, teacher_fine: int, wishes_fine: int,
@@ -1182,34 +2413,19 @@ class Schedule:
         score = 0
         if not self.df_teachers_wishes.empty:
             for index, row in self.df_teachers_wishes.iterrows():
-                if self.schedule_list_teacher[self.intervals.index(row['interval'])] \
-                        [self.teachers.index(row['teacher'])]:
+                if self.schedule_list_teacher[self.interval_index[row['interval']]] \
+                        [self.teacher_index[row['teacher']]]:
                     score += wishes_fine
         score_tuple = score_tuple + (score,)
 
+        concentration_failures, distribution_failures = self.load_failures()
+
         # Пик концентрации в течение дня приходится на 10-12 часов (2 и 3 уроки).
-        score = 0
-        count_less_per_day = len(self.intervals) // self.number_of_days_in_week
-        for class_index, school_class in enumerate(self.classes):
-            # Если смена первая
-            if not self.shift_standart[int(school_class[:-1])]:
-                for day in range(self.number_of_days_in_week):
-                    if not self.schedule_list[day * count_less_per_day + 1][class_index] \
-                            or not self.schedule_list[day * count_less_per_day + 2][class_index]:
-                        score += concentration_fine
+        score = concentration_fine * len(concentration_failures)
         score_tuple = score_tuple + (score,)
 
         # Наибольший объем учебной нагрузки приходился на вторник и четверг.
-        score = 0
-        for class_index, school_class in enumerate(self.classes):
-            count_lessons = tuple()
-            for day in range(self.number_of_days_in_week):
-                count_lessons = count_lessons + \
-                                (sum([bool(self.schedule_list[day * count_less_per_day + lesson][class_index])
-                                      for lesson in range(count_less_per_day)]),)
-            # Если максимум уроков не стоят во вторник или четверг
-            if count_lessons.index(max(count_lessons)) not in (1, 3):
-                score += distribution_fine
+        score = distribution_fine * len(distribution_failures)
         score_tuple = score_tuple + (score,)
 
         # TODO: система проверок на существование расписания под требования пользователя
@@ -1230,8 +2446,8 @@ class Schedule:
             Класс, расписание которого будет меняться.
         """
         # Классы одной смены
-        shift = self.shift_standart[int(target_class1[:-1])]
-        while shift != self.shift_standart[int(target_class2[:-1])]:
+        shift = self.shift_standart[self.class_grade(target_class1)]
+        while shift != self.shift_standart[self.class_grade(target_class2)]:
             target_class2 = random.choice(self.classes)
 
         # Случайный интервал в течение дня попадающий в смену
@@ -1249,34 +2465,28 @@ class Schedule:
         if start_interval_ind > end_interval_ind:
             start_interval, end_interval = end_interval, start_interval
             start_interval_ind, end_interval_ind = end_interval_ind, start_interval_ind
+        # Участок нулевой длины не меняет расписание
+        self.telemetry.count('krossingover', start_interval_ind < end_interval_ind)
         while start_interval_ind < end_interval_ind:
 
             # Извлекаем ячейки для первого и второго класса
             sch_dict1, sch_dict2 = {}, {}
 
             # TODO здесь могут быть накладки с учебным планом
-            for audience, dictionary in self.schedule_dict[start_interval].copy().items():
-
-                # Извлекаем ячейку с target_class1
-                if dictionary['class'] == target_class1:
-                    sch_dict1[audience] = dictionary
-                    if audience in self.schedule_dict[start_interval]:
-                        del self.schedule_dict[start_interval][audience]
-                # Извлекаем ячейку с target_class2
-                if dictionary['class'] == target_class2:
-                    sch_dict2[audience] = dictionary
-                    if audience in self.schedule_dict[start_interval]:
-                        del self.schedule_dict[start_interval][audience]
+            # Извлекаем ячейку с target_class1
+            audience = self.class_occupancy[start_interval].get(target_class1)
+            if audience is not None:
+                sch_dict1[audience] = self.remove_cell(start_interval, audience)
+            # Извлекаем ячейку с target_class2
+            audience = self.class_occupancy[start_interval].get(target_class2)
+            if audience is not None:
+                sch_dict2[audience] = self.remove_cell(start_interval, audience)
 
             # Ставим ячейки в новое место в таблице
-            if sch_dict1:
-                for audience, dictionary in sch_dict1.copy().items():
-                    sch_dict1[audience]['class'] = target_class2
-                    self.schedule_dict[start_interval][audience] = sch_dict1[audience]
-            if sch_dict2:
-                for audience, dictionary in sch_dict2.copy().items():
-                    sch_dict2[audience]['class'] = target_class1
-                    self.schedule_dict[start_interval][audience] = sch_dict2[audience]
+            for audience, dictionary in sch_dict1.items():
+                self.place_cell(start_interval, audience, dict(dictionary, **{'class': target_class2}))
+            for audience, dictionary in sch_dict2.items():
+                self.place_cell(start_interval, audience, dict(dictionary, **{'class': target_class1}))
 
             start_interval_ind += 1
             start_interval = self.intervals[start_interval_ind]
@@ -1293,37 +2503,7 @@ class Schedule:
             Класс, расписание которого будет меняться.
         """
 
-        def find_free_audience(current_interval: str, lesson: str) -> str:
-            """
-            Функция возвращает аудиторию, которая свободная в interval и подходит для проведения урока lesson.
-            """
-            # Выбор типа аудитории
-            required_type_audience = self.df_audiences_lessons.loc[self.df_audiences_lessons['lesson']
-                                                                   == lesson].iloc[0]['type']
-            possible_audiences = self.df_audiences.loc[self.df_audiences['type']
-                                                       == required_type_audience]['audience'].to_list()
-            # Запасная аудитория
-            spare_aud = ''
-            for current_audience in self.audiences:
-                if current_audience not in possible_audiences:
-                    spare_aud = current_audience
-                    break
-
-            # Перемешали, чтоб рассаживать в разные аудитории,
-            # но исключить повторный выбор аудиторий за счет итерирования
-            random.shuffle(possible_audiences)
-
-            # Удаляем занятые аудитории
-            for current_audience in self.schedule_dict[current_interval].keys():
-                if current_audience in possible_audiences:
-                    possible_audiences.remove(current_audience)
-
-            if possible_audiences:
-                return possible_audiences[0]
-            else:
-                return spare_aud
-
-        shift = self.shift_standart[int(target_class[:-1])]
+        shift = self.shift_standart[self.class_grade(target_class)]
 
         # Случайный интервал в течение дня попадающий в смену
         day = random.choice(range(self.number_of_days_in_week))
@@ -1339,32 +2519,33 @@ class Schedule:
         start_interval = self.intervals[start_interval_ind]
         end_interval = self.intervals[end_interval_ind]
 
+        self.telemetry.count('inversion', start_interval_ind < end_interval_ind)
+
         # Обход с концов интервала инверсии к его середине
         while start_interval_ind < end_interval_ind:
             # Извлекаем ячейки правого и левого конца интервала
             start_dict, end_dict = {}, {}
 
             # Извлекаем ячейку с target_class
-            for audience, dictionary in self.schedule_dict[start_interval].copy().items():
-                if dictionary['class'] == target_class:
-                    start_dict[audience] = dictionary
-                    del self.schedule_dict[start_interval][audience]
-                    break
-            for audience, dictionary in self.schedule_dict[end_interval].copy().items():
-                if dictionary['class'] == target_class:
-                    end_dict[audience] = dictionary
-                    del self.schedule_dict[end_interval][audience]
-                    break
-
-            # Ставим ячейку в новое место в таблице
-            if start_dict:
-                for audience, dictionary in start_dict.copy().items():
-                    self.schedule_dict[end_interval][
-                        find_free_audience(end_interval, dictionary['lesson'])] = dictionary
-            if end_dict:
-                for audience, dictionary in end_dict.copy().items():
-                    self.schedule_dict[start_interval][
-                        find_free_audience(start_interval, dictionary['lesson'])] = dictionary
+            audience = self.class_occupancy[start_interval].get(target_class)
+            if audience is not None:
+                start_dict[audience] = self.remove_cell(start_interval, audience)
+            audience = self.class_occupancy[end_interval].get(target_class)
+            if audience is not None:
+                end_dict[audience] = self.remove_cell(end_interval, audience)
+
+            # Ставим ячейку в новое место в таблице, если там есть аудитория нужного типа
+            moves = [(end_interval, start_interval, audience, dictionary)
+                     for audience, dictionary in start_dict.items()]
+            moves += [(start_interval, end_interval, audience, dictionary)
+                      for audience, dictionary in end_dict.items()]
+            targets = [self.find_free_audience(interval, dictionary['lesson']) for interval, _, _, dictionary in moves]
+            if all(targets):
+                for (interval, _, _, dictionary), audience in zip(moves, targets):
+                    self.place_cell(interval, audience, dictionary)
+            else:
+                for _, interval, audience, dictionary in moves:
+                    self.restore_cell(interval, audience, dictionary)
 
             start_interval_ind += 1
             end_interval_ind -= 1
@@ -1386,16 +2567,16 @@ class Schedule:
         mut = True  # Флаг
 
         while mut:
-            for audience, dictionary in self.schedule_dict[interval].copy().items():
-                if dictionary['class'] == target_class:
-                    # Промутировать ген
-                    self.schedule_dict[interval][audience]['teacher'] = random.choice(self.teachers)
-                    self.schedule_dict[interval][audience]['lesson'] = random.choice(
-                        self.df_teachers.loc[
-                            self.df_teachers['teacher'] == self.schedule_dict[interval][audience]['teacher']]
-                        ['lesson'].to_list())
-                    mut = False
-                    break
+            audience = self.class_occupancy[interval].get(target_class)
+            if audience is not None:
+                # Промутировать ген
+                teacher = random.choice(self.teachers)
+                self.remove_cell(interval, audience)
+                self.place_cell(interval, audience, {'class': target_class,
+                                                     'lesson': random.choice(self.teacher_lessons[teacher]),
+                                                     'teacher': teacher})
+                self.telemetry.count('mutation', True)
+                mut = False
             else:
                 interval = random.choice(self.intervals)
 
@@ -1419,7 +2600,7 @@ class Schedule:
                 lesson = self.schedule_dict[interval][audience]['lesson']
                 teacher = self.schedule_dict[interval][audience]['teacher']
                 item = str(lesson) + '\n' + str(teacher) + '\n' + str(audience)
-                data_pupils[interval_i][self.classes.index(school_class)] = item
+                data_pupils[interval_i][self.class_index[school_class]] = item
 
         self.schedule_list = data_pupils
 
@@ -1433,6 +2614,206 @@ class Schedule:
                 lesson = self.schedule_dict[interval][audience]['lesson']
                 teacher = self.schedule_dict[interval][audience]['teacher']
                 item = str(lesson) + '\n' + str(school_class) + '\n' + str(audience)
-                data_teachers[interval_i][self.teachers.index(teacher)] = item
+                data_teachers[interval_i][self.teacher_index[teacher]] = item
 
         self.schedule_list_teacher = data_teachers
+
+    def save_schedule(self, path_classes: str, path_teachers: str) -> None:
+        """
+        Сохранить расписание для классов и учителей в файлы Excel.
+        Строки - интервалы, столбцы - классы или учителя.
+
+        Параметры
+        ---------
+        path_classes : str
+            Путь к файлу с расписанием классов.
+        path_teachers : str
+            Путь к файлу с расписанием учителей.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        table = []
+        for interval_num, interval in enumerate(self.schedule_dict):
+            table.append((interval,) + tuple(self.schedule_list[interval_num]))
+
+        df = pd.DataFrame(table)
+        df.columns = [''] + list(self.classes)
+        df.to_excel(path_classes, sheet_name='Budgets', index=False)
+
+        table = []
+        for interval_num, interval in enumerate(self.schedule_dict):
+            table.append((interval,) + tuple(self.schedule_list_teacher[interval_num]))
+
+        df = pd.DataFrame(table)
+        df.columns = [''] + list(self.teachers)
+        df.to_excel(path_teachers, sheet_name='Budgets', index=False)
+        # TODO: Добавить другие типы файлов
+
+    def load_schedule(self, path_classes: str) -> dict:
+        """
+        Читает расписание классов из файла Excel, сохраненного save_schedule.
+        Ячейки классов, которых нет в учебном плане, пропускаются.
+
+        Параметры
+        ---------
+        path_classes : str
+            Путь к файлу с расписанием классов.
+
+        Возвращаемое значение
+        ---------------------
+        dict
+            Расписание по шаблону {'интервал': {'аудитория': {'class', 'lesson', 'teacher'}}}.
+        """
+        df = pd.read_excel(path_classes, sheet_name=0)
+        schedule_dict = dict()
+        for row in df.itertuples(index=False):
+            cells = schedule_dict.setdefault(str(row[0]), {})
+            for school_class, item in zip(df.columns[1:], row[1:]):
+                school_class = str(school_class)
+                if item != item or not str(item).strip() or school_class not in self.class_index:
+                    continue
+                lesson, teacher, audience = str(item).split('\n')
+                cells[audience] = {'class': school_class, 'lesson': lesson, 'teacher': teacher}
+        return schedule_dict
+
+    def schedule_dict_to_arrays(self) -> ScheduleArrays:
+        """
+        Преобразование расписания в плотные целочисленные массивы (интервал x класс).
+
+        Возвращаемое значение
+        ---------------------
+        ScheduleArrays
+            Идентификаторы уроков, учителей и аудиторий для каждой ячейки.
+        """
+        return self.encoding.encode(self.schedule_dict)
+
+    def arrays_to_schedule_dict(self, arrays: ScheduleArrays) -> None:
+        """
+        Восстанавливает schedule_dict из целочисленных массивов, чтобы вывод в приложение и сохранение
+        работали как прежде.
+
+        Параметры
+        ---------
+        arrays : ScheduleArrays
+            Расписание в виде массивов.
+
+        Возвращаемое значение
+        ---------------------
+        None
+        """
+        self.set_schedule_dict(self.encoding.decode(arrays))
+
+
+# Расписание, общее для всех задач процесса пула в population_ga
+_worker_schedule = None
+
+
+def _init_population_worker(schedule: Schedule) -> None:
+    """
+    Инициализация процесса пула: расписание со всеми индексами передается в процесс один раз.
+    """
+    global _worker_schedule
+    _worker_schedule = schedule
+
+
+def _evaluate_individual(task: tuple) -> tuple:
+    """
+    Проверка особи на консистентность по учителям и ее оценка в процессе пула.
+
+    Параметры
+    ---------
+    task : tuple
+        (schedule_dict особи или None для новой особи, зерно генератора случайных чисел)
+
+    Возвращаемое значение
+    ---------------------
+    tuple
+        (schedule_dict особи после корректировки, оценки приспособленности)
+    """
+    schedule_dict, seed = task
+    schedule = _worker_schedule
+    random.seed(seed)
+
+    if schedule_dict is None:
+        schedule.create_first_population()
+    else:
+        schedule.set_schedule_dict(schedule_dict)
+
+    schedule.fix_teacher_inconsistencies()
+    schedule.modification_ga_target_function(50, 30, 50, 10, 10)
+    # Целевая функция сразу мутирует расписание, поэтому возвращаемая особь оценивается заново
+    return schedule.schedule_dict, schedule.evaluator.score(50, 30, 50, 10, 10)
+
+
+def _run_island(schedule: Schedule, seed: int, inbox, outbox, migration_interval: int, results) -> None:
+    """
+    Остров в island_ga: модификация генетического алгоритма в отдельном процессе.
+
+    Параметры
+    ---------
+    schedule : Schedule
+        Подготовленное расписание.
+    seed : int
+        Зерно генератора случайных чисел острова.
+    inbox : multiprocessing.Queue
+        Очередь мигрантов, приходящих на остров.
+    outbox : multiprocessing.Queue
+        Очередь мигрантов соседнего острова.
+    migration_interval : int
+        Через сколько поколений происходит миграция.
+    results : multiprocessing.Queue
+        Очередь, в которую отправляется (лучшее расписание, его оценка, оценки по поколениям,
+        мигранты по поколениям, причина остановки).
+    """
+    # Мигранты, которые сосед не успел забрать, не должны задерживать завершение процесса
+    outbox.cancel_join_thread()
+    random.seed(seed)
+
+    # Оценки приспособленности поколений и принят ли каждый пришедший мигрант {поколение: [принят, ...]}
+    score = list()
+    migrations = dict()
+    schedule.telemetry.start()
+    schedule.stopping_policy.reset()
+
+    # Первое поколение
+    schedule.create_first_population()
+    schedule.fix_teacher_inconsistencies()
+    score.append(schedule.modification_ga_target_function(50, 30, 50, 10, 10))
+    # Целевая функция сразу мутирует расписание, поэтому сохраненная копия оценивается заново
+    best_dict, best_score = schedule.copy_schedule_dict(), schedule.evaluator.score(50, 30, 50, 10, 10)
+    generation = 1
+
+    #  Условие останова
+    while not schedule.check_stop(generation, score[-1]):
+        # Миграция
+        if generation % migration_interval == 0:
+            outbox.put((best_dict, best_score))
+            # Мигранта сравниваем с текущим расписанием после мутации, а не с оценкой до нее
+            cur_score = schedule.evaluator.score(50, 30, 50, 10, 10)
+            try:
+                while True:
+                    immigrant_dict, immigrant_score = inbox.get_nowait()
+                    accepted = sum(immigrant_score) < sum(cur_score)
+                    # Миграция относится к следующему поколению, в котором мигрант мутирует
+                    migrations.setdefault(generation + 1, []).append(accepted)
+                    if accepted:
+                        schedule.set_schedule_dict(immigrant_dict)
+                        cur_score = immigrant_score
+                        if sum(immigrant_score) < sum(best_score):
+                            best_dict, best_score = schedule.copy_schedule_dict(), immigrant_score
+            except queue.Empty:
+                pass
+
+        # Исправить появившиеся накладки
+        schedule.fix_teacher_inconsistencies()
+
+        # Пересчет целевой функции
+        score.append(schedule.modification_ga_target_function(50, 30, 50, 10, 10))
+        mutated_score = schedule.evaluator.score(50, 30, 50, 10, 10)
+        if sum(mutated_score) < sum(best_score):
+            best_dict, best_score = schedule.copy_schedule_dict(), mutated_score
+        generation += 1
+
+    results.put((best_dict, best_score, score, migrations, schedule.stop_reason))
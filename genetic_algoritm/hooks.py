@@ -0,0 +1,142 @@
+import cProfile
+import tracemalloc
+
+# События цикла генетического алгоритма
+EVENTS = ('before_stage', 'after_stage', 'end_generation')
+
+
+class GenerationHooks:
+    """
+    Класс для подключения собственного кода к циклу генетического алгоритма без изменения модуля.
+    Обработчики вызываются в порядке регистрации:
+        before_stage(schedule, generation, stage) - перед этапом поколения
+        after_stage(schedule, generation, stage) - после этапа поколения
+        end_generation(schedule, generation, score) - после оценки поколения
+    где schedule - текущее расписание (Schedule), generation - номер поколения, stage - название этапа,
+    как в телеметрии, score - оценки приспособленности поколения.
+
+    Методы
+    ------
+    register(event, callback):
+        Добавляет обработчик события.
+    unregister(event, callback):
+        Удаляет обработчик события.
+    before_stage(schedule, generation, stage), after_stage(schedule, generation, stage),
+    end_generation(schedule, generation, score):
+        Вызывают обработчики события.
+    """
+
+    def __init__(self):
+        """
+        Устанавливает необходимые атрибуты для объекта GenerationHooks.
+        """
+        self._callbacks = {event: [] for event in EVENTS}
+
+    def register(self, event: str, callback=None):
+        """
+        Добавляет обработчик события. Без callback возвращает декоратор.
+
+        Параметры
+        ---------
+        event : str
+            Событие: 'before_stage', 'after_stage' или 'end_generation'.
+        callback : callable
+            Обработчик.
+        """
+        if event not in self._callbacks:
+            raise ValueError('Неизвестное событие: ' + str(event) + '. Допустимые: ' + ', '.join(EVENTS))
+        if callback is None:
+            return lambda function: self.register(event, function)
+        self._callbacks[event].append(callback)
+        return callback
+
+    def unregister(self, event: str, callback) -> None:
+        """
+        Удаляет обработчик события.
+        """
+        self._callbacks[event].remove(callback)
+
+    def __bool__(self) -> bool:
+        """
+        Есть ли хотя бы один обработчик.
+        """
+        return any(self._callbacks.values())
+
+    def before_stage(self, schedule, generation: int, stage: str) -> None:
+        for callback in self._callbacks['before_stage']:
+            callback(schedule, generation, stage)
+
+    def after_stage(self, schedule, generation: int, stage: str) -> None:
+        for callback in self._callbacks['after_stage']:
+            callback(schedule, generation, stage)
+
+    def end_generation(self, schedule, generation: int, score: tuple) -> None:
+        for callback in self._callbacks['end_generation']:
+            callback(schedule, generation, score)
+
+
+def profile_generation(hooks: GenerationHooks, path: str, generation: int = 1) -> cProfile.Profile:
+    """
+    Подключает cProfile на время одного поколения и сохраняет статистику в path.
+
+    Параметры
+    ---------
+    hooks : GenerationHooks
+        Обработчики, к которым подключается профилировщик.
+    path : str
+        Файл для статистики (читается pstats.Stats).
+    generation : int
+        Номер профилируемого поколения.
+
+    Возвращаемое значение
+    ---------------------
+    cProfile.Profile
+        Профилировщик.
+    """
+    profiler = cProfile.Profile()
+
+    def before_stage(schedule, current_generation, stage):
+        if current_generation == generation:
+            profiler.enable()
+
+    def after_stage(schedule, current_generation, stage):
+        if current_generation == generation:
+            profiler.disable()
+
+    def end_generation(schedule, current_generation, score):
+        if current_generation == generation:
+            profiler.dump_stats(path)
+
+    hooks.register('before_stage', before_stage)
+    hooks.register('after_stage', after_stage)
+    hooks.register('end_generation', end_generation)
+    return profiler
+
+
+def trace_memory(hooks: GenerationHooks, every: int = 1) -> list:
+    """
+    Снимок tracemalloc после каждого every-го поколения.
+    Отслеживание памяти включается при подключении и замедляет алгоритм.
+
+    Параметры
+    ---------
+    hooks : GenerationHooks
+        Обработчики, к которым подключаются снимки.
+    every : int
+        Через сколько поколений делается снимок.
+
+    Возвращаемое значение
+    ---------------------
+    list
+        Список [(поколение, tracemalloc.Snapshot), ...], который пополняется во время работы алгоритма.
+    """
+    snapshots = []
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    def end_generation(schedule, generation, score):
+        if generation % every == 0:
+            snapshots.append((generation, tracemalloc.take_snapshot()))
+
+    hooks.register('end_generation', end_generation)
+    return snapshots
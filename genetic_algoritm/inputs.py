@@ -0,0 +1,116 @@
+import hashlib
+import io
+import os
+import pickle
+
+import pandas as pd
+
+# Версия формата кэша: меняется вместе с normalize_input, чтобы старые файлы кэша не использовались.
+# В ключ кэша входит и версия pandas: таблицы, сохраненные другой версией, могут не загрузиться
+CACHE_VERSION = 1
+
+# Каталог кэша по умолчанию
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'school_schedule')
+
+# Вид входных данных: {'вид': 'аргумент Schedule'}
+INPUT_ARGUMENTS = {'academic_plan': 'df_academic_plan', 'teachers': 'df_teachers',
+                   'audiences_lessons': 'df_audiences_lessons', 'audiences': 'df_audiences', 'rings': 'df_rings',
+                   'teachers_wishes': 'df_teachers_wishes'}
+
+
+def normalize_input(name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приводит входную таблицу к виду, с которым работает Schedule. Исходная таблица не меняется,
+    а повторная нормализация ничего не меняет, поэтому таблицы из кэша можно передавать в Schedule как есть.
+        teachers - строка 'урок1, урок2' у учителя раскладывается в отдельные строки по урокам;
+        academic_plan - класс указан только в первой строке своего блока и заполняется в остальных;
+        teachers_wishes - так же заполняется учитель.
+
+    Параметры
+    ---------
+    name : str
+        Вид входных данных: 'academic_plan', 'teachers', 'audiences_lessons', 'audiences', 'rings'
+        или 'teachers_wishes'.
+    df : pd.DataFrame
+        Входная таблица.
+
+    Возвращаемое значение
+    ---------------------
+    pd.DataFrame
+        Нормализованная таблица.
+    """
+    if name == 'teachers':
+        lessons = df['lesson'].map(lambda value: value.split(', ') if isinstance(value, str) else value)
+        return df.assign(lesson=lessons).explode('lesson')
+    if name == 'academic_plan':
+        return df.assign(**{'class': df['class'].ffill()})
+    if name == 'teachers_wishes' and not df.empty:
+        return df.assign(teacher=df['teacher'].ffill())
+    return df
+
+
+def normalize_inputs(frames: dict) -> dict:
+    """
+    Нормализует входные таблицы Schedule функцией normalize_input.
+
+    Параметры
+    ---------
+    frames : dict
+        Таблицы {'аргумент Schedule': pd.DataFrame}, например {'df_teachers': ...}.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Нормализованные таблицы с теми же ключами.
+    """
+    kinds = {argument: name for name, argument in INPUT_ARGUMENTS.items()}
+    return {argument: normalize_input(kinds[argument], df) for argument, df in frames.items()}
+
+
+def load_input(path: str, name: str, cache_dir: str = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Читает и нормализует входной файл Excel. Результат сохраняется в кэш в формате pickle
+    с ключом по хэшу SHA-256 содержимого файла и версии pandas, поэтому повторное чтение неизмененного файла
+    не разбирает Excel, а измененный файл читается заново. Кэш только ускоряет загрузку:
+    поврежденный файл кэша разбирается заново, а ошибка записи кэша не мешает чтению.
+
+    Параметры
+    ---------
+    path : str
+        Путь к файлу Excel.
+    name : str
+        Вид входных данных, как в normalize_input.
+    cache_dir : str
+        Каталог кэша. None - читать без кэша.
+
+    Возвращаемое значение
+    ---------------------
+    pd.DataFrame
+        Нормализованная таблица.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if cache_dir is None:
+        return normalize_input(name, pd.read_excel(io.BytesIO(content)))
+
+    digest = hashlib.sha256(content).hexdigest()
+    cache_path = os.path.join(cache_dir, f'{name}_{digest}_v{CACHE_VERSION}_pandas{pd.__version__}.pkl')
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # Обрезанный или чужой файл может выбросить при загрузке почти любое исключение
+            pass
+
+    df = normalize_input(name, pd.read_excel(io.BytesIO(content)))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Временный файл свой у каждого процесса: одни и те же входные файлы могут читаться параллельно
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+    return df
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def find_windows(occupied: np.ndarray, number_of_days_in_week: int, segment_starts: tuple = (0,)) -> tuple:
+    """
+    Поиск окон в булевой матрице занятости (интервалы x столбцы).
+    День делится на отрезки (смены), которые начинаются с номеров уроков segment_starts.
+    Окно - последний свободный интервал перед уроком, если в этом отрезке дня уроки уже были.
+
+    Параметры
+    ---------
+    occupied : np.ndarray
+        Булева матрица формы (интервалы, классы или учителя).
+    number_of_days_in_week : int
+        Количество учебных дней в неделе.
+    segment_starts : tuple
+        Номера уроков в течение дня, с которых начинается новый отрезок.
+
+    Возвращаемое значение
+    ---------------------
+    tuple
+        Массивы (индексы_интервалов, индексы_столбцов) окон.
+    """
+    lessons_per_day = occupied.shape[0] // number_of_days_in_week
+    days = occupied.reshape(number_of_days_in_week, lessons_per_day, occupied.shape[1])
+    bounds = tuple(start for start in segment_starts if 0 <= start < lessons_per_day) + (lessons_per_day,)
+
+    intervals, columns = [], []
+    for start, end in zip(bounds, bounds[1:]):
+        segment = days[:, start:end, :]
+        # Были ли уроки в отрезке до интервала включительно
+        seen = np.logical_or.accumulate(segment, axis=1)
+        # Урок начинается после свободного интервала, а до него уроки уже были
+        windows = segment[:, 1:, :] & ~segment[:, :-1, :] & seen[:, :-1, :]
+        day, lesson, column = np.nonzero(windows)
+        intervals.append(day * lessons_per_day + start + lesson)
+        columns.append(column)
+
+    return np.concatenate(intervals), np.concatenate(columns)
+
+
+def day_loads(occupied: np.ndarray, number_of_days_in_week: int) -> np.ndarray:
+    """
+    Количество уроков по дням недели.
+
+    Параметры
+    ---------
+    occupied : np.ndarray
+        Булева матрица формы (интервалы, классы).
+    number_of_days_in_week : int
+        Количество учебных дней в неделе.
+
+    Возвращаемое значение
+    ---------------------
+    np.ndarray
+        Матрица формы (классы, дни).
+    """
+    lessons_per_day = occupied.shape[0] // number_of_days_in_week
+    days = occupied.reshape(number_of_days_in_week, lessons_per_day, occupied.shape[1])
+    return days.sum(axis=1).T
+
+
+def load_penalties(occupied: np.ndarray, number_of_days_in_week: int, first_shift: np.ndarray) -> tuple:
+    """
+    Нарушения пика концентрации и распределения нагрузки по неделе.
+    Пик концентрации в течение дня приходится на 2 и 3 уроки (только для первой смены),
+    наибольший объем нагрузки - на вторник или четверг (первый максимум по дням).
+
+    Параметры
+    ---------
+    occupied : np.ndarray
+        Булева матрица формы (интервалы, классы).
+    number_of_days_in_week : int
+        Количество учебных дней в неделе.
+    first_shift : np.ndarray
+        Булев массив формы (классы,): True, если класс учится в первую смену.
+
+    Возвращаемое значение
+    ---------------------
+    tuple
+        (матрица (классы, дни) дней без 2 или 3 урока, массив (классы,) нарушений распределения)
+    """
+    lessons_per_day = occupied.shape[0] // number_of_days_in_week
+    days = occupied.reshape(number_of_days_in_week, lessons_per_day, occupied.shape[1])
+
+    if lessons_per_day > 2:
+        concentration = ~(days[:, 1, :] & days[:, 2, :]).T & first_shift[:, np.newaxis]
+    else:
+        concentration = np.zeros((occupied.shape[1], number_of_days_in_week), dtype=bool)
+
+    peak_day = day_loads(occupied, number_of_days_in_week).argmax(axis=1)
+    distribution = (peak_day != 1) & (peak_day != 3)
+    return concentration, distribution
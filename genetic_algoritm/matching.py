@@ -0,0 +1,50 @@
+def bipartite_matching(options: list, initial: list = None) -> list:
+    """
+    Наибольшее паросочетание в двудольном графе алгоритмом Куна.
+    Увеличивающие цепи ищутся обходом в глубину без рекурсии, поэтому размер графа не ограничен глубиной стека.
+    Уже сопоставленные вершины остаются сопоставленными, меняются только их пары.
+
+    Параметры
+    ---------
+    options : list
+        Для каждой левой вершины - допустимые правые вершины в порядке предпочтения.
+    initial : list
+        Начальное паросочетание: правая вершина или None для каждой левой вершины.
+
+    Возвращаемое значение
+    ---------------------
+    list
+        Правая вершина или None для каждой левой вершины.
+    """
+    assignment = list(initial) if initial is not None else [None] * len(options)
+    owner = {right: left for left, right in enumerate(assignment) if right is not None}
+
+    for start in range(len(options)):
+        if assignment[start] is not None:
+            continue
+
+        # Стек левых вершин цепи и выбранные для них правые вершины
+        visited = set()
+        stack, iterators, chosen = [start], [iter(options[start])], []
+        while stack:
+            right = next((right for right in iterators[-1] if right not in visited), None)
+            if right is None:
+                stack.pop()
+                iterators.pop()
+                if chosen:
+                    chosen.pop()
+                continue
+            visited.add(right)
+            chosen.append(right)
+            if right in owner:
+                stack.append(owner[right])
+                iterators.append(iter(options[owner[right]]))
+                continue
+
+            # Свободная правая вершина: чередование пар вдоль цепи
+            for left, matched in zip(stack, chosen):
+                owner[matched] = left
+                assignment[left] = matched
+            break
+
+    return assignment
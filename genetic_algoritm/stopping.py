@@ -0,0 +1,111 @@
+from .telemetry import SCORE_LABELS
+
+# Причины остановки алгоритма
+TARGET_REACHED = 'target_reached'
+MAX_GENERATIONS = 'max_generations'
+TIME_BUDGET = 'time_budget'
+STAGNATION = 'stagnation'
+CANCELLED = 'cancelled'
+
+
+class StoppingPolicy:
+    """
+    Класс для условия останова генетического алгоритма.
+    Алгоритм останавливается по первой выполненной причине (в порядке проверки):
+        'target_reached' - каждая оценка не больше порога target_score
+        'max_generations' - пройдено max_generations поколений
+        'time_budget' - прошло time_budget секунд
+        'stagnation' - сумма оценок не улучшалась stagnation_window поколений подряд
+    Отмена через cancel_event сообщается причиной 'cancelled'.
+
+    Атрибуты
+    --------
+    max_generations : int
+        Наибольшее количество поколений или None
+    time_budget : float
+        Ограничение времени в секундах или None
+    stagnation_window : int
+        Количество поколений без улучшения или None
+    target_score : dict
+        Пороги оценок {ограничение: штраф}, ограничения - как в telemetry.SCORE_LABELS
+
+    Методы
+    ------
+    reset():
+        Сбрасывает состояние перед новым запуском.
+    should_stop(generation, score, elapsed):
+        Возвращает причину остановки или None.
+    """
+
+    def __init__(self, max_generations: int = 10, time_budget: float = 60 * 5, stagnation_window: int = None,
+                 target_score=None):
+        """
+        Устанавливает необходимые атрибуты для объекта StoppingPolicy.
+        По умолчанию условие совпадает с исходным: нулевая оценка, 10 поколений или 5 минут.
+
+        Параметры
+        ---------
+        max_generations : int
+            Наибольшее количество поколений. None - без ограничения.
+        time_budget : float
+            Ограничение времени в секундах. None - без ограничения.
+        stagnation_window : int
+            Остановка, если сумма оценок не улучшалась столько поколений подряд. None - не проверять.
+        target_score : dict or tuple
+            Пороги оценок по ограничениям: {ограничение: штраф} или кортеж в порядке SCORE_LABELS.
+            Не заданные ограничения должны быть равны 0. По умолчанию - все оценки равны 0.
+        """
+        self.max_generations = max_generations
+        self.time_budget = time_budget
+        self.stagnation_window = stagnation_window
+
+        if target_score is None:
+            target_score = {}
+        elif not isinstance(target_score, dict):
+            target_score = dict(zip(SCORE_LABELS, target_score))
+        unknown = set(target_score) - set(SCORE_LABELS)
+        if unknown:
+            raise ValueError('Неизвестные ограничения: ' + ', '.join(sorted(unknown)))
+        self.target_score = {label: target_score.get(label, 0) for label in SCORE_LABELS}
+
+        self._best = None
+        self._best_generation = 0
+
+    def reset(self) -> None:
+        """
+        Сбрасывает состояние перед новым запуском алгоритма.
+        """
+        self._best = None
+        self._best_generation = 0
+
+    def should_stop(self, generation: int, score: tuple, elapsed: float) -> str:
+        """
+        Проверяет условие останова после поколения.
+
+        Параметры
+        ---------
+        generation : int
+            Номер завершенного поколения.
+        score : tuple
+            Оценки приспособленности поколения.
+        elapsed : float
+            Время с начала работы алгоритма в секундах.
+
+        Возвращаемое значение
+        ---------------------
+        str
+            Причина остановки или None, если алгоритм продолжается.
+        """
+        total = sum(score)
+        if self._best is None or total < self._best:
+            self._best, self._best_generation = total, generation
+
+        if all(value <= self.target_score[label] for label, value in zip(SCORE_LABELS, score)):
+            return TARGET_REACHED
+        if self.max_generations is not None and generation >= self.max_generations:
+            return MAX_GENERATIONS
+        if self.time_budget is not None and elapsed > self.time_budget:
+            return TIME_BUDGET
+        if self.stagnation_window is not None and generation - self._best_generation >= self.stagnation_window:
+            return STAGNATION
+        return None
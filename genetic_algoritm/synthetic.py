@@ -0,0 +1,217 @@
+import argparse
+import datetime
+import math
+import os
+import random
+
+import pandas as pd
+
+from .genetic_operators import Schedule
+
+# Недельный учебный план параллели {параллель: {урок: количество в неделю}} по тестовому набору test/*_85.xlsx
+ACADEMIC_PLAN = {
+    5: {'Математика': 5, 'Ин. яз.': 3, 'Рус. яз.': 5, 'Физкультура': 2, 'Литература': 3, 'История': 2, 'Музыка': 1,
+        'Информатика': 1, 'Биология': 1, 'Технология': 1, 'География': 1, 'ОДНКНР': 1, 'ИЗО': 1},
+    6: {'Математика': 6, 'Информатика': 1, 'Ин. яз.': 3, 'Физкультура': 2, 'Литература': 2, 'География': 1,
+        'Биология': 1, 'Род.яз./Род.лит.': 2, 'ИЗО': 1, 'Технология': 1, 'Музыка': 1, 'История': 2,
+        'Природоведение': 1, 'Обществознание': 1, 'Рус. яз.': 5},
+    7: {'Алгебра': 3, 'ИЗО': 1, 'Ин. яз.': 3, 'Физкультура': 2, 'Музыка': 1, 'ОБЖ': 1, 'География': 2,
+        'Литература': 1, 'Физика': 2, 'Биология': 1, 'Рус. яз.': 4, 'Обществознание': 1, 'Геометрия': 2,
+        'Информатика': 1, 'История': 3, 'Технология': 1, 'Род.яз./Род.лит.': 2},
+    8: {'Алгебра': 4, 'Ин. яз.': 3, 'Рус. яз.': 3, 'Физкультура': 2, 'Литература': 3, 'История': 2, 'Информатика': 1,
+        'Биология': 2, 'Технология': 1, 'География': 2, 'Физика': 2, 'ИЗО': 1, 'ОБЖ': 1, 'Род.яз./Род.лит.': 1,
+        'Геометрия': 2, 'Химия': 2, 'Обществознание': 1},
+    9: {'Алгебра': 5, 'Ин. яз.': 3, 'Рус. яз.': 3, 'Физкультура': 2, 'Литература': 2, 'История': 4, 'Информатика': 1,
+        'Биология': 2, 'География': 2, 'Физика': 3, 'ОБЖ': 1, 'Род.яз./Род.лит.': 1, 'Геометрия': 2, 'Химия': 2,
+        'Обществознание': 1},
+    10: {'Алгебра': 5, 'Ин. яз.': 5, 'Рус. яз.': 2, 'Физкультура': 2, 'Литература': 2, 'История': 2,
+         'Информатика': 2, 'Биология': 1, 'География': 1, 'ОБЖ': 1, 'Род.яз./Род.лит.': 1, 'Обществознание': 2,
+         'Прак. общ.': 1, 'Инд. проект': 1, 'Право': 2},
+    11: {'Алгебра': 6, 'Ин. яз.': 4, 'Рус. яз.': 3, 'Физкультура': 2, 'Литература': 3, 'История': 2,
+         'Информатика': 2, 'Биология': 1, 'Право': 2, 'ОБЖ': 1, 'Обществознание': 2, 'Инд. проект': 1, 'Химия': 1,
+         'Астрономия': 1, 'География': 1, 'Род.яз./Род.лит.': 1},
+}
+
+# Специализации учителей: уроки, которые может вести один учитель
+SPECIALISATIONS = (('Рус. яз.', 'Литература', 'Род.яз./Род.лит.'),
+                   ('Ин. яз.',),
+                   ('Математика', 'Алгебра', 'Геометрия'),
+                   ('Физкультура',),
+                   ('История', 'Обществознание', 'Право', 'Прак. общ.'),
+                   ('Информатика',),
+                   ('География',),
+                   ('Химия',),
+                   ('Физика', 'Астрономия'),
+                   ('Технология',),
+                   ('Биология', 'Природоведение'),
+                   ('ОБЖ',),
+                   ('ИЗО', 'Черчение', 'ОДНКНР'),
+                   ('Музыка',),
+                   ('Инд. проект',))
+
+# Типы аудиторий для уроков, которым нужно оборудование, и имена таких аудиторий. Остальные уроки - 'any'
+LESSON_AUDIENCE_TYPES = {'Физкультура': 'Спортивные снаряды', 'Информатика': 'Компьютерный класс'}
+AUDIENCE_NAMES = {'Спортивные снаряды': 'Спортивный зал', 'Компьютерный класс': 'Компьютерный класс'}
+
+# Литеры классов. Когда литеры заканчиваются, к имени добавляется номер круга: 5а, ..., 5я, 5а2, ...
+CLASS_LETTERS = 'абвгдежзиклмнопрстуфхцчшщэюя'
+
+# Имена файлов по шаблону тестового набора: {'аргумент Schedule': 'префикс имени файла'}
+FILE_PREFIXES = {'df_academic_plan': 'uch_plan', 'df_teachers': 'teachers', 'df_audiences_lessons': 'aud_type',
+                 'df_audiences': 'audiences', 'df_rings': 'rings'}
+
+
+def generate_school(classes: int = 200, number_of_days_in_week: int = 5, lessons_per_day: int = 13,
+                    room_utilization: float = 0.5, teacher_load: int = 24, part_time_share: float = 0.2,
+                    seed: int = 0, second_shift: bool = False) -> dict:
+    """
+    Генерирует входные данные синтетической школы в том же виде, что и тестовый набор test/*_85.xlsx.
+
+    Параметры
+    ---------
+    classes : int
+        Количество классов. Классы распределяются по параллелям 5-11 поровну.
+    number_of_days_in_week : int
+        Количество учебных дней, под которое рассчитывается число аудиторий.
+    lessons_per_day : int
+        Количество звонков в дне.
+    room_utilization : float
+        Доля занятых слотов (аудитория x интервал) каждого типа аудиторий в самой загруженной смене.
+        Чем больше, тем дефицитнее аудитории. При значении больше 1 расписание без накладок по аудиториям невозможно.
+    teacher_load : int
+        Недельная нагрузка учителя на полную ставку, уроков.
+    part_time_share : float
+        Доля учителей на половину ставки.
+    seed : int
+        Зерно генератора случайных чисел.
+    second_shift : bool
+        Наличие второй смены, под которую рассчитывается число аудиторий.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Дата фреймы {'df_academic_plan', 'df_teachers', 'df_audiences_lessons', 'df_audiences', 'df_rings',
+        'df_teachers_wishes'} для передачи в Schedule.
+    """
+    grades = tuple(ACADEMIC_PLAN)
+    rng = random.Random(seed)
+
+    # Классы: поровну по параллелям, литеры по порядку
+    class_names = []
+    for i in range(classes):
+        letter, lap = CLASS_LETTERS[i // len(grades) % len(CLASS_LETTERS)], i // len(grades) // len(CLASS_LETTERS)
+        class_names.append(str(grades[i % len(grades)]) + letter + (str(lap + 1) if lap else ''))
+
+    # Учебный план: класс указан только в первой строке своего блока
+    rows = []
+    hours = dict()
+    for school_class in class_names:
+        for i, (lesson, count) in enumerate(ACADEMIC_PLAN[Schedule.class_grade(school_class)].items()):
+            rows.append((school_class if i == 0 else float('nan'), lesson, count))
+            hours[lesson] = hours.get(lesson, 0) + count
+    df_academic_plan = pd.DataFrame(rows, columns=['class', 'lesson', 'count'])
+
+    # Учителя: для каждой специализации, пока суммарная ставка не покроет часы
+    rows = []
+    for specialisation in SPECIALISATIONS:
+        required = sum(hours.get(lesson, 0) for lesson in specialisation)
+        capacity = 0
+        while capacity < required:
+            capacity += teacher_load // 2 if rng.random() < part_time_share else teacher_load
+            rows.append(('Учитель ' + str(len(rows) + 1).zfill(4), ', '.join(specialisation)))
+    df_teachers = pd.DataFrame(rows, columns=['teacher', 'lesson'])
+
+    # Типы аудиторий для уроков
+    lessons = tuple(lesson for specialisation in SPECIALISATIONS for lesson in specialisation)
+    df_audiences_lessons = pd.DataFrame([(lesson, LESSON_AUDIENCE_TYPES.get(lesson, 'any')) for lesson in lessons],
+                                        columns=['lesson', 'type'])
+
+    # Аудитории: по пиковой одновременной нагрузке. Уроки классов одной смены идут только в интервалы этой смены,
+    # поэтому часы каждого типа делятся на слоты своей смены, а аудиторий нужно столько, сколько в самой загруженной
+    shift_lessons = {False: lessons_per_day}
+    if second_shift:
+        # Конец первой смены, как в Schedule
+        end_of_the_shift = (lessons_per_day - 1) // 2
+        shift_lessons = {False: end_of_the_shift + 1, True: lessons_per_day - end_of_the_shift - 1}
+    type_hours = dict()
+    for school_class in class_names:
+        grade = Schedule.class_grade(school_class)
+        shift = second_shift and Schedule.shift_standart[grade]
+        for lesson, count in ACADEMIC_PLAN[grade].items():
+            key = (LESSON_AUDIENCE_TYPES.get(lesson, 'any'), shift)
+            type_hours[key] = type_hours.get(key, 0) + count
+    type_rooms = dict()
+    for (audience_type, shift), count in type_hours.items():
+        slots = number_of_days_in_week * shift_lessons[shift] * room_utilization
+        type_rooms[audience_type] = max(type_rooms.get(audience_type, 1), math.ceil(count / slots))
+    rows = []
+    for audience_type, count in type_rooms.items():
+        for number in range(1, count + 1):
+            if audience_type == 'any':
+                rows.append((len(rows) + 1, audience_type))
+            else:
+                rows.append((AUDIENCE_NAMES[audience_type] + ' ' + str(number), audience_type))
+    df_audiences = pd.DataFrame(rows, columns=['audience', 'type'])
+
+    # Звонки: уроки по 40 минут с 8:00, перемены по 10 минут
+    rows = []
+    begin = datetime.datetime(2000, 1, 1, 8)
+    for _ in range(lessons_per_day):
+        end = begin + datetime.timedelta(minutes=40)
+        rows.append((begin.strftime('%H:%M:%S'), end.strftime('%H:%M:%S')))
+        begin = end + datetime.timedelta(minutes=10)
+    df_rings = pd.DataFrame(rows, columns=['begin', 'end'])
+
+    return {'df_academic_plan': df_academic_plan, 'df_teachers': df_teachers,
+            'df_audiences_lessons': df_audiences_lessons, 'df_audiences': df_audiences, 'df_rings': df_rings,
+            'df_teachers_wishes': pd.DataFrame(columns=['teacher', 'interval', 'is_lesson'])}
+
+
+def write_school(frames: dict, directory: str, suffix: str) -> dict:
+    """
+    Записывает входные данные в файлы Excel с именами по шаблону тестового набора (uch_plan_<suffix>.xlsx и т.д.).
+
+    Параметры
+    ---------
+    frames : dict
+        Дата фреймы, как возвращает generate_school.
+    directory : str
+        Каталог для файлов.
+    suffix : str
+        Суффикс имен файлов.
+
+    Возвращаемое значение
+    ---------------------
+    dict
+        Пути к файлам {'аргумент Schedule': 'путь'}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, prefix in FILE_PREFIXES.items():
+        paths[name] = os.path.join(directory, prefix + '_' + str(suffix) + '.xlsx')
+        frames[name].to_excel(paths[name], index=False)
+    return paths
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Генерация входных данных синтетической школы.')
+    parser.add_argument('--classes', nargs='+', type=int, default=(200,), help='Количество классов (несколько размеров)')
+    parser.add_argument('--days', type=int, choices=(4, 5, 6), default=5, help='Учебных дней в неделе')
+    parser.add_argument('--lessons-per-day', type=int, default=13, help='Количество звонков в дне')
+    parser.add_argument('--second-shift', action='store_true', help='Рассчитать аудитории под вторую смену')
+    parser.add_argument('--room-utilization', type=float, default=0.5, help='Доля занятых слотов аудиторий')
+    parser.add_argument('--teacher-load', type=int, default=24, help='Недельная нагрузка учителя, уроков')
+    parser.add_argument('--part-time-share', type=float, default=0.2, help='Доля учителей на половину ставки')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно генератора случайных чисел')
+    parser.add_argument('--output', default='.', help='Каталог для файлов')
+    args = parser.parse_args(argv)
+
+    for classes in args.classes:
+        frames = generate_school(classes, args.days, args.lessons_per_day, args.room_utilization, args.teacher_load,
+                                 args.part_time_share, args.seed, args.second_shift)
+        write_school(frames, args.output, classes)
+        print(classes, 'классов:', len(frames['df_teachers']), 'учителей,', len(frames['df_audiences']), 'аудиторий')
+
+
+if __name__ == '__main__':
+    main()
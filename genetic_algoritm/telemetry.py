@@ -0,0 +1,209 @@
+import json
+import time
+from contextlib import contextmanager
+
+# Названия компонентов оценки приспособленности в порядке целевых функций
+SCORE_LABELS = ('class_windows', 'teacher_windows', 'teacher_wishes', 'concentration', 'distribution')
+
+
+class Telemetry:
+    """
+    Класс для сбора телеметрии генетического алгоритма по поколениям.
+    Для каждого поколения сохраняются время этапов, оценки по каждому ограничению и количество
+    попыток и успехов генетических операторов. Записи доступны в процессе через атрибут generations
+    и при заданном path дописываются в файл в формате JSON Lines (одна строка на поколение).
+
+    Атрибуты
+    --------
+    path : str
+        Путь к файлу JSON Lines или None
+    generations : list
+        Записи поколений
+            generation : int
+                номер поколения
+            elapsed : float
+                время с начала работы алгоритма в секундах
+            stages : dict
+                {этап: секунды}
+            score : dict
+                {ограничение: штраф}
+            operators : dict
+                {оператор: {'attempts': int, 'successes': int}}
+
+    Методы
+    ------
+    start():
+        Начинает новый запуск алгоритма.
+    resume(generations, elapsed):
+        Продолжает прерванный запуск.
+    start_generation(generation):
+        Начинает запись поколения.
+    stage(name):
+        Контекстный менеджер для замера времени этапа.
+    count(operator, success):
+        Учитывает попытку применения оператора.
+    end_generation(score):
+        Завершает запись поколения.
+    elapsed():
+        Время с начала запуска.
+    scores():
+        Оценки по поколениям в виде кортежей.
+    close():
+        Закрывает файл.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Устанавливает необходимые атрибуты для объекта Telemetry.
+
+        Параметры
+        ---------
+        path : str
+            Путь к файлу JSON Lines. Если не задан, телеметрия хранится только в памяти.
+        """
+        self.path = path
+        self.generations = []
+        self._stream = None
+        self._start = time.perf_counter()
+        self._current = None
+
+    def __getstate__(self) -> dict:
+        """
+        Состояние для передачи в другой процесс: открытый файл принадлежит вызывающему процессу.
+        """
+        state = self.__dict__.copy()
+        state['_stream'] = None
+        state['path'] = None
+        return state
+
+    def start(self) -> None:
+        """
+        Начинает новый запуск алгоритма: очищает записи и открывает файл заново.
+        """
+        self.close()
+        self.generations = []
+        self._current = None
+        if self.path is not None:
+            self._stream = open(self.path, 'w', encoding='utf-8')
+        self._start = time.perf_counter()
+
+    def resume(self, generations: list, elapsed: float) -> None:
+        """
+        Продолжает прерванный запуск: восстанавливает записи поколений и отсчет времени.
+        Файл перезаписывается восстановленными записями, чтобы в нем не было поколений после контрольной точки.
+
+        Параметры
+        ---------
+        generations : list
+            Записи поколений из контрольной точки.
+        elapsed : float
+            Время работы алгоритма до контрольной точки в секундах.
+        """
+        self.start()
+        self.generations = list(generations)
+        self._start = time.perf_counter() - elapsed
+        if self._stream is not None:
+            for record in self.generations:
+                self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._stream.flush()
+
+    def start_generation(self, generation: int) -> None:
+        """
+        Начинает запись поколения.
+
+        Параметры
+        ---------
+        generation : int
+            Номер поколения.
+        """
+        self._current = {'generation': generation, 'elapsed': None, 'stages': {}, 'score': {}, 'operators': {}}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Замер времени этапа поколения. Повторные замеры одного этапа суммируются.
+
+        Параметры
+        ---------
+        name : str
+            Название этапа.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                stages = self._current['stages']
+                stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, operator: str, success: bool) -> None:
+        """
+        Учитывает попытку применения генетического оператора в текущем поколении.
+        Вне поколения попытки не учитываются.
+
+        Параметры
+        ---------
+        operator : str
+            Название оператора.
+        success : bool
+            Изменил ли оператор расписание.
+        """
+        if self._current is None:
+            return
+        counter = self._current['operators'].get(operator)
+        if counter is None:
+            counter = self._current['operators'][operator] = {'attempts': 0, 'successes': 0}
+        counter['attempts'] += 1
+        counter['successes'] += bool(success)
+
+    def end_generation(self, score: tuple) -> dict:
+        """
+        Завершает запись поколения и дописывает ее в файл.
+
+        Параметры
+        ---------
+        score : tuple
+            Оценки приспособленности по каждому ограничению.
+
+        Возвращаемое значение
+        ---------------------
+        dict
+            Запись поколения.
+        """
+        record = self._current
+        if record is None:
+            raise RuntimeError('Поколение не начато: вызовите start_generation')
+        record['elapsed'] = self.elapsed()
+        record['score'] = dict(zip(SCORE_LABELS, score))
+        self.generations.append(record)
+        self._current = None
+
+        if self._stream is not None:
+            self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._stream.flush()
+        return record
+
+    def elapsed(self) -> float:
+        """
+        Время с начала запуска в секундах.
+        """
+        return time.perf_counter() - self._start
+
+    def scores(self) -> list[tuple]:
+        """
+        Оценки приспособленности по поколениям.
+
+        Возвращаемое значение
+        ---------------------
+        list
+            [(оценки по каждому ограничению), ...]
+        """
+        return [tuple(record['score'][label] for label in SCORE_LABELS) for record in self.generations]
+
+    def close(self) -> None:
+        """
+        Закрывает файл JSON Lines, если он открыт.
+        """
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
@@ -1,3 +1,5 @@
+import queue
+import threading
 import pandas as pd
 from tkinter import messagebox
 from tkinter import *
@@ -6,6 +8,8 @@ from tkinter import ttk
 from tkinter.ttk import Combobox
 from tkinter import IntVar
 import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.feasibility import InfeasibleScheduleError
+from genetic_algoritm.inputs import load_input
 
 
 class App(Frame):
@@ -21,6 +25,12 @@ class App(Frame):
 
     schedule_obj: ga.Schedule
         текущий вариант расписания, который выводится в третьей вкладке
+    schedule_queue: queue.Queue
+        очередь событий от фонового потока, составляющего расписание
+    cancel_event: threading.Event
+        событие отмены составления расписания
+    stop_reasons: dict
+        описания причин остановки алгоритма
 
     Методы
     ------
@@ -39,6 +49,15 @@ class App(Frame):
     df_academic_plan = pd.DataFrame
     df_teachers_wishes = pd.DataFrame
     schedule_obj = None
+    schedule_queue = None
+    cancel_event = None
+
+    # Причины остановки алгоритма для вывода пользователю
+    stop_reasons = {'target_reached': 'достигнута целевая оценка',
+                    'max_generations': 'пройдено наибольшее количество поколений',
+                    'time_budget': 'истекло время',
+                    'stagnation': 'оценка перестала улучшаться',
+                    'cancelled': 'отменено, показано лучшее найденное'}
 
     def __init__(self, parent):
         """
@@ -139,7 +158,8 @@ class App(Frame):
 
         def load_df(df: str) -> None:
             """
-            Загрузка файлов и преобразование их в pandas.DataFrame
+            Загрузка файлов и преобразование их в pandas.DataFrame.
+            Разобранные файлы кэшируются load_input: повторная загрузка того же файла не разбирает Excel.
             Параметры
             ---------
             df: str
@@ -147,7 +167,7 @@ class App(Frame):
             """
 
             # Создаем команды для определенных файлов
-            str_save = 'App.df_' + df + ' = pd.read_excel(fn)'
+            str_save = 'App.df_' + df + ' = load_input(fn, df)'
             str_message = 'label_loaded_' + df + ".configure(fg='Green')"
             str_load = 'label_loaded_' + df + ".configure(fg='#f0f0f0')"
 
@@ -288,9 +308,19 @@ class App(Frame):
         # Создание расписания
         frame_table = LabelFrame(tab_schedule, text="Расписание", relief=RAISED, borderwidth=1)
         frame_table.pack(fill=BOTH, expand=True)
-        ga_button = Button(tab_schedule, text="Создать расписание",
-                           command=lambda: self.create_schedule(tab_schedule, frame_table))
-        ga_button.pack(side=BOTTOM, padx=10, pady=10)
+        frame_ga = Frame(tab_schedule)
+        frame_ga.pack(side=BOTTOM, fill=X)
+        self.ga_button = Button(frame_ga, text="Создать расписание",
+                                command=lambda: self.create_schedule(tab_schedule, frame_table))
+        self.ga_button.pack(side=LEFT, padx=10, pady=10)
+
+        # Отмена составления расписания
+        self.cancel_button = Button(frame_ga, text="Отменить", state=DISABLED, command=lambda: self.cancel_schedule())
+        self.cancel_button.pack(side=LEFT, padx=10, pady=10)
+
+        # Прогресс составления расписания
+        self.label_progress = Label(frame_ga, text='')
+        self.label_progress.pack(side=LEFT, padx=10, pady=10)
         return
 
     def quit(self):
@@ -317,13 +347,100 @@ class App(Frame):
             if messagebox.showinfo("Ошибка загрузки!", "Введите все начальные данные"):
                 return
 
-        # Создаем объект класса расписание
-        self.schedule_obj = ga.Schedule(App.df_academic_plan, App.df_teachers, App.df_audiences_lessons,
-                                        App.df_audiences, App.df_rings, App.df_teachers_wishes,
-                                        App.number_of_days_in_week, App.second_shift)
+        # Создаем объект класса расписание в фоновом потоке, чтобы окно не зависало
+        self.schedule_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        worker = threading.Thread(target=self.schedule_worker,
+                                  args=(self.schedule_queue, self.cancel_event), daemon=True)
+
+        self.ga_button.configure(state=DISABLED)
+        self.cancel_button.configure(state=NORMAL)
+        self.label_progress.configure(text='Составление расписания...')
+        worker.start()
 
-        # Отображение расписания
-        self.show_schedule(self, tab_schedule, frame_schedule)
+        # Опрос очереди событий из главного потока
+        self.after(100, lambda: self.poll_schedule_queue(tab_schedule, frame_schedule))
+
+    @staticmethod
+    def schedule_worker(schedule_queue, cancel_event) -> None:
+        """
+        Составление расписания в фоновом потоке.
+        События передаются в главный поток через очередь:
+            ('progress', поколение, оценки, время)
+            ('done', расписание)
+            ('error', исключение)
+
+        Параметры
+        ---------
+        schedule_queue : queue.Queue
+            Очередь событий для главного потока.
+        cancel_event : threading.Event
+            Событие отмены составления расписания.
+        """
+        try:
+            schedule_obj = ga.Schedule(App.df_academic_plan, App.df_teachers, App.df_audiences_lessons,
+                                       App.df_audiences, App.df_rings, App.df_teachers_wishes,
+                                       App.number_of_days_in_week, App.second_shift,
+                                       progress_callback=lambda generation, score, elapsed:
+                                       schedule_queue.put(('progress', generation, score, elapsed)),
+                                       cancel_event=cancel_event)
+        except Exception as error:
+            schedule_queue.put(('error', error))
+        else:
+            schedule_queue.put(('done', schedule_obj))
+
+    def poll_schedule_queue(self, tab_schedule, frame_schedule) -> None:
+        """
+        Обработка событий фонового потока, составляющего расписание. Вызывается из главного потока через after().
+
+        Параметры
+        ---------
+        tab_schedule
+            Вкладка, на которой расписание будет отображено
+        frame_schedule
+            Рамка, где будет развернута сетка таблицы расписания
+        """
+        while True:
+            try:
+                event = self.schedule_queue.get_nowait()
+            except queue.Empty:
+                # Поток еще работает
+                self.after(100, lambda: self.poll_schedule_queue(tab_schedule, frame_schedule))
+                return
+
+            if event[0] == 'progress':
+                _, generation, score, elapsed = event
+                self.label_progress.configure(
+                    text=f'Поколение {generation}, оценка {score}, время {round(elapsed, 1)} с')
+                continue
+
+            self.ga_button.configure(state=NORMAL)
+            self.cancel_button.configure(state=DISABLED)
+            if event[0] == 'error':
+                self.label_progress.configure(text='')
+                if isinstance(event[1], InfeasibleScheduleError):
+                    # Ошибка во входных данных, а не в алгоритме
+                    messagebox.showwarning("Расписание невозможно составить!",
+                                           "Исправьте начальные данные:\n" + '\n'.join(event[1].problems))
+                else:
+                    messagebox.showerror("Ошибка составления расписания!", str(event[1]))
+                return
+
+            self.schedule_obj = event[1]
+            self.label_progress.configure(
+                text='Расписание составлено: ' + App.stop_reasons.get(self.schedule_obj.stop_reason, ''))
+
+            # Отображение расписания
+            self.show_schedule(self, tab_schedule, frame_schedule)
+            return
+
+    def cancel_schedule(self) -> None:
+        """
+        Отмена составления расписания. Будет выведено лучшее из найденных расписаний.
+        """
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.label_progress.configure(text='Остановка...')
 
     @staticmethod
     def show_schedule(self, tab, frame) -> None:
@@ -375,22 +492,7 @@ class App(Frame):
             """
             Сохранить расписание для классов и учителей в файл.
             """
-            table = []
-            for interval_num, interval in enumerate(self.schedule_obj.schedule_dict):
-                table.append((interval,) + tuple(self.schedule_obj.schedule_list[interval_num]))
-
-            df = pd.DataFrame(table)
-            df.columns = [''] + list(self.schedule_obj.classes)
-            df.to_excel('./schedule.xlsx', sheet_name='Budgets', index=False)
-
-            table = []
-            for interval_num, interval in enumerate(self.schedule_obj.schedule_dict):
-                table.append((interval,) + tuple(self.schedule_obj.schedule_list_teacher[interval_num]))
-
-            df = pd.DataFrame(table)
-            df.columns = [''] + list(self.schedule_obj.teachers)
-            df.to_excel('./schedule_for_teachers.xlsx', sheet_name='Budgets', index=False)
-            # TODO: Добавить другие типы файлов
+            self.schedule_obj.save_schedule('./schedule.xlsx', './schedule_for_teachers.xlsx')
 
         # Кнопка загрузки
         save_schedule = Button(tab, text='Сохранить', command=lambda: save_schedule_def(self))
@@ -0,0 +1,29 @@
+import multiprocessing
+import os
+
+import benchmark
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_run_over_timeout_is_stopped():
+    result = benchmark.run_case(multiprocessing.get_context('spawn'), FIXTURES, '85', 'modification', 6, False, 0,
+                                None, 0.1)
+    assert result == {'status': 'timeout'}
+
+
+def test_summary_uses_finished_runs_only():
+    runs = [{'suffix': '85', 'algorithm': 'modification', 'days': 6, 'second_shift': False, 'status': 'ok',
+             'wall_time': wall_time, 'generations_per_second': 2.0, 'peak_rss_kb': 1000 * wall_time,
+             'total_score': total_score} for wall_time, total_score in ((1.0, 100), (3.0, 50), (2.0, 70))]
+    runs.append({'suffix': '85', 'algorithm': 'modification', 'days': 6, 'second_shift': False, 'status': 'timeout'})
+    runs.append({'suffix': '85', 'algorithm': 'classic', 'days': 6, 'second_shift': False, 'status': 'timeout'})
+
+    summary = {item['algorithm']: item for item in benchmark.summarize(runs)}
+    assert summary['modification']['runs'] == 4
+    assert summary['modification']['finished'] == 3
+    assert summary['modification']['median_wall_time'] == 2.0
+    assert summary['modification']['max_peak_rss_kb'] == 3000
+    assert summary['modification']['median_total_score'] == 70
+    assert summary['classic']['finished'] == 0
+    assert 'median_total_score' not in summary['classic']
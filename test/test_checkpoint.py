@@ -0,0 +1,82 @@
+import datetime
+import os
+import random
+import threading
+
+import pandas as pd
+import pytest
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm import checkpoint
+from genetic_algoritm.stopping import StoppingPolicy
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    state = {'generation': 3, 'score': (50, 0, 0, 10, 0), 'schedule_dict': {'ПН 08:00:00 08:40:00': {}}}
+    checkpoint.save_checkpoint(path, state)
+
+    assert checkpoint.load_checkpoint(path) == dict(state, version=checkpoint.CHECKPOINT_VERSION)
+    assert os.listdir(tmp_path) == ['run.ckpt']
+
+
+def test_missing_file(tmp_path):
+    assert checkpoint.load_checkpoint(str(tmp_path / 'run.ckpt')) is None
+
+
+def test_other_version_is_refused(tmp_path, monkeypatch):
+    path = str(tmp_path / 'run.ckpt')
+    monkeypatch.setattr(checkpoint, 'CHECKPOINT_VERSION', checkpoint.CHECKPOINT_VERSION + 1)
+    checkpoint.save_checkpoint(path, {})
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        checkpoint.load_checkpoint(path)
+
+
+def small_school(algorithm: str, path: str, **kwargs) -> ga.Schedule:
+    """
+    Два класса и два учителя. Условие останова - ровно четыре поколения.
+    """
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(5)]
+    return ga.Schedule(pd.DataFrame({'class': ['5а', float('nan'), '6а', float('nan')],
+                                     'lesson': ['Математика', 'Рус. яз.', 'Математика', 'Литература'],
+                                     'count': [7, 5, 6, 4]}),
+                       pd.DataFrame({'teacher': ['Учитель 1', 'Учитель 2'],
+                                     'lesson': ['Математика', 'Рус. яз., Литература']}),
+                       pd.DataFrame({'lesson': ['Математика', 'Рус. яз.', 'Литература'], 'type': ['any'] * 3}),
+                       pd.DataFrame({'audience': [1, 2, 3], 'type': ['any'] * 3}),
+                       pd.DataFrame(rings, columns=['begin', 'end']),
+                       pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), 5, False, algorithm=algorithm,
+                       stopping_policy=StoppingPolicy(4, None, target_score=(-1,) * 5), checkpoint_path=path,
+                       **kwargs)
+
+
+def test_interrupted_run_is_resumed(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    cancel_event = threading.Event()
+
+    def progress_callback(generation, score, elapsed):
+        if generation == 2:
+            cancel_event.set()
+
+    random.seed(0)
+    interrupted = small_school('modification', path, progress_callback=progress_callback, cancel_event=cancel_event)
+    assert len(interrupted.telemetry.generations) == 2
+    assert os.path.exists(path)
+
+    resumed = small_school('modification', path, resume=True)
+    assert len(resumed.telemetry.generations) == 4
+    assert resumed.telemetry.scores()[:2] == interrupted.telemetry.scores()
+    # Завершенный запуск удаляет контрольную точку
+    assert not os.path.exists(path)
+
+
+def test_checkpoint_of_other_algorithm_is_refused(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    cancel_event = threading.Event()
+    cancel_event.set()
+    small_school('modification', path, cancel_event=cancel_event)
+
+    with pytest.raises(ValueError):
+        small_school('classic', path, resume=True)
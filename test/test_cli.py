@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+import cli
+
+INPUT_FILES = ('uch_plan_1.xlsx', 'teachers_1.xlsx', 'teachers_wishes_1.xlsx', 'aud_type_1.xlsx',
+               'audiences_1.xlsx', 'rings_1.xlsx')
+
+
+def make_school(school_dir, file_names) -> None:
+    os.makedirs(school_dir)
+    for file_name in file_names:
+        open(os.path.join(school_dir, file_name), 'wb').close()
+
+
+def test_find_school_inputs(tmp_path):
+    make_school(tmp_path / 'school', INPUT_FILES + ('~$uch_plan_1.xlsx', 'notes.txt'))
+    paths = cli.find_school_inputs(str(tmp_path / 'school'))
+
+    assert {name: os.path.basename(path) for name, path in paths.items()} == {
+        'academic_plan': 'uch_plan_1.xlsx', 'teachers': 'teachers_1.xlsx', 'teachers_wishes': 'teachers_wishes_1.xlsx',
+        'audiences_lessons': 'aud_type_1.xlsx', 'audiences': 'audiences_1.xlsx', 'rings': 'rings_1.xlsx'}
+
+
+def test_missing_inputs_are_reported(tmp_path):
+    make_school(tmp_path / 'school', ('uch_plan_1.xlsx', 'teachers_wishes_1.xlsx'))
+    with pytest.raises(FileNotFoundError, match='teachers, audiences_lessons, audiences, rings'):
+        cli.find_school_inputs(str(tmp_path / 'school'))
+
+
+@pytest.mark.parametrize('argv', [[], ['--academic-plan', 'uch_plan.xlsx'],
+                                  ['--schools', 'schools', '--rings', 'rings.xlsx']])
+def test_inconsistent_arguments_are_refused(argv):
+    with pytest.raises(SystemExit):
+        cli.parse_args(argv)
+
+
+def test_batch_reports_failed_school(tmp_path, capsys):
+    make_school(tmp_path / 'schools' / 'empty', ())
+    assert cli.main(['--schools', str(tmp_path / 'schools'), '--workers', '1']) == 1
+    assert 'Готово: 0 из 1' in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from genetic_algoritm.encoding import ScheduleEncoding
+
+INTERVALS = ('ПН 08:00:00 08:40:00', 'ПН 09:00:00 09:40:00', 'ВТ 08:00:00 08:40:00')
+
+
+def encoding() -> ScheduleEncoding:
+    return ScheduleEncoding(INTERVALS, ('5а', '6а'), ('Учитель 1', 'Учитель 2'),
+                            ('Литература', 'Математика'), ('1', '2', '3'))
+
+
+def schedule_dict() -> dict:
+    return {INTERVALS[0]: {'1': {'class': '5а', 'lesson': 'Математика', 'teacher': 'Учитель 1'},
+                           '3': {'class': '6а', 'lesson': 'Литература', 'teacher': 'Учитель 2'}},
+            INTERVALS[1]: {},
+            INTERVALS[2]: {'2': {'class': '6а', 'lesson': 'Математика', 'teacher': 'Учитель 1'}}}
+
+
+def test_round_trip():
+    arrays = encoding().encode(schedule_dict())
+    assert arrays.lesson.dtype == ScheduleEncoding.dtype
+    assert arrays.encoding.decode(arrays) == schedule_dict()
+
+
+def test_cells_and_occupancy():
+    arrays = encoding().encode(schedule_dict())
+
+    assert arrays.cell(0, 1) == {'class': '6а', 'lesson': 'Литература', 'teacher': 'Учитель 2', 'audience': '3'}
+    assert arrays.cell(1, 0) == {}
+    np.testing.assert_array_equal(arrays.occupied(), [[True, True], [False, False], [False, True]])
+    assert arrays.nbytes == 3 * arrays.lesson.nbytes
+
+
+def test_copy_is_independent():
+    arrays = encoding().encode(schedule_dict())
+    copy = arrays.copy()
+    copy.lesson[0, 0] = ScheduleEncoding.EMPTY
+
+    assert arrays.cell(0, 0)['lesson'] == 'Математика'
+    assert copy.cell(0, 0) == {}
+    assert copy.encoding is arrays.encoding
+
+
+def test_too_many_ids_are_refused():
+    teachers = tuple(str(i) for i in range(np.iinfo(ScheduleEncoding.dtype).max + 1))
+    with pytest.raises(ValueError):
+        ScheduleEncoding(INTERVALS, ('5а',), teachers, ('Математика',), ('1',))
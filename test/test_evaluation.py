@@ -0,0 +1,70 @@
+import datetime
+import random
+
+import pandas as pd
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.evaluation import IncrementalEvaluator
+
+FINES = (50, 30, 50, 10, 10)
+
+
+def small_school() -> ga.Schedule:
+    """
+    Три класса, три учителя, шесть уроков в дне и пожелания учителя на весь понедельник.
+    """
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(6)]
+    random.seed(0)
+    return ga.Schedule(pd.DataFrame({'class': ['5а', '6а', '7а', float('nan'), float('nan')],
+                                     'lesson': ['Математика', 'Рус. яз.', 'Литература', 'Физика', 'Музыка'],
+                                     'count': [6, 5, 4, 3, 2]}),
+                       pd.DataFrame({'teacher': ['Учитель 1', 'Учитель 2', 'Учитель 3'],
+                                     'lesson': ['Математика, Физика', 'Рус. яз., Литература', 'Музыка, Математика']}),
+                       pd.DataFrame({'lesson': ['Математика', 'Рус. яз.', 'Литература', 'Физика', 'Музыка'],
+                                     'type': ['any'] * 5}),
+                       pd.DataFrame({'audience': [1, 2, 3, 4], 'type': ['any'] * 4}),
+                       pd.DataFrame(rings, columns=['begin', 'end']),
+                       pd.DataFrame({'teacher': 'Учитель 1', 'interval': [f'ПН {begin} {end}' for begin, end in rings],
+                                     'is_lesson': True}), 5, False)
+
+
+def move_class_cells(schedule: ga.Schedule, school_class: str, first: int, second: int) -> None:
+    """
+    Меняет местами ячейки класса в двух интервалах через place_cell и remove_cell.
+    """
+    intervals = (schedule.intervals[first], schedule.intervals[second])
+    cells = []
+    for interval in intervals:
+        audience = schedule.class_occupancy[interval].get(school_class)
+        cells.append(schedule.remove_cell(interval, audience) if audience is not None else None)
+    for interval, cell in zip(intervals, reversed(cells)):
+        if cell is not None:
+            audience = next(str(aud) for aud in (1, 2, 3, 4) if str(aud) not in schedule.schedule_dict[interval])
+            schedule.place_cell(interval, audience, cell)
+
+
+def test_incremental_score_matches_full_rescore():
+    schedule = small_school()
+    rng = random.Random(1)
+    for _ in range(200):
+        school_class = rng.choice(schedule.classes)
+        first, second = rng.sample(range(len(schedule.intervals)), 2)
+        move_class_cells(schedule, school_class, first, second)
+
+        full = IncrementalEvaluator(schedule)
+        assert schedule.evaluator.score(*FINES) == full.score(*FINES)
+        assert schedule.evaluator.class_windows() == full.class_windows()
+        assert schedule.evaluator.teacher_windows() == full.teacher_windows()
+        assert schedule.evaluator.concentration_failures() == full.concentration_failures()
+
+
+def test_score_swap_predicts_applied_swap():
+    schedule = small_school()
+    rng = random.Random(2)
+    for _ in range(100):
+        school_class = rng.choice(schedule.classes)
+        first, second = rng.sample(range(len(schedule.intervals)), 2)
+        predicted = schedule.evaluator.score_swap(school_class, first, second, *FINES)
+
+        move_class_cells(schedule, school_class, first, second)
+        assert predicted == IncrementalEvaluator(schedule).score(*FINES)
@@ -0,0 +1,75 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.evaluation import IncrementalEvaluator
+from genetic_algoritm.exact import INFEASIBLE, NODE_LIMIT, OPTIMAL, ExactSolver
+from genetic_algoritm.feasibility import InfeasibleScheduleError, find_infeasibilities
+
+FINES = (50, 30, 50, 10, 10)
+
+
+def school(plan: list, teachers: list, days: int, lessons_per_day: int, algorithm: str = 'exact') -> ga.Schedule:
+    """
+    Школа из учебного плана [(класс, урок, количество), ...] и учителей [(учитель, 'урок1, урок2'), ...]
+    с двумя обычными аудиториями и спортзалом для физкультуры и ритмики.
+    """
+    lessons = sorted({lesson for _, lesson, _ in plan})
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(lessons_per_day)]
+    return ga.Schedule(pd.DataFrame(plan, columns=['class', 'lesson', 'count']),
+                       pd.DataFrame(teachers, columns=['teacher', 'lesson']),
+                       pd.DataFrame({'lesson': lessons,
+                                     'type': ['gym' if lesson in ('Физкультура', 'Ритмика') else 'any'
+                                              for lesson in lessons]}),
+                       pd.DataFrame({'audience': [1, 2, 'Зал'], 'type': ['any', 'any', 'gym']}),
+                       pd.DataFrame(rings, columns=['begin', 'end']),
+                       pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), days, False, algorithm=algorithm)
+
+
+# Два дня по три урока: у 5а не хватает уроков на 2 и 3 уроки обоих дней, поэтому штраф не меньше 10
+SMALL_PLAN = [('5а', 'Математика', 2), ('5а', 'Рус. яз.', 2), ('6а', 'Литература', 3)]
+SMALL_TEACHERS = [('Учитель 1', 'Математика'), ('Учитель 2', 'Рус. яз., Литература')]
+
+# Один день из двух уроков. Нагрузка классов, учителей и спортзала помещается в два интервала,
+# но физкультура и ритмика занимают оба урока зала, и ритмика совпадает с математикой у Учителя 2
+TIGHT_PLAN = [('5а', 'Физкультура', 1), ('5а', 'Математика', 1), ('6а', 'Ритмика', 1)]
+TIGHT_TEACHERS = [('Учитель 1', 'Физкультура'), ('Учитель 2', 'Математика, Ритмика')]
+
+
+def test_small_school_is_solved_optimally():
+    schedule = school(SMALL_PLAN, SMALL_TEACHERS, 2, 3)
+
+    assert schedule.exact_status == OPTIMAL
+    assert schedule.missing_lessons() == []
+    assert all(len(audiences) == 1 for interval in schedule.intervals
+               for audiences in schedule.teacher_occupancy[interval].values())
+    # Штраф перебора совпадает с оценкой расставленного расписания
+    assert schedule.best_score == IncrementalEvaluator(schedule).score(*FINES)
+    solver = ExactSolver(school(SMALL_PLAN, SMALL_TEACHERS, 2, 3, algorithm=None), FINES)
+    assert solver.solve() == OPTIMAL
+    assert solver.best_cost == sum(schedule.best_score) == 10
+
+
+def test_result_does_not_depend_on_random_state():
+    first = school(SMALL_PLAN, SMALL_TEACHERS, 2, 3)
+    second = school(SMALL_PLAN, SMALL_TEACHERS, 2, 3)
+    assert first.schedule_dict == second.schedule_dict
+
+
+def test_tight_school_is_infeasible():
+    schedule = school(TIGHT_PLAN, TIGHT_TEACHERS, 1, 2, algorithm=None)
+    # Предварительная проверка по количеству часов невыполнимость не находит
+    assert find_infeasibilities(schedule) == []
+    assert ExactSolver(schedule, FINES).solve() == INFEASIBLE
+    with pytest.raises(InfeasibleScheduleError) as error:
+        school(TIGHT_PLAN, TIGHT_TEACHERS, 1, 2)
+    assert 'Полный перебор' in error.value.problems[0]
+
+
+def test_node_limit_stops_search():
+    solver = ExactSolver(school(SMALL_PLAN, SMALL_TEACHERS, 2, 3, algorithm=None), FINES, node_limit=3)
+    solver.solve()
+    assert solver.stop_reason == NODE_LIMIT
+    assert solver.nodes <= 3 + 1
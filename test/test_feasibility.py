@@ -0,0 +1,58 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.feasibility import InfeasibleScheduleError, find_infeasibilities
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+
+def fixture_frames() -> dict:
+    files = {'df_academic_plan': 'uch_plan', 'df_teachers': 'teachers', 'df_audiences_lessons': 'aud_type',
+             'df_audiences': 'audiences', 'df_rings': 'rings'}
+    frames = {name: pd.read_excel(os.path.join(FIXTURES, prefix + '_85.xlsx')) for name, prefix in files.items()}
+    frames['df_teachers_wishes'] = pd.DataFrame(columns=['teacher', 'interval', 'is_lesson'])
+    return frames
+
+
+def small_school(plan: list, teachers: list) -> ga.Schedule:
+    """
+    Школа из учебного плана [(класс, урок, количество), ...] и учителей [(учитель, 'урок1, урок2'), ...]:
+    пять дней по четыре урока и две обычные аудитории.
+    """
+    lessons = sorted({lesson for _, lesson, _ in plan})
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(4)]
+    return ga.Schedule(pd.DataFrame(plan, columns=['class', 'lesson', 'count']),
+                       pd.DataFrame(teachers, columns=['teacher', 'lesson']),
+                       pd.DataFrame({'lesson': lessons, 'type': ['any'] * len(lessons)}),
+                       pd.DataFrame({'audience': [1, 2], 'type': ['any', 'any']}),
+                       pd.DataFrame(rings, columns=['begin', 'end']),
+                       pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), 5, False, algorithm=None)
+
+
+def test_fixture_is_feasible_in_six_days():
+    schedule = ga.Schedule(number_of_days_in_week=6, second_shift=False, algorithm=None, **fixture_frames())
+    assert find_infeasibilities(schedule) == []
+
+
+def test_gym_shortage_is_refused():
+    with pytest.raises(InfeasibleScheduleError) as error:
+        ga.Schedule(number_of_days_in_week=5, second_shift=False, algorithm='modification', **fixture_frames())
+    assert any('Спортивные снаряды' in problem for problem in error.value.problems)
+
+
+def test_teacher_overloaded_by_own_lessons():
+    # Каждый урок по отдельности помещается в 20 интервалов, но оба ведет только Учитель 1
+    schedule = small_school([('5а', 'Математика', 12), ('6а', 'Физика', 12), ('6а', 'Музыка', 1)],
+                            [('Учитель 1', 'Математика, Физика'), ('Учитель 2', 'Музыка')])
+    problems = find_infeasibilities(schedule)
+    assert problems == ['Учитель Учитель 1: 24 ч в неделю уроков, которые может вести только он, а интервалов 20']
+
+
+def test_shared_lessons_do_not_overload_a_teacher():
+    schedule = small_school([('5а', 'Математика', 12), ('6а', 'Математика', 12)],
+                            [('Учитель 1', 'Математика'), ('Учитель 2', 'Математика')])
+    assert find_infeasibilities(schedule) == []
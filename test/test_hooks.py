@@ -0,0 +1,61 @@
+import datetime
+import pstats
+import random
+
+import pandas as pd
+import pytest
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.hooks import GenerationHooks, profile_generation
+
+
+def test_callbacks_are_called_in_registration_order():
+    hooks = GenerationHooks()
+    calls = []
+    assert not hooks
+
+    hooks.register('end_generation', lambda schedule, generation, score: calls.append(('first', generation)))
+
+    @hooks.register('end_generation')
+    def second(schedule, generation, score):
+        calls.append(('second', generation))
+
+    hooks.end_generation(None, 1, (0, 0, 0, 0, 0))
+    hooks.unregister('end_generation', second)
+    hooks.end_generation(None, 2, (0, 0, 0, 0, 0))
+
+    assert hooks
+    assert calls == [('first', 1), ('second', 1), ('first', 2)]
+
+
+def test_unknown_event_is_refused():
+    with pytest.raises(ValueError):
+        GenerationHooks().register('before_generation', print)
+
+
+def test_hooks_follow_ga_stages(tmp_path):
+    hooks = GenerationHooks()
+    events = []
+    hooks.register('before_stage', lambda schedule, generation, stage: events.append(('before', generation, stage)))
+    hooks.register('after_stage', lambda schedule, generation, stage: events.append(('after', generation, stage)))
+    hooks.register('end_generation', lambda schedule, generation, score: events.append(('end', generation)))
+    profile_generation(hooks, str(tmp_path / 'generation.prof'))
+
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(5)]
+    random.seed(0)
+    schedule = ga.Schedule(pd.DataFrame({'class': ['5а', float('nan'), '6а'],
+                                         'lesson': ['Математика', 'Рус. яз.', 'Математика'], 'count': [7, 5, 6]}),
+                           pd.DataFrame({'teacher': ['Учитель 1', 'Учитель 2'], 'lesson': ['Математика', 'Рус. яз.']}),
+                           pd.DataFrame({'lesson': ['Математика', 'Рус. яз.'], 'type': ['any'] * 2}),
+                           pd.DataFrame({'audience': [1, 2], 'type': ['any'] * 2}),
+                           pd.DataFrame(rings, columns=['begin', 'end']),
+                           pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), 5, False, hooks=hooks)
+
+    generations = [record['generation'] for record in schedule.telemetry.generations]
+    assert [event[1] for event in events if event[0] == 'end'] == generations
+    # Каждый этап поколения обрамлен парой before/after с тем же названием, как в телеметрии
+    for record in schedule.telemetry.generations:
+        stages = [event[2] for event in events if event[0] != 'end' and event[1] == record['generation']]
+        assert stages[::2] == stages[1::2]
+        assert set(stages) == set(record['stages'])
+    assert pstats.Stats(str(tmp_path / 'generation.prof')).total_calls > 0
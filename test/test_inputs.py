@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+import pytest
+
+from genetic_algoritm import inputs
+
+TEACHERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'teachers_85.xlsx')
+
+
+def test_normalize_input_is_idempotent():
+    df = pd.read_excel(TEACHERS)
+    normalized = inputs.normalize_input('teachers', df)
+
+    assert not normalized['lesson'].str.contains(', ').any()
+    pd.testing.assert_frame_equal(inputs.normalize_input('teachers', normalized), normalized)
+    # Исходная таблица не меняется
+    pd.testing.assert_frame_equal(df, pd.read_excel(TEACHERS))
+
+
+def test_cache_hit_skips_excel(tmp_path, monkeypatch):
+    parsed = inputs.load_input(TEACHERS, 'teachers', str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+
+    def read_excel(*args, **kwargs):
+        raise AssertionError('файл из кэша не должен разбираться заново')
+
+    monkeypatch.setattr(inputs.pd, 'read_excel', read_excel)
+    pd.testing.assert_frame_equal(inputs.load_input(TEACHERS, 'teachers', str(tmp_path)), parsed)
+
+
+@pytest.mark.parametrize('content', [b'', b'not a pickle', b'\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00\x8c\x01',
+                                     b'cnosuchmodule\nX\n.', b'cpandas\nNoSuchName\n.'])
+def test_corrupt_cache_is_reparsed(tmp_path, content):
+    parsed = inputs.load_input(TEACHERS, 'teachers', str(tmp_path))
+    cache_path = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+    with open(cache_path, 'wb') as f:
+        f.write(content)
+
+    pd.testing.assert_frame_equal(inputs.load_input(TEACHERS, 'teachers', str(tmp_path)), parsed)
+    # Поврежденный файл кэша перезаписан
+    pd.testing.assert_frame_equal(pd.read_pickle(cache_path), parsed)
+
+
+def test_cache_key_includes_pandas_version(tmp_path):
+    inputs.load_input(TEACHERS, 'teachers', str(tmp_path))
+    assert os.listdir(tmp_path)[0].endswith('_pandas' + pd.__version__ + '.pkl')
+
+
+def test_no_cache_dir(tmp_path):
+    pd.testing.assert_frame_equal(inputs.load_input(TEACHERS, 'teachers', None),
+                                  inputs.load_input(TEACHERS, 'teachers', str(tmp_path)))
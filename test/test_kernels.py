@@ -0,0 +1,53 @@
+import numpy as np
+
+from genetic_algoritm.kernels import day_loads, find_windows, load_penalties
+
+
+def occupancy(*columns: str) -> np.ndarray:
+    """
+    Матрица занятости (интервалы, столбцы) из строк вида '1001 0101', по строке на столбец.
+    """
+    return np.array([[lesson == '1' for lesson in column.replace(' ', '')] for column in columns]).T
+
+
+def windows(occupied: np.ndarray, number_of_days_in_week: int, segment_starts: tuple = (0,)) -> set:
+    intervals, columns = find_windows(occupied, number_of_days_in_week, segment_starts)
+    return set(zip(intervals.tolist(), columns.tolist()))
+
+
+def test_last_free_interval_before_lesson_is_window():
+    occupied = occupancy('1001 0101', '0011 1100', '1010 0000')
+    assert windows(occupied, 2) == {(2, 0), (6, 0), (1, 2)}
+
+
+def test_gaps_across_days_are_not_windows():
+    # Последний урок понедельника и первый урок вторника
+    assert windows(occupancy('0001 1000'), 2) == set()
+
+
+def test_shift_segments():
+    occupied = occupancy('1001 0110', '1101 0000')
+    assert windows(occupied, 2) == {(2, 0), (2, 1)}
+    # Вторая смена начинается со второго урока: перерыв между сменами - не окно
+    assert windows(occupied, 2, (0, 1)) == {(2, 1)}
+
+
+def test_empty_matrix():
+    intervals, columns = find_windows(np.zeros((8, 3), dtype=bool), 2)
+    assert intervals.size == columns.size == 0
+
+
+def test_day_loads():
+    np.testing.assert_array_equal(day_loads(occupancy('1001 0111', '0000 1111'), 2), [[2, 3], [0, 4]])
+
+
+def test_load_penalties():
+    # Четыре дня по четыре урока: первые два класса - в первую смену, третий - во вторую
+    occupied = occupancy('0110 1110 0000 0000', '1000 0100 0110 0110', '1000 0000 0000 0000')
+    concentration, distribution = load_penalties(occupied, 4, np.array([True, True, False]))
+
+    np.testing.assert_array_equal(concentration, [[False, False, True, True],
+                                                  [True, True, False, False],
+                                                  [False, False, False, False]])
+    # Максимум нагрузки: вторник, среда (первый из равных максимумов среды и четверга) и понедельник
+    np.testing.assert_array_equal(distribution, [False, True, True])
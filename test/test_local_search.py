@@ -0,0 +1,66 @@
+import datetime
+import random
+
+import pandas as pd
+
+import genetic_algoritm.genetic_operators as ga
+from genetic_algoritm.stopping import StoppingPolicy
+
+
+def small_school(algorithm: str = 'local_search') -> ga.Schedule:
+    """
+    Три класса и три учителя, пять дней по пять уроков. Условие останова - ровно пять поколений.
+    """
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(5)]
+    return ga.Schedule(pd.DataFrame({'class': ['5а', float('nan'), '6а', float('nan'), '7а', float('nan')],
+                                     'lesson': ['Математика', 'Рус. яз.', 'Математика', 'Литература', 'Физика',
+                                                'Рус. яз.'],
+                                     'count': [6, 5, 5, 4, 4, 5]}),
+                       pd.DataFrame({'teacher': ['Учитель 1', 'Учитель 2', 'Учитель 3'],
+                                     'lesson': ['Математика, Физика', 'Рус. яз., Литература', 'Математика']}),
+                       pd.DataFrame({'lesson': ['Математика', 'Рус. яз.', 'Литература', 'Физика'],
+                                     'type': ['any'] * 4}),
+                       pd.DataFrame({'audience': [1, 2, 3], 'type': ['any'] * 3}),
+                       pd.DataFrame(rings, columns=['begin', 'end']),
+                       pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), 5, False, algorithm=algorithm,
+                       stopping_policy=StoppingPolicy(5, None, target_score=(-1,) * 5))
+
+
+def test_local_search_is_reproducible():
+    random.seed(3)
+    first = small_school()
+    random.seed(3)
+    second = small_school()
+
+    assert first.schedule_dict == second.schedule_dict
+    assert first.telemetry.scores() == second.telemetry.scores()
+    assert len(first.telemetry.generations) == 5
+    # Возвращается лучшее найденное расписание
+    assert sum(first.best_score) == min(sum(score) for score in first.telemetry.scores())
+
+
+def teacher_clashes(schedule: ga.Schedule) -> int:
+    return sum(len(audiences) - 1 for interval in schedule.intervals
+               for audiences in schedule.teacher_occupancy[interval].values())
+
+
+def test_swap_class_cells_keeps_lessons():
+    random.seed(0)
+    schedule = small_school(algorithm=None)
+    schedule.create_first_population()
+    lessons = sorted((cell['class'], cell['lesson']) for cells in schedule.schedule_dict.values()
+                     for cell in cells.values())
+    clashes = teacher_clashes(schedule)
+
+    assert not schedule.can_swap_class_cells('5а', 3, 3)
+    rng = random.Random(1)
+    for _ in range(100):
+        school_class = rng.choice(schedule.classes)
+        first, second = rng.sample(range(len(schedule.intervals)), 2)
+        if schedule.can_swap_class_cells(school_class, first, second):
+            assert schedule.swap_class_cells(school_class, first, second)
+
+    assert sorted((cell['class'], cell['lesson']) for cells in schedule.schedule_dict.values()
+                  for cell in cells.values()) == lessons
+    # Обмены не добавляют накладок учителей
+    assert teacher_clashes(schedule) <= clashes
@@ -0,0 +1,36 @@
+from genetic_algoritm.matching import bipartite_matching
+
+
+def test_augmenting_path_reassigns_matched_vertices():
+    # Жадный выбор дает 0-a и оставляет 1 без пары; увеличивающая цепь 1-a-0-b
+    assert bipartite_matching([['a', 'b'], ['a']]) == ['b', 'a']
+
+
+def test_maximum_matching_on_known_graph():
+    options = [['a', 'b'], ['a', 'c'], ['b'], ['c', 'd'], ['d']]
+    assignment = bipartite_matching(options)
+
+    assert sum(right is not None for right in assignment) == 4
+    matched = [right for right in assignment if right is not None]
+    assert len(matched) == len(set(matched))
+    assert all(right in options[left] for left, right in enumerate(assignment) if right is not None)
+
+
+def test_initial_pairs_stay_matched():
+    options = [['a', 'b'], ['a'], ['c']]
+    assignment = bipartite_matching(options, initial=['a', None, None])
+
+    assert assignment == ['b', 'a', 'c']
+
+
+def test_unmatchable_vertex_stays_free():
+    assert bipartite_matching([['a'], ['a'], []]) == ['a', None, None]
+
+
+def test_long_chain_does_not_hit_recursion_limit():
+    # Новая вершина вытесняет остальные по увеличивающей цепи длиной n
+    n = 5000
+    options = [[i, i + 1] for i in range(n)] + [[0]]
+    assignment = bipartite_matching(options, initial=list(range(n)) + [None])
+
+    assert assignment == list(range(1, n + 1)) + [0]
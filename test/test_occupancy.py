@@ -0,0 +1,60 @@
+import datetime
+import random
+
+import pandas as pd
+
+import genetic_algoritm.genetic_operators as ga
+
+
+def small_school() -> ga.Schedule:
+    """
+    Один класс, два учителя, четыре урока в дне. Расписание после составления очищается.
+    """
+    rings = [(datetime.time(8 + i), datetime.time(8 + i, 40)) for i in range(4)]
+    random.seed(0)
+    schedule = ga.Schedule(pd.DataFrame({'class': ['5а', float('nan'), float('nan')],
+                                         'lesson': ['Математика', 'Рус. яз.', 'Литература'], 'count': [2, 1, 1]}),
+                           pd.DataFrame({'teacher': ['Учитель 1', 'Учитель 2'],
+                                         'lesson': ['Математика', 'Рус. яз., Литература']}),
+                           pd.DataFrame({'lesson': ['Математика', 'Рус. яз.', 'Литература'], 'type': ['any'] * 3}),
+                           pd.DataFrame({'audience': [1, 2], 'type': ['any', 'any']}),
+                           pd.DataFrame(rings, columns=['begin', 'end']),
+                           pd.DataFrame(columns=['teacher', 'interval', 'is_lesson']), 5, False)
+    for interval in schedule.intervals:
+        for audience in list(schedule.schedule_dict[interval]):
+            schedule.remove_cell(interval, audience)
+    return schedule
+
+
+def place(schedule: ga.Schedule, interval_index: int, lesson: str, teacher: str) -> None:
+    schedule.place_cell(schedule.intervals[interval_index], 1, {'class': '5а', 'lesson': lesson, 'teacher': teacher})
+
+
+def lessons(schedule: ga.Schedule) -> dict:
+    return {schedule.interval_index[interval]: cell['lesson']
+            for interval in schedule.intervals for cell in schedule.schedule_dict[interval].values()}
+
+
+def test_exchange_closes_class_window():
+    schedule = small_school()
+    # Окно класса во втором уроке
+    place(schedule, 0, 'Математика', 'Учитель 1')
+    place(schedule, 2, 'Рус. яз.', 'Учитель 2')
+    place(schedule, 3, 'Литература', 'Учитель 2')
+
+    assert schedule.point_mutation_exchange(1, '5а', True, False, True, True)
+    busy = sorted(lessons(schedule))
+    assert len(busy) == 3
+    assert busy == list(range(busy[0], busy[0] + 3))
+
+
+def test_exchange_swaps_lessons_of_one_teacher():
+    schedule = small_school()
+    place(schedule, 0, 'Рус. яз.', 'Учитель 2')
+    place(schedule, 1, 'Литература', 'Учитель 2')
+
+    # Учитель занят во втором интервале только ячейкой, которая меняется местами с первой
+    assert schedule.point_mutation_exchange(0, '5а', True, True, False, False)
+    assert lessons(schedule) == {0: 'Литература', 1: 'Рус. яз.'}
+    assert all(len(audiences) == 1 for interval in schedule.intervals
+               for audiences in schedule.teacher_occupancy[interval].values())
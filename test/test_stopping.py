@@ -0,0 +1,38 @@
+import pytest
+
+from genetic_algoritm import stopping
+from genetic_algoritm.stopping import StoppingPolicy
+
+
+def test_default_policy_matches_original_condition():
+    policy = StoppingPolicy()
+    assert policy.should_stop(1, (50, 0, 0, 0, 0), 1.0) is None
+    assert policy.should_stop(2, (0, 0, 0, 0, 0), 2.0) == stopping.TARGET_REACHED
+    assert policy.should_stop(10, (50, 0, 0, 0, 0), 3.0) == stopping.MAX_GENERATIONS
+    assert policy.should_stop(3, (50, 0, 0, 0, 0), 301.0) == stopping.TIME_BUDGET
+
+
+def test_target_score_thresholds():
+    policy = StoppingPolicy(None, None, target_score={'concentration': 20, 'distribution': 10})
+    assert policy.should_stop(1, (0, 0, 0, 30, 0), 0.0) is None
+    assert policy.should_stop(2, (0, 0, 0, 20, 10), 0.0) == stopping.TARGET_REACHED
+
+    assert StoppingPolicy(target_score=(50, 30)).target_score['teacher_windows'] == 30
+    with pytest.raises(ValueError):
+        StoppingPolicy(target_score={'windows': 0})
+
+
+def test_stagnation_and_reset():
+    policy = StoppingPolicy(None, None, stagnation_window=2)
+    assert policy.should_stop(1, (100, 0, 0, 0, 0), 0.0) is None
+    assert policy.should_stop(2, (50, 0, 0, 0, 0), 0.0) is None
+    assert policy.should_stop(3, (60, 0, 0, 0, 0), 0.0) is None
+    assert policy.should_stop(4, (50, 0, 0, 0, 0), 0.0) == stopping.STAGNATION
+
+    policy.reset()
+    assert policy.should_stop(4, (50, 0, 0, 0, 0), 0.0) is None
+
+
+def test_unlimited_policy_never_stops():
+    policy = StoppingPolicy(None, None)
+    assert all(policy.should_stop(generation, (10, 0, 0, 0, 0), 10.0 ** 6) is None for generation in range(1, 100))
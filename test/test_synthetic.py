@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from genetic_algoritm.genetic_operators import Schedule
+from genetic_algoritm.synthetic import ACADEMIC_PLAN, LESSON_AUDIENCE_TYPES, generate_school
+
+
+def test_class_names_are_cyrillic_and_unique():
+    frames = generate_school(classes=400, seed=1)
+    classes = frames['df_academic_plan']['class'].dropna().tolist()
+
+    assert len(classes) == len(set(classes)) == 400
+    assert all(re.fullmatch(r'\d+[а-я]\d*', school_class) for school_class in classes)
+    assert {Schedule.class_grade(school_class) for school_class in classes} == set(ACADEMIC_PLAN)
+    assert '5а2' in classes
+
+
+@pytest.mark.parametrize('second_shift', [False, True])
+def test_rooms_cover_peak_shift_load(second_shift):
+    days, lessons_per_day, utilization = 5, 13, 0.9
+    frames = generate_school(classes=140, number_of_days_in_week=days, lessons_per_day=lessons_per_day,
+                             room_utilization=utilization, second_shift=second_shift)
+    rooms = frames['df_audiences']['type'].value_counts().to_dict()
+
+    end_of_the_shift = (lessons_per_day - 1) // 2 if second_shift else lessons_per_day - 1
+    shift_lessons = {False: end_of_the_shift + 1, True: lessons_per_day - end_of_the_shift - 1}
+    hours = {}
+    for school_class in frames['df_academic_plan']['class'].dropna():
+        grade = Schedule.class_grade(school_class)
+        shift = second_shift and Schedule.shift_standart[grade]
+        for lesson, count in ACADEMIC_PLAN[grade].items():
+            key = (LESSON_AUDIENCE_TYPES.get(lesson, 'any'), shift)
+            hours[key] = hours.get(key, 0) + count
+
+    # Уроки каждой смены помещаются в аудитории своего типа
+    for (audience_type, shift), count in hours.items():
+        assert count <= rooms[audience_type] * days * shift_lessons[shift] * utilization
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from genetic_algoritm.telemetry import SCORE_LABELS, Telemetry
+
+
+def test_generation_records(tmp_path):
+    path = tmp_path / 'telemetry.jsonl'
+    telemetry = Telemetry(str(path))
+    telemetry.start()
+    for generation, score in enumerate([(100, 30, 0, 10, 0), (50, 0, 0, 10, 0)], start=1):
+        telemetry.start_generation(generation)
+        with telemetry.stage('mutation'):
+            telemetry.count('exchange', True)
+            telemetry.count('exchange', False)
+        with telemetry.stage('mutation'):
+            pass
+        telemetry.end_generation(score)
+    telemetry.close()
+
+    assert telemetry.scores() == [(100, 30, 0, 10, 0), (50, 0, 0, 10, 0)]
+    record = telemetry.generations[0]
+    assert record['operators'] == {'exchange': {'attempts': 2, 'successes': 1}}
+    assert list(record['stages']) == ['mutation']
+    assert record['score'] == dict(zip(SCORE_LABELS, (100, 30, 0, 10, 0)))
+    # В файле - по строке JSON на поколение
+    assert [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == telemetry.generations
+
+
+def test_start_clears_previous_run():
+    telemetry = Telemetry()
+    telemetry.start_generation(1)
+    telemetry.end_generation((0, 0, 0, 0, 0))
+    telemetry.start()
+
+    assert telemetry.generations == []
+    # Вне поколения попытки не учитываются, а завершить поколение нельзя
+    telemetry.count('exchange', True)
+    with pytest.raises(RuntimeError):
+        telemetry.end_generation((0, 0, 0, 0, 0))
+
+
+def test_resume_rewrites_file_and_keeps_elapsed(tmp_path):
+    path = tmp_path / 'telemetry.jsonl'
+    first = Telemetry()
+    first.start()
+    for generation in (1, 2):
+        first.start_generation(generation)
+        first.end_generation((generation, 0, 0, 0, 0))
+
+    path.write_text('{"generation": 3}\n', encoding='utf-8')
+    resumed = Telemetry(str(path))
+    resumed.resume(first.generations[:1], 100.0)
+    resumed.close()
+
+    assert resumed.scores() == [(1, 0, 0, 0, 0)]
+    assert resumed.elapsed() >= 100.0
+    # Поколения после контрольной точки удалены из файла
+    assert [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == first.generations[:1]